@@ -0,0 +1,59 @@
+import argparse
+import asyncio
+import sys
+
+from loguru import logger
+from tortoise import Tortoise
+
+from . import bench_captcha, bench_holders, bench_sales  # noqa: F401
+from .harness import (BENCHMARKS, format_results, init_database, load_baseline,
+                      run_benchmark, save_baseline)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmarks for the sales, holder and captcha hot paths."
+    )
+    parser.add_argument(
+        "-k",
+        "--filter",
+        default="",
+        help="Only run benchmarks whose name contains this",
+    )
+    parser.add_argument(
+        "-n",
+        "--iterations",
+        type=int,
+        help="Override the iterations of every benchmark",
+    )
+    parser.add_argument("--save", help="Write the results to a JSON baseline")
+    parser.add_argument("--compare", help="Compare the results with a JSON baseline")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+
+    # Keep the console readable; log sinks are not part of what we measure.
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+
+    await init_database()
+    results = []
+    try:
+        for bench in BENCHMARKS:
+            if args.filter in bench.name:
+                results.append(await run_benchmark(bench, args.iterations))
+    finally:
+        await Tortoise.close_connections()
+
+    baseline = load_baseline(args.compare) if args.compare else None
+    print(format_results(results, baseline))
+
+    if args.save:
+        save_baseline(results, args.save)
+        print(f"\nBaseline saved to {args.save}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,34 @@
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from web3 import Web3
+
+from src.modules.moderation.services.captcha_service import CaptchaService
+from src.shared.services.walletsignature_service import WalletSignatureService
+
+from .fakes import StandinHttpClient
+from .harness import benchmark
+
+
+@benchmark("captcha.generate_captcha", iterations=200)
+async def bench_generate_captcha():
+    service = CaptchaService(bot=None, http_client=StandinHttpClient())
+
+    async def operation():
+        await service.generate_captcha()
+
+    return operation
+
+
+@benchmark("wallet.verify_signature", iterations=500)
+async def bench_verify_signature():
+    account = Account.create()
+    nonce = WalletSignatureService.generate_nonce()
+    signature = Account.sign_message(
+        encode_defunct(text=nonce), private_key=account.key
+    ).signature.hex()
+    service = WalletSignatureService(w3=Web3())
+
+    async def operation():
+        service.verify_signature(nonce, signature, account.address)
+
+    return operation
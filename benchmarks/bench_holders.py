@@ -0,0 +1,134 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from src.modules.automation.models.holder_verification_model import \
+    HolderVerificationModel
+from src.modules.automation.repositories.holder_verification_config_repository import \
+    HolderConfigRepository
+from src.modules.automation.repositories.holder_verification_repository import \
+    HolderVerificationRepository
+from src.modules.automation.services.holder_verification_service import \
+    HolderVerificationService
+from src.modules.automation.services.ownership_cache_service import \
+    OwnershipCacheService
+from src.modules.automation.usecases.holder_fetch_all_usecase import \
+    HolderFetchAllUseCase
+from tools.reservoir_standin import generate_collections
+
+from .bench_sales import make_reservoir_service
+from .fakes import FakeBot, StandinHttpClient
+from .harness import benchmark
+
+GUILD_ID = 1
+TIERS = [(1, 2, 101), (3, 5, 102), (6, 10, 103), (11, None, 104)]
+
+
+async def setup_holder_sync(holders: int):
+    collections = generate_collections(
+        count=1, supply=holders * 3, holders=holders, sales=0
+    )
+    contract, collection = next(iter(collections.items()))
+    await HolderConfigRepository.save_config(GUILD_ID, contract, TIERS)
+
+    await HolderVerificationModel.bulk_create(
+        [
+            HolderVerificationModel(
+                wallet_address=wallet,
+                discord_user_id=index + 1,
+                guild_id=GUILD_ID,
+                nft_count=0,
+            )
+            for index, wallet in enumerate(collection.holder_counts())
+        ]
+    )
+
+    bot = FakeBot(GUILD_ID)
+    for index in range(holders):
+        bot.guild.get_member(index + 1)
+
+    holder_service = HolderVerificationService(
+        make_reservoir_service(StandinHttpClient(collections))
+    )
+    return HolderFetchAllUseCase(
+        holder_service,
+        HolderVerificationRepository(),
+        HolderConfigRepository(),
+        bot,
+        # Every run is a full owner scan.
+        full_scan_interval=timedelta(0),
+    )
+
+
+def fetch_all_execute(holders: int):
+    async def setup():
+        usecase = await setup_holder_sync(holders)
+
+        async def operation():
+            await usecase.execute(GUILD_ID)
+
+        return operation
+
+    return setup
+
+
+benchmark("holders.fetch_all_execute[1k holders]", iterations=5, warmup=1)(
+    fetch_all_execute(1000)
+)
+benchmark("holders.fetch_all_execute[10k holders]", iterations=3, warmup=1)(
+    fetch_all_execute(10_000)
+)
+benchmark("holders.fetch_all_execute[100k holders]", iterations=1, warmup=1)(
+    fetch_all_execute(100_000)
+)
+
+
+@benchmark("holders.threshold_index_role_for", iterations=2000, warmup=50)
+async def bench_threshold_index_role_for():
+    await HolderConfigRepository.save_config(GUILD_ID, "0xbenchmark", TIERS)
+    rng = random.Random(42)
+
+    async def operation():
+        index = await HolderConfigRepository.get_threshold_index(GUILD_ID)
+        index.role_for(rng.randint(0, 20))
+
+    return operation
+
+
+@benchmark("holders.threshold_index_role_for[200 tiers]", iterations=2000, warmup=50)
+async def bench_threshold_index_role_for_many_tiers():
+    tiers = [(index * 5 + 1, index * 5 + 5, 1000 + index) for index in range(200)]
+    await HolderConfigRepository.save_config(GUILD_ID, "0xbenchmark", tiers)
+    rng = random.Random(42)
+
+    async def operation():
+        index = await HolderConfigRepository.get_threshold_index(GUILD_ID)
+        index.role_for(rng.randint(0, 1000))
+
+    return operation
+
+
+@benchmark("holders.ownership_cache_get[1k wallets, stored tier]", iterations=1000)
+async def bench_ownership_cache_get():
+    await HolderVerificationModel.bulk_create(
+        [
+            HolderVerificationModel(
+                wallet_address=f"0x{index:040x}",
+                discord_user_id=index + 1,
+                guild_id=GUILD_ID,
+                nft_count=index % 5,
+                collection_address="0xbenchmark",
+                updated_at=datetime.now(timezone.utc),
+            )
+            for index in range(1000)
+        ]
+    )
+    # Too small to hold the wallets, so most lookups reach the stored tier.
+    cache = OwnershipCacheService(cache_size=100)
+    rng = random.Random(42)
+
+    async def operation():
+        await cache.get(
+            f"0x{rng.randrange(1000):040x}", "0xbenchmark", GUILD_ID, max_age=900
+        )
+
+    return operation
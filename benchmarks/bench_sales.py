@@ -0,0 +1,124 @@
+from src.modules.automation.repositories.sales_cursor_repository import \
+    SalesCursorRepository
+from src.modules.automation.services.sale_dedupe_service import \
+    SaleDedupeService
+from src.modules.automation.services.sales_notification_service import \
+    SalesNotificationService
+from src.modules.automation.services.sales_service import SalesService
+from src.shared.models.reservoir_models import ReservoirToken
+from src.shared.services.collection_stats_cache import CollectionStatsCache
+from src.shared.services.reservoir_service import ReservoirService
+from src.shared.services.response_cache import ResponseCache
+from tools.reservoir_standin import generate_collections
+
+from .fakes import StandinHttpClient
+from .harness import add_teardown, benchmark
+
+
+def make_reservoir_service(http_client: StandinHttpClient) -> ReservoirService:
+    # Effectively unlimited so the limiter does not dominate the timings.
+    service = ReservoirService(
+        "benchmark", http_client, requests_per_minute=10**9, burst=10**6
+    )
+    add_teardown(service.close)
+    return service
+
+
+@benchmark("sales.get_new_sales", iterations=500)
+async def bench_get_new_sales():
+    collections = generate_collections(count=5, supply=500, holders=200, sales=40)
+    service = SalesService(make_reservoir_service(StandinHttpClient(collections)))
+    contracts = list(collections)
+    sales = await service.reservoir_service.get_latest_sales(contracts)
+    middle = sales[len(sales) // 2]
+    await SalesCursorRepository.save_cursors(
+        {contract: (middle.timestamp, middle.id) for contract in contracts}
+    )
+
+    async def operation():
+        await service.get_new_sales(contracts)
+        service.discard_cursors()
+
+    return operation
+
+
+@benchmark("sales.get_new_sales[500 contracts, sharded]", iterations=50, warmup=2)
+async def bench_get_new_sales_sharded():
+    collections = generate_collections(count=500, supply=20, holders=10, sales=3)
+    service = SalesService(make_reservoir_service(StandinHttpClient(collections)))
+    contracts = list(collections)
+    await service.get_new_sales(contracts)
+    await service.commit_cursors()
+
+    async def operation():
+        await service.get_new_sales(contracts)
+        service.discard_cursors()
+
+    return operation
+
+
+@benchmark("sales.dedupe_claim[100 sales x 3 channels, half seen]", iterations=500)
+async def bench_dedupe_claim():
+    service = SaleDedupeService()
+    batches = iter(range(10**9))
+    previous = []
+
+    async def operation():
+        nonlocal previous
+        batch = next(batches)
+        fresh = [
+            (f"0x{batch:08x}{sale:04x}", 0, channel)
+            for sale in range(50)
+            for channel in range(3)
+        ]
+        await service.claim(previous + fresh)
+        previous = fresh
+
+    return operation
+
+
+@benchmark("sales.get_sales_with_metadata[20 sales, warm stats]", iterations=200)
+async def bench_get_sales_with_metadata():
+    collections = generate_collections(count=5, supply=500, holders=200, sales=40)
+    reservoir_service = make_reservoir_service(StandinHttpClient(collections))
+    service = SalesService(reservoir_service)
+    await service.collection_stats.refresh(list(collections))
+    sales = await reservoir_service.get_latest_sales(list(collections))
+
+    async def operation():
+        await service.get_sales_with_metadata(sales)
+
+    return operation
+
+
+@benchmark("sales.get_sales_with_metadata[20 sales, cold cache]", iterations=200)
+async def bench_get_sales_with_metadata_cold():
+    collections = generate_collections(count=5, supply=500, holders=200, sales=40)
+    reservoir_service = make_reservoir_service(StandinHttpClient(collections))
+    service = SalesService(reservoir_service)
+    sales = await reservoir_service.get_latest_sales(list(collections))
+    # Without metadata in the sales, every token is looked up.
+    for sale in sales:
+        sale.token = ReservoirToken(sale.token.contract, sale.token.token_id)
+
+    async def operation():
+        reservoir_service.cache = ResponseCache()
+        service.collection_stats = CollectionStatsCache(reservoir_service)
+        await service.get_sales_with_metadata(sales)
+
+    return operation
+
+
+@benchmark("sales.format_sale_embed", iterations=2000, warmup=50)
+async def bench_format_sale_embed():
+    collections = generate_collections(count=1, supply=100, holders=50, sales=5)
+    reservoir_service = make_reservoir_service(StandinHttpClient(collections))
+    service = SalesService(reservoir_service)
+    await service.collection_stats.refresh(list(collections))
+    sales = await reservoir_service.get_latest_sales(list(collections))
+    sale = (await service.get_sales_with_metadata(sales))[0]
+
+    async def operation():
+        await SalesNotificationService.format_sale_embed(sale)
+
+    return operation
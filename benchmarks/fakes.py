@@ -0,0 +1,106 @@
+import asyncio
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from multidict import MultiDict
+
+from src.shared.services.http_client import HttpClient, HttpResponse
+from tools.reservoir_standin import (ReservoirStandin, SyntheticCollection,
+                                     generate_collections)
+
+
+class StandinHttpClient(HttpClient):
+    """
+    HttpClient answering Reservoir requests in-process from the stand-in's
+    synthetic collections, so benchmarks measure our code rather than sockets.
+    """
+
+    def __init__(
+        self,
+        collections: Optional[Dict[str, SyntheticCollection]] = None,
+        latency: float = 0,
+    ):
+        self.standin = ReservoirStandin(collections or generate_collections())
+        self.latency = latency
+        self.requests = 0
+
+    async def get_response(self, url: str, headers: dict, params: dict) -> HttpResponse:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        query = MultiDict()
+        for name, value in params.items():
+            for item in value if isinstance(value, (list, tuple)) else [value]:
+                query.add(name, str(item))
+
+        payload = self.standin.build_payload(urlparse(url).path, query)
+        if payload is None:
+            return HttpResponse(status=404, data={})
+        return HttpResponse(status=200, data=payload)
+
+    async def get(self, url: str, headers: dict, params: dict) -> dict:
+        return (await self.get_response(url, headers, params)).data
+
+    async def post(self, url: str, headers: dict, data: dict) -> dict:
+        self.requests += 1
+        return {"data": {"url": "https://i.ibb.co/standin/captcha.png"}}
+
+
+class FakeRole:
+    def __init__(self, role_id: int):
+        self.id = role_id
+        self.name = f"role-{role_id}"
+
+
+class FakeGuild:
+    def __init__(self, guild_id: int):
+        self.id = guild_id
+        self.roles: Dict[int, FakeRole] = {}
+        self._members: Dict[int, "FakeMember"] = {}
+
+    @property
+    def members(self) -> List["FakeMember"]:
+        return list(self._members.values())
+
+    def get_role(self, role_id: int) -> FakeRole:
+        return self.roles.setdefault(role_id, FakeRole(role_id))
+
+    def get_member(self, user_id: int) -> "FakeMember":
+        return self._members.setdefault(user_id, FakeMember(user_id, self))
+
+
+class FakeMember:
+    def __init__(self, user_id: int, guild: FakeGuild):
+        self.id = user_id
+        self.guild = guild
+        self.roles = []
+        self.bot = False
+        self.edits = 0
+
+    async def edit(self, roles=None):
+        self.edits += 1
+        if roles is not None:
+            self.roles = list(roles)
+
+    async def add_roles(self, *roles):
+        self.roles.extend(role for role in roles if role not in self.roles)
+
+    async def remove_roles(self, *roles):
+        self.roles = [role for role in self.roles if role not in roles]
+
+
+class FakeBot:
+    """
+    Minimal stand-in for the discord client's user/guild cache.
+    """
+
+    def __init__(self, guild_id: int):
+        self.guild = FakeGuild(guild_id)
+        self.guilds = [self.guild]
+
+    def get_guild(self, guild_id: int) -> Optional[FakeGuild]:
+        return self.guild if guild_id == self.guild.id else None
+
+    def get_user(self, user_id: int) -> FakeMember:
+        return self.guild.get_member(user_id)
@@ -0,0 +1,164 @@
+import json
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from tortoise import Tortoise
+
+# Setup coroutine returning the async operation to time.
+BenchmarkSetup = Callable[[], Awaitable[Callable[[], Awaitable]]]
+
+BENCHMARK_MODELS = [
+    "src.modules.administration.models",
+    "src.modules.automation.models",
+    "src.modules.moderation.models",
+]
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: BenchmarkSetup
+    iterations: int
+    warmup: int
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    iterations: int
+    ops_per_sec: float
+    mean_ms: float
+    p50_ms: float
+    p99_ms: float
+    min_ms: float
+    max_ms: float
+
+
+BENCHMARKS: List[Benchmark] = []
+
+# Cleanups registered by the running benchmark's setup.
+TEARDOWNS: List[Callable[[], Awaitable]] = []
+
+
+def benchmark(name: str, iterations: int = 200, warmup: int = 10):
+    """
+    Registers a benchmark. The decorated coroutine does the setup and
+    returns the async operation that is timed on every iteration.
+    """
+
+    def decorator(setup: BenchmarkSetup) -> BenchmarkSetup:
+        BENCHMARKS.append(Benchmark(name, setup, iterations, warmup))
+        return setup
+
+    return decorator
+
+
+def add_teardown(callback: Callable[[], Awaitable]):
+    """
+    Registers a coroutine function to await once the running benchmark is
+    done, such as closing the services its setup started.
+    """
+    TEARDOWNS.append(callback)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def init_database():
+    """
+    Initializes Tortoise against a fresh in-memory SQLite database.
+    """
+    await Tortoise.init(
+        db_url="sqlite://:memory:", modules={"models": BENCHMARK_MODELS}
+    )
+    await Tortoise.generate_schemas()
+
+
+async def reset_database():
+    await Tortoise.close_connections()
+    await init_database()
+
+
+async def run_benchmark(
+    bench: Benchmark, iterations: Optional[int] = None
+) -> BenchmarkResult:
+    """
+    Runs the benchmark's setup once, then times each iteration of its
+    operation, and finally the teardowns the setup registered.
+    """
+    await reset_database()
+    try:
+        operation = await bench.setup()
+        iterations = iterations or bench.iterations
+
+        for _ in range(bench.warmup):
+            await operation()
+
+        samples = []
+        started = time.perf_counter()
+        for _ in range(iterations):
+            iteration_started = time.perf_counter()
+            await operation()
+            samples.append((time.perf_counter() - iteration_started) * 1000)
+        elapsed = time.perf_counter() - started
+    finally:
+        while TEARDOWNS:
+            await TEARDOWNS.pop()()
+
+    return BenchmarkResult(
+        name=bench.name,
+        iterations=iterations,
+        ops_per_sec=iterations / elapsed if elapsed else float("inf"),
+        mean_ms=statistics.fmean(samples),
+        p50_ms=percentile(samples, 50),
+        p99_ms=percentile(samples, 99),
+        min_ms=min(samples),
+        max_ms=max(samples),
+    )
+
+
+def save_baseline(results: List[BenchmarkResult], path: Path):
+    """
+    Writes results to a JSON baseline keyed by benchmark name.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {result.name: asdict(result) for result in results}
+    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def load_baseline(path: Path) -> Dict[str, dict]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def format_results(
+    results: List[BenchmarkResult], baseline: Optional[Dict[str, dict]] = None
+) -> str:
+    """
+    Renders results as a table, with the p50 and throughput change against
+    the baseline when one is given.
+    """
+    header = f"{'benchmark':<56}{'ops/sec':>12}{'p50 ms':>10}{'p99 ms':>10}"
+    if baseline:
+        header += f"{'Δ p50':>10}{'Δ ops':>10}"
+    lines = [header, "-" * len(header)]
+
+    for result in results:
+        line = (
+            f"{result.name:<56}{result.ops_per_sec:>12.1f}"
+            f"{result.p50_ms:>10.3f}{result.p99_ms:>10.3f}"
+        )
+        previous = (baseline or {}).get(result.name)
+        if previous:
+            p50_change = (result.p50_ms / previous["p50_ms"] - 1) * 100
+            ops_change = (result.ops_per_sec / previous["ops_per_sec"] - 1) * 100
+            line += f"{p50_change:>+9.1f}%{ops_change:>+9.1f}%"
+        lines.append(line)
+
+    return "\n".join(lines)
@@ -25,12 +25,59 @@ DATABASE = {
 
 # DISCORD
 DISCORD_BOT_TOKEN = os.getenv("DISCORD_BOT_TOKEN")
+# Discord calls go through a durable outbox: at most DISCORD_ACTION_CONCURRENCY at once, each retried up to DISCORD_ACTION_MAX_ATTEMPTS times
+DISCORD_ACTION_CONCURRENCY = int(os.getenv("DISCORD_ACTION_CONCURRENCY", "10"))
+DISCORD_ACTION_MAX_ATTEMPTS = int(os.getenv("DISCORD_ACTION_MAX_ATTEMPTS", "8"))
 
 # IMGBB API KEY
 IMGBB_API_KEY = os.getenv("IMGBB_API_KEY")
 
 # RESERVOIR_API_KEY
 RESERVOIR_API_KEY = os.getenv("RESERVOIR_API_KEY")
+# Comma-separated pool of keys; requests are spread over them and each key keeps its own rate limit
+RESERVOIR_API_KEYS = [key.strip() for key in os.getenv("RESERVOIR_API_KEYS", RESERVOIR_API_KEY or "").split(",") if key.strip()]
+# Point at a local stand-in (python -m tools.reservoir_standin) for offline load tests
+RESERVOIR_BASE_URL = os.getenv("RESERVOIR_BASE_URL", "https://api.reservoir.tools")
+# Plan limits of each API key, used to size the client-side rate limiters
+RESERVOIR_REQUESTS_PER_MINUTE = int(os.getenv("RESERVOIR_REQUESTS_PER_MINUTE", "120"))
+RESERVOIR_BURST = int(os.getenv("RESERVOIR_BURST", "10"))
+# Consecutive failures that open an endpoint's circuit, and seconds before it is probed again
+RESERVOIR_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("RESERVOIR_CIRCUIT_FAILURE_THRESHOLD", "5"))
+RESERVOIR_CIRCUIT_RECOVERY_TIMEOUT = float(os.getenv("RESERVOIR_CIRCUIT_RECOVERY_TIMEOUT", "30"))
+
+# SALES INGESTION
+# "poll" checks for sales every 2 minutes; "stream" receives them over the Reservoir
+# websocket and only falls back to polling while the stream is down
+SALES_INGESTION_MODE = os.getenv("SALES_INGESTION_MODE", "poll")
+RESERVOIR_WS_URL = os.getenv("RESERVOIR_WS_URL", "wss://ws.reservoir.tools")
+# Sales already sent to a channel are remembered this many days; the newest ones are also kept in memory
+SALES_DEDUPE_TTL_DAYS = float(os.getenv("SALES_DEDUPE_TTL_DAYS", "7"))
+SALES_DEDUPE_CACHE_SIZE = int(os.getenv("SALES_DEDUPE_CACHE_SIZE", "50000"))
+# "single" sends one message per sale; "digest" collects a channel's sales for SALES_DIGEST_WINDOW_SECONDS
+# and sends them up to 10 embeds per message, or as one summary table from SALES_DIGEST_SUMMARY_MIN_SALES sales (0 = never)
+SALES_DISPATCH_MODE = os.getenv("SALES_DISPATCH_MODE", "single")
+SALES_DIGEST_WINDOW_SECONDS = float(os.getenv("SALES_DIGEST_WINDOW_SECONDS", "5"))
+SALES_DIGEST_SUMMARY_MIN_SALES = int(os.getenv("SALES_DIGEST_SUMMARY_MIN_SALES", "0"))
+# Seconds between refreshes of the tracked collections' floor and volume, and the share of the API budget
+# (requests per minute) the refresh may use; large tracked sets are refreshed less often to stay within it
+COLLECTION_STATS_REFRESH_SECONDS = float(os.getenv("COLLECTION_STATS_REFRESH_SECONDS", "300"))
+COLLECTION_STATS_REQUESTS_PER_MINUTE = float(os.getenv("COLLECTION_STATS_REQUESTS_PER_MINUTE", "6"))
+
+# HOLDER SYNC
+# Hours between full owner scans; in between, only wallets touched by transfers are re-checked
+HOLDER_FULL_SCAN_INTERVAL_HOURS = float(os.getenv("HOLDER_FULL_SCAN_INTERVAL_HOURS", "6"))
+# Wallet checks from the verification button: parallel workers, how many may wait (more are turned away), and seconds a user waits at most
+HOLDER_VERIFICATION_WORKERS = int(os.getenv("HOLDER_VERIFICATION_WORKERS", "4"))
+HOLDER_VERIFICATION_QUEUE_SIZE = int(os.getenv("HOLDER_VERIFICATION_QUEUE_SIZE", "500"))
+HOLDER_VERIFICATION_TIMEOUT_SECONDS = float(os.getenv("HOLDER_VERIFICATION_TIMEOUT_SECONDS", "120"))
+# Wallet NFT counts kept in memory in front of the database; how old they may be is configured per guild
+HOLDER_OWNERSHIP_CACHE_SIZE = int(os.getenv("HOLDER_OWNERSHIP_CACHE_SIZE", "10000"))
 
 # INFURA PROJECT_ID
 INFURA_PROJECT_ID = os.getenv("INFURA_PROJECT_ID")
+
+# HTTP CONNECTION POOL
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "20"))
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
@@ -1,5 +1,6 @@
 import asyncio
 import os
+from datetime import timedelta
 
 import discord
 from discord.ext import commands
@@ -7,8 +8,34 @@ from loguru import logger
 from tortoise import Tortoise
 
 from src.infrastructure.logging import LoguruConfig
-from src.infrastructure.settings import (DATABASE, DISCORD_BOT_TOKEN,
-                                         RESERVOIR_API_KEY)
+from src.infrastructure.settings import (COLLECTION_STATS_REFRESH_SECONDS,
+                                         COLLECTION_STATS_REQUESTS_PER_MINUTE,
+                                         DATABASE, DISCORD_ACTION_CONCURRENCY,
+                                         DISCORD_ACTION_MAX_ATTEMPTS,
+                                         DISCORD_BOT_TOKEN,
+                                         HOLDER_FULL_SCAN_INTERVAL_HOURS,
+                                         HOLDER_OWNERSHIP_CACHE_SIZE,
+                                         HOLDER_VERIFICATION_QUEUE_SIZE,
+                                         HOLDER_VERIFICATION_TIMEOUT_SECONDS,
+                                         HOLDER_VERIFICATION_WORKERS,
+                                         HTTP_DNS_CACHE_TTL,
+                                         HTTP_KEEPALIVE_TIMEOUT,
+                                         HTTP_POOL_LIMIT,
+                                         HTTP_POOL_LIMIT_PER_HOST,
+                                         RESERVOIR_API_KEY, RESERVOIR_API_KEYS,
+                                         RESERVOIR_BASE_URL, RESERVOIR_BURST,
+                                         RESERVOIR_CIRCUIT_FAILURE_THRESHOLD,
+                                         RESERVOIR_CIRCUIT_RECOVERY_TIMEOUT,
+                                         RESERVOIR_REQUESTS_PER_MINUTE,
+                                         RESERVOIR_WS_URL,
+                                         SALES_DEDUPE_CACHE_SIZE,
+                                         SALES_DEDUPE_TTL_DAYS,
+                                         SALES_DIGEST_SUMMARY_MIN_SALES,
+                                         SALES_DIGEST_WINDOW_SECONDS,
+                                         SALES_DISPATCH_MODE,
+                                         SALES_INGESTION_MODE)
+from src.modules.administration.repositories.discord_action_repository import \
+    DiscordActionRepository
 from src.modules.administration.repositories.guild_config_repository import \
     GuildConfigRepository
 from src.modules.automation.cogs.holder_verification_cog import \
@@ -23,6 +50,10 @@ from src.modules.automation.repositories.holder_verification_repository import \
     HolderVerificationRepository
 from src.modules.automation.services.holder_verification_service import \
     HolderVerificationService
+from src.modules.automation.services.ownership_cache_service import \
+    OwnershipCacheService
+from src.modules.automation.services.sale_dedupe_service import \
+    SaleDedupeService
 from src.modules.automation.services.sales_notification_service import \
     SalesNotificationService
 from src.modules.automation.services.sales_service import SalesService
@@ -50,9 +81,12 @@ from src.modules.moderation.usecases.captcha_verify_usecase import \
     CaptchaVerifyUseCase
 from src.modules.moderation.views.captcha_button_view import \
     VerificationButtonView
+from src.shared.services.collection_stats_cache import CollectionStatsCache
+from src.shared.services.discord_action_executor import DiscordActionExecutor
 from src.shared.services.discord_service import DiscordService
 from src.shared.services.http_client import AioHttpClient
 from src.shared.services.reservoir_service import ReservoirService
+from src.shared.services.reservoir_stream_service import ReservoirStreamService
 
 
 class MyBot(commands.Bot):
@@ -62,27 +96,71 @@ class MyBot(commands.Bot):
         intents.members = True
         super().__init__(command_prefix="s!", intents=intents)
 
-        self.discord_service = DiscordService(self)
+        self.discord_action_executor = DiscordActionExecutor(
+            self,
+            DiscordActionRepository(),
+            max_concurrency=DISCORD_ACTION_CONCURRENCY,
+            max_attempts=DISCORD_ACTION_MAX_ATTEMPTS,
+        )
+        self.discord_service = DiscordService(
+            self, action_executor=self.discord_action_executor
+        )
+        self.http_client = AioHttpClient(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        )
         self.reservoir_service = ReservoirService(
-            RESERVOIR_API_KEY, http_client=AioHttpClient()
+            RESERVOIR_API_KEY,
+            http_client=self.http_client,
+            api_keys=RESERVOIR_API_KEYS,
+            requests_per_minute=RESERVOIR_REQUESTS_PER_MINUTE,
+            burst=RESERVOIR_BURST,
+            base_url=RESERVOIR_BASE_URL,
+            circuit_failure_threshold=RESERVOIR_CIRCUIT_FAILURE_THRESHOLD,
+            circuit_recovery_timeout=RESERVOIR_CIRCUIT_RECOVERY_TIMEOUT,
         )
 
         # SALES
-        self.sales_service = SalesService(self.reservoir_service)
+        self.collection_stats = CollectionStatsCache(
+            self.reservoir_service,
+            refresh_interval=COLLECTION_STATS_REFRESH_SECONDS,
+            max_requests_per_minute=COLLECTION_STATS_REQUESTS_PER_MINUTE,
+        )
+        self.sales_service = SalesService(
+            self.reservoir_service, collection_stats=self.collection_stats
+        )
         self.sales_notification_service = SalesNotificationService()
+        self.sale_dedupe_service = SaleDedupeService(
+            cache_size=SALES_DEDUPE_CACHE_SIZE, ttl_days=SALES_DEDUPE_TTL_DAYS
+        )
 
         self.fetch_sales_usecase = SalesFetchUseCase(self.sales_service)
         self.send_sales_usecase = SalesSendUseCase(
-            self.discord_service, self.sales_notification_service
+            self.discord_service,
+            self.sales_notification_service,
+            sale_dedupe_service=self.sale_dedupe_service,
+            digest_window=SALES_DIGEST_WINDOW_SECONDS
+            if SALES_DISPATCH_MODE == "digest"
+            else None,
+            summary_min_sales=SALES_DIGEST_SUMMARY_MIN_SALES,
         )
 
         self.sales_controller = SalesController(
             self.fetch_sales_usecase, self.send_sales_usecase
         )
+        self.sales_stream = None
+        if SALES_INGESTION_MODE == "stream":
+            self.sales_stream = ReservoirStreamService(
+                (RESERVOIR_API_KEYS or [RESERVOIR_API_KEY])[0],
+                http_client=self.http_client,
+                ws_url=RESERVOIR_WS_URL,
+            )
 
         # CAPTCHA
         self.captcha_verification_repository = CaptchaRepository()
-        self.captcha_service = CaptchaService(self)
+        self.captcha_service = CaptchaService(self, http_client=self.http_client)
         self.captcha_verification_service = CaptchaEmbedService()
 
         self.generate_captcha_usecase = CaptchaGenerateUseCase(
@@ -101,21 +179,32 @@ class MyBot(commands.Bot):
         )
         # HOLDER VERIFICATION
         self.holder_verification_service = HolderVerificationService(
-            self.reservoir_service
+            self.reservoir_service,
+            workers=HOLDER_VERIFICATION_WORKERS,
+            max_queue_size=HOLDER_VERIFICATION_QUEUE_SIZE,
+            timeout=HOLDER_VERIFICATION_TIMEOUT_SECONDS,
         )
         self.holder_verification_repository = HolderVerificationRepository()
+        self.ownership_cache = OwnershipCacheService(
+            cache_size=HOLDER_OWNERSHIP_CACHE_SIZE
+        )
         self.holder_verification_config_repository = HolderConfigRepository()
         self.holder_verification_usecase = [
             HolderVerificationUseCase(
                 self.holder_verification_service,
                 self.holder_verification_config_repository,
                 self.holder_verification_repository,
+                self.discord_service,
+                ownership_cache=self.ownership_cache,
             ),
             HolderFetchAllUseCase(
                 self.holder_verification_service,
                 self.holder_verification_repository,
                 self.holder_verification_config_repository,
                 self,
+                full_scan_interval=timedelta(hours=HOLDER_FULL_SCAN_INTERVAL_HOURS),
+                discord_service=self.discord_service,
+                ownership_cache=self.ownership_cache,
             ),
         ]
         self.holder_verification_controller = HolderVerificationController(
@@ -128,13 +217,22 @@ class MyBot(commands.Bot):
         await Tortoise.init(config=DATABASE)
         logger.success("Database initialized successfully.")
 
+        await self.http_client.start()
+
         log_config = LoguruConfig()
         log_config.setup_logging()
         logger.success("Logging configured successfully.")
 
         logger.info("Loading cogs and views...")
         await self.add_cog(CaptchaConfigCog(self, self.captcha_verification_controller))
-        await self.add_cog(SalesConfigCog(self, self.sales_controller))
+        await self.add_cog(
+            SalesConfigCog(
+                self,
+                self.sales_controller,
+                sales_stream=self.sales_stream,
+                collection_stats=self.collection_stats,
+            )
+        )
         await self.add_cog(
             HolderVerificationCog(
                 self,
@@ -153,12 +251,15 @@ class MyBot(commands.Bot):
         self.add_view(HolderVerificationButtonView(self.holder_verification_controller))
         logger.success("Cogs and views loaded successfully.")
 
-        await self.holder_verification_service.start_worker()
+        await self.holder_verification_service.start_workers()
 
     async def on_ready(self):
         await self.wait_until_ready()
         logger.info("Bot is ready. Starting periodic tasks and syncing commands...")
         await self.sync_commands()
+        # Runs the Discord calls queued so far, including those left by the last run.
+        await self.discord_action_executor.start()
+        await self.send_sales_usecase.restore()
 
         logger.info("Adding guilds to the database...")
         for guild in self.guilds:
@@ -192,7 +293,11 @@ class MyBot(commands.Bot):
 
     async def close(self):
         logger.info("Closing database connections and shutting down the bot...")
+        await self.send_sales_usecase.flush()
+        await self.discord_action_executor.close()
         await Tortoise.close_connections()
+        await self.reservoir_service.close()
+        await self.http_client.close()
         await super().close()
         logger.success("Bot shut down successfully.")
 
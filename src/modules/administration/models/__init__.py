@@ -1,2 +1,3 @@
+from .discord_action_model import DiscordActionModel
 from .guild_config_model import GuildConfig
 from .users_model import Users
@@ -0,0 +1,20 @@
+from tortoise import fields, models
+
+
+class DiscordActionModel(models.Model):
+    """
+    Model representing a Discord API call waiting in the outbox.
+    """
+
+    id = fields.BigIntField(pk=True)
+    kind = fields.CharField(max_length=32)
+    route = fields.CharField(max_length=64)
+    payload = fields.JSONField()
+    status = fields.CharField(max_length=16, default="pending", index=True)
+    attempts = fields.IntField(default=0)
+    next_attempt_at = fields.DatetimeField(null=True, timezone=True)
+    last_error = fields.TextField(null=True)
+    created_at = fields.DatetimeField(auto_now_add=True, timezone=True)
+
+    class Meta:
+        table = "discord_action"
@@ -0,0 +1,84 @@
+from datetime import datetime
+from typing import List, Optional
+
+from loguru import logger
+
+from src.modules.administration.models.discord_action_model import \
+    DiscordActionModel
+
+
+class DiscordActionRepository:
+    """
+    Repository for the outbox of Discord API calls.
+    """
+
+    @staticmethod
+    async def create(
+        kind: str, route: str, payload: dict
+    ) -> Optional[DiscordActionModel]:
+        """
+        Stores a new pending action. Returns None if it could not be stored.
+        """
+        try:
+            return await DiscordActionModel.create(
+                kind=kind, route=route, payload=payload
+            )
+        except Exception as e:
+            logger.error(f"Error storing Discord action {kind} on {route}: {e}")
+            return None
+
+    @staticmethod
+    async def get_pending() -> List[DiscordActionModel]:
+        """
+        Retrieves every pending action, oldest first.
+        """
+        try:
+            return await DiscordActionModel.filter(status="pending").order_by("id")
+        except Exception as e:
+            logger.error(f"Error retrieving pending Discord actions: {e}")
+            return []
+
+    @staticmethod
+    async def delete(action: DiscordActionModel):
+        """
+        Removes an action that was carried out.
+        """
+        try:
+            await action.delete()
+        except Exception as e:
+            logger.error(f"Error deleting Discord action {action.id}: {e}")
+
+    @staticmethod
+    async def save_attempt(
+        action: DiscordActionModel,
+        error: str,
+        next_attempt_at: Optional[datetime] = None,
+    ):
+        """
+        Records a failed attempt. Without next_attempt_at the action is marked
+        as failed and will not be retried.
+        """
+        action.attempts += 1
+        action.last_error = error[:1000]
+        action.next_attempt_at = next_attempt_at
+        if next_attempt_at is None:
+            action.status = "failed"
+        try:
+            await action.save(
+                update_fields=["attempts", "last_error", "next_attempt_at", "status"]
+            )
+        except Exception as e:
+            logger.error(f"Error updating Discord action {action.id}: {e}")
+
+    @staticmethod
+    async def delete_failed_before(cutoff: datetime) -> int:
+        """
+        Removes the failed actions created before cutoff. Returns how many were removed.
+        """
+        try:
+            return await DiscordActionModel.filter(
+                status="failed", created_at__lt=cutoff
+            ).delete()
+        except Exception as e:
+            logger.error(f"Error compacting failed Discord actions: {e}")
+            return 0
@@ -1,3 +1,5 @@
+import re
+
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
@@ -8,6 +10,9 @@ from src.modules.automation.services.holder_verification_service import \
 from src.modules.automation.views.holder_verification_view import \
     HolderVerificationButtonView
 
+# One extra tier: "MIN-MAX ROLE" or "MIN+ ROLE", with a role mention or ID.
+TIER_PATTERN = re.compile(r"^(\d+)\s*(?:-\s*(\d+)|\+)\s+(?:<@&)?(\d+)>?$")
+
 
 class HolderVerificationCog(commands.Cog):
     """
@@ -42,6 +47,10 @@ class HolderVerificationCog(commands.Cog):
         name="holder_verification_config",
         description="Configure NFT-based role assignment.",
     )
+    @app_commands.describe(
+        cache_minutes="How old a holder's NFT count may be to verify them without a new lookup (default 15).",
+        more_tiers="Further tiers separated by commas, e.g. '11-20 @Whale, 21+ @Legend'.",
+    )
     @app_commands.default_permissions(administrator=True)
     async def holder_verification_config(
         self,
@@ -59,6 +68,8 @@ class HolderVerificationCog(commands.Cog):
         min4: int = None,
         max4: int | None = None,
         role4: discord.Role = None,
+        cache_minutes: app_commands.Range[int, 0, 1440] = None,
+        more_tiers: str = None,
     ):
         """
         Configura a verificação de holders com intervalos personalizados.
@@ -72,10 +83,23 @@ class HolderVerificationCog(commands.Cog):
                 roles_data.append((min3, max3, role3.id))
             if min4 and role4:
                 roles_data.append((min4, max4, role4.id))
+            if more_tiers:
+                try:
+                    roles_data.extend(self._parse_tiers(more_tiers, interaction.guild))
+                except ValueError as e:
+                    await interaction.response.send_message(
+                        f"**Invalid tiers:** {e}", ephemeral=True
+                    )
+                    return
 
             # Save configuration in database
             save_control = await self.holder_config_repository.save_config(
-                interaction.guild_id, collection_address, roles_data
+                interaction.guild_id,
+                collection_address,
+                roles_data,
+                ownership_max_age=cache_minutes * 60
+                if cache_minutes is not None
+                else None,
             )
             if not save_control:
                 return
@@ -99,3 +123,24 @@ class HolderVerificationCog(commands.Cog):
             await interaction.response.send_message(
                 "**Failed to save the configuration.**", ephemeral=True
             )
+
+    @staticmethod
+    def _parse_tiers(text: str, guild: discord.Guild) -> list:
+        """
+        Parses comma-separated "MIN-MAX ROLE" or "MIN+ ROLE" tiers into
+        (min_nft, max_nft, role_id) tuples.
+        """
+        tiers = []
+        for entry in filter(None, (part.strip() for part in text.split(","))):
+            match = TIER_PATTERN.match(entry)
+            if not match:
+                raise ValueError(
+                    f"`{entry}` should look like `11-20 @Role` or `21+ @Role`."
+                )
+            min_nft, max_nft, role_id = match.groups()
+            if guild.get_role(int(role_id)) is None:
+                raise ValueError(f"role {role_id} does not exist in this server.")
+            tiers.append(
+                (int(min_nft), int(max_nft) if max_nft else None, int(role_id))
+            )
+        return tiers
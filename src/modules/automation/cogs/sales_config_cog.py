@@ -1,4 +1,5 @@
-from typing import List
+import asyncio
+from typing import List, Optional
 
 import discord
 from discord import app_commands
@@ -11,21 +12,66 @@ from src.modules.automation.repositories.sales_config_repository import \
 
 
 class SalesConfigCog(commands.Cog):
-    def __init__(self, bot: "commands.Bot", sales_controller: "SalesController"):
+    def __init__(
+        self,
+        bot: "commands.Bot",
+        sales_controller: "SalesController",
+        sales_stream: Optional["ReservoirStreamService"] = None,
+        collection_stats: Optional["CollectionStatsCache"] = None,
+    ):
         self.bot = bot
         self.sales_controller = sales_controller
+        self.sales_stream = sales_stream
+        self.collection_stats = collection_stats
+        self.stream_task = None
+        self.stats_task = None
 
     @commands.Cog.listener()
     async def on_ready(self):
         await self.bot.wait_until_ready()
-        self.check_sales.start()
+        if not self.check_sales.is_running():
+            self.check_sales.start()
         logger.info("SalesConfigCog is ready and the sales check task has started.")
 
+        if self.sales_stream and self.stream_task is None:
+            self.stream_task = asyncio.create_task(
+                self.sales_stream.run(
+                    self._get_tracked_contracts,
+                    self._handle_streamed_sales,
+                    self.poll_sales,
+                )
+            )
+            logger.info("Sales stream started.")
+
+        if self.collection_stats and self.stats_task is None:
+            self.stats_task = asyncio.create_task(
+                self.collection_stats.run(self._get_tracked_contracts)
+            )
+            logger.info("Collection stats refresh started.")
+
+    async def cog_unload(self):
+        if self.stream_task:
+            self.stream_task.cancel()
+            self.stream_task = None
+        if self.stats_task:
+            self.stats_task.cancel()
+            self.stats_task = None
+        self.check_sales.cancel()
+
     @tasks.loop(minutes=2)
     async def check_sales(self):
         """
         Task that checks sales periodically and sends them to Discord.
+        While the sales stream is connected, sales are pushed instead and the
+        poll is skipped.
         """
+        if self.sales_stream and self.sales_stream.connected:
+            logger.debug("Sales stream connected, skipping the sales poll.")
+            return
+
+        await self.poll_sales()
+
+    async def poll_sales(self):
         logger.info("Checking for new sales...")
 
         active_sales = await SalesConfigRepository.get_active_configs()
@@ -37,6 +83,15 @@ class SalesConfigCog(commands.Cog):
         await self.sales_controller.handle_sale(active_sales)
         logger.success("Sales check completed.")
 
+    async def _get_tracked_contracts(self) -> List[str]:
+        active_sales = await SalesConfigRepository.get_active_configs()
+        return list({contract for _, contract in active_sales})
+
+    async def _handle_streamed_sales(self, sales: List["ReservoirSale"]):
+        active_sales = await SalesConfigRepository.get_active_configs()
+        if active_sales:
+            await self.sales_controller.handle_streamed_sales(active_sales, sales)
+
     @app_commands.command(
         name="sales_config",
         description="Configure a channel to receive NFT sales notifications.",
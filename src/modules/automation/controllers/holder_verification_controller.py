@@ -1,5 +1,8 @@
+from typing import Awaitable, Callable, Optional
+
 from loguru import logger
 
+from ..services.holder_verification_service import VerificationUnavailableError
 from ..usecases.holder_fetch_all_usecase import HolderFetchAllUseCase
 from ..usecases.holder_verification_usecase import HolderVerificationUseCase
 
@@ -18,14 +21,18 @@ class HolderVerificationController:
         self.holder_fetch_all_usecase = holder_fetch_all_usecase
 
     async def handle_individual_verification(
-        self, wallet_address: str, user: "discord.Member"
+        self,
+        wallet_address: str,
+        user: "discord.Member",
+        on_position: Optional[Callable[[int], Awaitable]] = None,
     ):
         """
         Checks a single holder based on the wallet_address and updates the user’s role in Discord.
+        Raises VerificationUnavailableError when the check cannot be carried out right now.
         """
         try:
             role_id = await self.holder_verification_usecase.execute(
-                wallet_address, user
+                wallet_address, user, on_position=on_position
             )
             if role_id:
                 logger.success(
@@ -37,6 +44,8 @@ class HolderVerificationController:
                     f"User {user.id} with wallet {wallet_address} does not meet the NFT requirements for a role assignment."
                 )
                 return None
+        except VerificationUnavailableError:
+            raise
         except Exception as e:
             logger.error(
                 f"Error verifying holder {user.id} with wallet {wallet_address}: {e}"
@@ -1,8 +1,10 @@
+import asyncio
 from dataclasses import dataclass
 from typing import List, Tuple
 
 from loguru import logger
 
+from ..services.sale_dedupe_service import SaleClaimError
 from ..usecases.sales_fetch_usecase import SalesFetchUseCase
 from ..usecases.sales_send_usecase import SalesSendUseCase
 
@@ -25,22 +27,71 @@ class SalesController:
     ):
         self.fetch_sales_usecase = fetch_sales_usecase
         self.send_sales_use_case = send_sales_use_case
+        # Polls and streamed sales share the sale cursors, so they take turns.
+        self._lock = asyncio.Lock()
 
     async def handle_sale(self, active_sales: List[Tuple[int, str]]):
         """
         Processes active sales and sends notifications.
         """
         try:
-            tracked_contracts = [
-                TrackedContract(channel_id=channel_id, contract_address=contract)
-                for channel_id, contract in active_sales
-            ]
+            async with self._lock:
+                tracked_contracts = self._tracked_contracts(active_sales)
 
-            sales = await self.fetch_sales_usecase.execute(tracked_contracts)
+                sales = await self.fetch_sales_usecase.execute(tracked_contracts)
 
-            if sales:
-                await self.send_sales_use_case.execute(sales)
-                logger.success("Sales dispatched successfully")
+                if sales:
+                    if not await self._send(sales):
+                        return
+                    logger.success("Sales dispatched successfully")
+
+                await self.fetch_sales_usecase.commit()
         except Exception as e:
             logger.error(f"Controller error: {e}")
             raise
+
+    async def handle_streamed_sales(
+        self, active_sales: List[Tuple[int, str]], raw_sales: List["ReservoirSale"]
+    ):
+        """
+        Sends notifications for sales pushed by the sales stream.
+        """
+        try:
+            async with self._lock:
+                tracked_contracts = self._tracked_contracts(active_sales)
+
+                sales = await self.fetch_sales_usecase.execute_for_sales(
+                    raw_sales, tracked_contracts
+                )
+
+                if sales:
+                    if not await self._send(sales):
+                        return
+                    logger.success("Streamed sales dispatched successfully")
+
+                await self.fetch_sales_usecase.commit()
+        except Exception as e:
+            logger.error(f"Controller error: {e}")
+            raise
+
+    async def _send(self, sales: List["Sale"]) -> bool:
+        """
+        Sends the sales, or discards them when they could not be claimed, so
+        the next poll fetches them again instead of skipping past them.
+        """
+        try:
+            await self.send_sales_use_case.execute(sales)
+            return True
+        except SaleClaimError as e:
+            logger.warning(f"{e} Sales will be fetched again on the next poll.")
+            self.fetch_sales_usecase.discard()
+            return False
+
+    @staticmethod
+    def _tracked_contracts(
+        active_sales: List[Tuple[int, str]]
+    ) -> List[TrackedContract]:
+        return [
+            TrackedContract(channel_id=channel_id, contract_address=contract)
+            for channel_id, contract in active_sales
+        ]
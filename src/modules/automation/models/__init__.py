@@ -1,5 +1,9 @@
 from .holder_role_threshold_model import HolderRoleThresholdModel
+from .holder_sync_cursor_model import HolderSyncCursorModel
 from .holder_user_role_model import HolderUserRoleModel
 from .holder_verification_config_model import HolderVerificationConfigModel
 from .holder_verification_model import HolderVerificationModel
+from .sale_digest_entry_model import SaleDigestEntryModel
+from .sale_dispatch_model import SaleDispatchModel
+from .sales_cursor_model import SalesCursorModel
 from .sales_nft_config_model import SalesNftConfig
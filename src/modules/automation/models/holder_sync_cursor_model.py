@@ -0,0 +1,18 @@
+from tortoise import fields, models
+
+
+class HolderSyncCursorModel(models.Model):
+    """
+    Model representing how far the holder sync of a guild's collection has progressed.
+    """
+
+    id = fields.IntField(pk=True)
+    guild_id = fields.BigIntField()
+    collection_address = fields.CharField(max_length=255)
+    last_event_timestamp = fields.BigIntField(null=True)
+    last_full_scan_at = fields.DatetimeField(null=True, timezone=True)
+    updated_at = fields.DatetimeField(auto_now=True, timezone=True)
+
+    class Meta:
+        table = "holder_sync_cursor"
+        unique_together = ("guild_id", "collection_address")
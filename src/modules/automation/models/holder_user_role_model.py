@@ -13,3 +13,4 @@ class HolderUserRoleModel(models.Model):
 
     class Meta:
         table = "holder_user_roles"
+        unique_together = ("discord_user_id", "guild_id")
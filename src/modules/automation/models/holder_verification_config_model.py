@@ -9,6 +9,8 @@ class HolderVerificationConfigModel(models.Model):
     id = fields.IntField(pk=True)
     collection_address = fields.CharField(max_length=255)
     guild_id = fields.BigIntField()
+    # Seconds a cached NFT count may be used to answer a verification.
+    ownership_max_age = fields.IntField(default=900)
 
     class Meta:
         table = "holder_verification_config"
@@ -8,9 +8,13 @@ class HolderVerificationModel(models.Model):
 
     id = fields.IntField(pk=True)
     wallet_address = fields.CharField(max_length=255)
-    discord_user_id = fields.BigIntField()
+    discord_user_id = fields.BigIntField(index=True)
     guild_id = fields.BigIntField()
     nft_count = fields.IntField(default=0)
+    # The collection nft_count was checked against, and when.
+    collection_address = fields.CharField(max_length=255, null=True)
+    updated_at = fields.DatetimeField(null=True, timezone=True)
 
     class Meta:
         table = "holder_verification"
+        unique_together = ("wallet_address", "discord_user_id", "guild_id")
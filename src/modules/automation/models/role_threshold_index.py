@@ -0,0 +1,37 @@
+from bisect import bisect_right
+from typing import Iterable, Optional, Tuple
+
+
+class RoleThresholdIndex:
+    """
+    The role thresholds of a guild's collection, sorted by min_nft.
+
+    role_for() finds the threshold with the highest min_nft not above the
+    amount by binary search, and returns its role if the amount is also
+    within its max_nft (None means no upper bound).
+    """
+
+    __slots__ = ("collection_address", "min_nfts", "max_nfts", "role_ids")
+
+    def __init__(
+        self,
+        collection_address: str,
+        thresholds: Iterable[Tuple[int, Optional[int], int]],
+    ):
+        self.collection_address = collection_address
+        ordered = sorted(thresholds, key=lambda threshold: threshold[0])
+        self.min_nfts = [min_nft for min_nft, _, _ in ordered]
+        self.max_nfts = [max_nft for _, max_nft, _ in ordered]
+        self.role_ids = [role_id for _, _, role_id in ordered]
+
+    def role_for(self, nft_amount: int) -> Optional[int]:
+        position = bisect_right(self.min_nfts, nft_amount) - 1
+        if position < 0:
+            return None
+        max_nft = self.max_nfts[position]
+        if max_nft is None or nft_amount <= max_nft:
+            return self.role_ids[position]
+        return None
+
+    def __len__(self) -> int:
+        return len(self.role_ids)
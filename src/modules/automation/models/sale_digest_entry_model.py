@@ -0,0 +1,18 @@
+from tortoise import fields, models
+
+
+class SaleDigestEntryModel(models.Model):
+    """
+    Model representing a sale queued for a channel's next digest.
+    """
+
+    id = fields.IntField(pk=True)
+    tx_hash = fields.CharField(max_length=255)
+    log_index = fields.IntField()
+    channel_id = fields.BigIntField()
+    sale = fields.JSONField()
+    created_at = fields.DatetimeField(auto_now_add=True, timezone=True)
+
+    class Meta:
+        table = "sale_digest_entry"
+        unique_together = ("tx_hash", "log_index", "channel_id")
@@ -0,0 +1,17 @@
+from tortoise import fields, models
+
+
+class SaleDispatchModel(models.Model):
+    """
+    Model representing a sale already sent to a channel.
+    """
+
+    id = fields.IntField(pk=True)
+    tx_hash = fields.CharField(max_length=255)
+    log_index = fields.IntField()
+    channel_id = fields.BigIntField()
+    created_at = fields.DatetimeField(auto_now_add=True, timezone=True, index=True)
+
+    class Meta:
+        table = "sale_dispatch"
+        unique_together = ("tx_hash", "log_index", "channel_id")
@@ -0,0 +1,16 @@
+from tortoise import fields, models
+
+
+class SalesCursorModel(models.Model):
+    """
+    Model representing the newest sale already announced for a tracked contract.
+    """
+
+    id = fields.IntField(pk=True)
+    contract_address = fields.CharField(max_length=255, unique=True)
+    last_timestamp = fields.BigIntField()
+    last_sale_id = fields.CharField(max_length=255, null=True)
+    updated_at = fields.DatetimeField(auto_now=True, timezone=True)
+
+    class Meta:
+        table = "sales_cursor"
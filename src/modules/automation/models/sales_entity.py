@@ -1,8 +1,28 @@
+from datetime import datetime, timezone
+from typing import Tuple
+
+
 class Sale:
     """
     Represents a sale transaction.
     """
 
+    __slots__ = (
+        "token_id",
+        "name",
+        "contract",
+        "price_native",
+        "price_usd",
+        "timestamp",
+        "seller",
+        "buyer",
+        "image",
+        "collection_data",
+        "channel_ids",
+        "tx_hash",
+        "log_index",
+    )
+
     def __init__(
         self,
         name,
@@ -16,6 +36,8 @@ class Sale:
         image,
         collection_data,
         channel_ids=None,
+        tx_hash=None,
+        log_index=None,
     ):
         self.token_id = token_id
         self.name = name
@@ -28,3 +50,74 @@ class Sale:
         self.image = image
         self.collection_data = collection_data
         self.channel_ids = channel_ids if channel_ids else []
+        self.tx_hash = tx_hash
+        self.log_index = log_index
+
+    @classmethod
+    def from_reservoir(
+        cls,
+        sale: "ReservoirSale",
+        token: "ReservoirToken",
+        collection_data: dict,
+    ) -> "Sale":
+        """
+        Builds a Sale from a Reservoir sale and the token metadata to show for it.
+        """
+        return cls(
+            name=token.name,
+            token_id=sale.token.token_id,
+            contract=sale.token.contract,
+            price_native=sale.price_native,
+            price_usd=sale.price_usd,
+            timestamp=datetime.fromtimestamp(sale.timestamp, timezone.utc),
+            seller=sale.seller,
+            buyer=sale.buyer,
+            image=token.image,
+            collection_data=collection_data,
+            tx_hash=sale.tx_hash or sale.id,
+            log_index=sale.log_index or 0,
+        )
+
+    def to_payload(self) -> dict:
+        """
+        Returns the sale as JSON-serializable data, without its channels.
+        """
+        collection_data = dict(self.collection_data or {})
+        if isinstance(collection_data.get("updated_at"), datetime):
+            collection_data["updated_at"] = collection_data["updated_at"].isoformat()
+        return {
+            "name": self.name,
+            "token_id": self.token_id,
+            "contract": self.contract,
+            "price_native": self.price_native,
+            "price_usd": self.price_usd,
+            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
+            "seller": self.seller,
+            "buyer": self.buyer,
+            "image": self.image,
+            "collection_data": collection_data,
+            "tx_hash": self.tx_hash,
+            "log_index": self.log_index,
+        }
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "Sale":
+        """
+        Rebuilds a sale from to_payload() data.
+        """
+        payload = dict(payload)
+        if payload.get("timestamp"):
+            payload["timestamp"] = datetime.fromisoformat(payload["timestamp"])
+        collection_data = dict(payload.get("collection_data") or {})
+        if collection_data.get("updated_at"):
+            collection_data["updated_at"] = datetime.fromisoformat(
+                collection_data["updated_at"]
+            )
+        payload["collection_data"] = collection_data
+        return cls(**payload)
+
+    def dispatch_key(self, channel_id: int) -> Tuple[str, int, int]:
+        """
+        Identifies this sale in a channel, for deduplication.
+        """
+        return (self.tx_hash, self.log_index, channel_id)
@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from loguru import logger
+
+from ..models.holder_sync_cursor_model import HolderSyncCursorModel
+
+
+class HolderSyncCursorRepository:
+    """
+    Repository responsible for persisting the holder sync cursor of each guild's collection.
+    """
+
+    @staticmethod
+    async def get_cursor(
+        guild_id: int, collection_address: str
+    ) -> Optional[HolderSyncCursorModel]:
+        """
+        Retrieves the sync cursor for a guild's collection, if one was saved.
+        """
+        try:
+            return await HolderSyncCursorModel.get_or_none(
+                guild_id=guild_id, collection_address=collection_address.lower()
+            )
+        except Exception as e:
+            logger.error(
+                f"Error retrieving sync cursor for {collection_address} in guild {guild_id}: {e}"
+            )
+            return None
+
+    @staticmethod
+    async def save_cursor(
+        guild_id: int,
+        collection_address: str,
+        last_event_timestamp: int,
+        full_scan: bool = False,
+    ):
+        """
+        Stores the timestamp of the last processed transfer, and the time of
+        the full scan when the cursor comes from one.
+        """
+        try:
+            values = {"last_event_timestamp": last_event_timestamp}
+            if full_scan:
+                values["last_full_scan_at"] = datetime.now(timezone.utc)
+
+            await HolderSyncCursorModel.update_or_create(
+                guild_id=guild_id,
+                collection_address=collection_address.lower(),
+                defaults=values,
+            )
+            logger.info(
+                f"Sync cursor for {collection_address} in guild {guild_id} moved to {last_event_timestamp}"
+            )
+        except Exception as e:
+            logger.error(
+                f"Error saving sync cursor for {collection_address} in guild {guild_id}: {e}"
+            )
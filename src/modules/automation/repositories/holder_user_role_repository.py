@@ -1,3 +1,5 @@
+from typing import Dict, Iterable
+
 from loguru import logger
 
 from ..models.holder_user_role_model import HolderUserRoleModel
@@ -44,3 +46,46 @@ class HolderUserRoleRepository:
                 f"Error retrieving current role for user {discord_user_id} in guild {guild_id}: {e}"
             )
             return None
+
+    @staticmethod
+    async def save_roles(roles: Dict[int, int], guild_id: int) -> bool:
+        """
+        Inserts or updates the role of many users of a guild in one statement.
+        """
+        if not roles:
+            return True
+        try:
+            await HolderUserRoleModel.bulk_create(
+                [
+                    HolderUserRoleModel(
+                        discord_user_id=discord_user_id,
+                        guild_id=guild_id,
+                        role_id=role_id,
+                    )
+                    for discord_user_id, role_id in roles.items()
+                ],
+                on_conflict=["discord_user_id", "guild_id"],
+                update_fields=["role_id"],
+                batch_size=1000,
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error saving {len(roles)} roles in guild {guild_id}: {e}")
+            return False
+
+    @staticmethod
+    async def delete_roles(discord_user_ids: Iterable[int], guild_id: int) -> bool:
+        """
+        Deletes the recorded role of the given users of a guild.
+        """
+        discord_user_ids = list(discord_user_ids)
+        if not discord_user_ids:
+            return True
+        try:
+            await HolderUserRoleModel.filter(
+                discord_user_id__in=discord_user_ids, guild_id=guild_id
+            ).delete()
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting roles in guild {guild_id}: {e}")
+            return False
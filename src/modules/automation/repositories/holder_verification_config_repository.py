@@ -1,42 +1,75 @@
+from typing import Dict, Optional
+
 from loguru import logger
+from tortoise.transactions import in_transaction
 
 from src.modules.automation.models.holder_role_threshold_model import \
     HolderRoleThresholdModel
 from src.modules.automation.models.holder_verification_config_model import \
     HolderVerificationConfigModel
+from src.modules.automation.models.role_threshold_index import \
+    RoleThresholdIndex
+from src.modules.automation.repositories.holder_verification_repository import \
+    HolderVerificationRepository
 
 
 class HolderConfigRepository:
     """
     Repository responsible for handling holder verification configurations.
+
+    A guild's current configuration is its latest one; saving another
+    collection adds a new configuration rather than editing an older one.
+    The role thresholds of the current configuration are loaded once into an
+    in-memory index, rebuilt whenever save_config runs, so resolving roles
+    does not query the database.
     """
 
+    _threshold_indexes: Dict[int, RoleThresholdIndex] = {}
+
     @staticmethod
-    async def get_role_by_nft_amount(nft_amount: int):
+    async def _current_config(
+        guild_id: int,
+    ) -> Optional[HolderVerificationConfigModel]:
+        return (
+            await HolderVerificationConfigModel.filter(guild_id=guild_id)
+            .order_by("-id")
+            .first()
+        )
+
+    @staticmethod
+    async def get_threshold_index(guild_id: int) -> Optional[RoleThresholdIndex]:
         """
-        Fetch the corresponding role for a given NFT amount.
+        Returns the role threshold index of a guild, loading it on first use.
         """
+        index = HolderConfigRepository._threshold_indexes.get(guild_id)
+        if index is not None:
+            return index
+
         try:
-            config = await HolderVerificationConfigModel.first()
+            config = await HolderConfigRepository._current_config(guild_id)
             if not config:
                 return None
 
-            role_threshold = (
-                await HolderRoleThresholdModel.filter(
-                    config=config, min_nft__lte=nft_amount
-                )
-                .order_by("-min_nft")
-                .first()
-            )
-
-            if role_threshold and (
-                role_threshold.max_nft is None or nft_amount <= role_threshold.max_nft
-            ):
-                return role_threshold.role_id
-
+            thresholds = await HolderRoleThresholdModel.filter(
+                config=config
+            ).values_list("min_nft", "max_nft", "role_id")
+            index = RoleThresholdIndex(config.collection_address, thresholds)
+            HolderConfigRepository._threshold_indexes[guild_id] = index
+            return index
+        except Exception as e:
+            logger.error(f"Error loading role thresholds for guild {guild_id}: {e}")
             return None
+
+    @staticmethod
+    async def get_config_by_guild_id(guild_id: int):
+        """
+        Fetch the holder verification configuration of a specific guild, the
+        latest one if the guild switched collections.
+        """
+        try:
+            return await HolderConfigRepository._current_config(guild_id)
         except Exception as e:
-            logger.error(f"Error retrieving role for NFT amount {nft_amount}: {e}")
+            logger.error(f"Error fetching holder config for guild {guild_id}: {e}")
             return None
 
     @staticmethod
@@ -45,7 +78,7 @@ class HolderConfigRepository:
         Fetch the collection address for a specific guild.
         """
         try:
-            config = await HolderVerificationConfigModel.get_or_none(guild_id=guild_id)
+            config = await HolderConfigRepository._current_config(guild_id)
 
             if config:
                 return config.collection_address
@@ -60,33 +93,69 @@ class HolderConfigRepository:
         guild_id: str,
         collection_address: str,
         roles_data: list[tuple[int, int | None, int]],
+        ownership_max_age: int | None = None,
     ):
         """
         Save holder verification configuration for a specific guild and collection.
+        The guild's current configuration is updated when it is of the same
+        collection, otherwise the new one becomes current.
+        ownership_max_age, when given, sets how many seconds a cached NFT count
+        may answer a verification.
         """
         try:
-            existing_config = await HolderVerificationConfigModel.get_or_none(
-                guild_id=guild_id, collection_address=collection_address
-            )
+            async with in_transaction():
+                existing_config = await HolderConfigRepository._current_config(guild_id)
+                if (
+                    existing_config
+                    and existing_config.collection_address.lower()
+                    == collection_address.lower()
+                ):
+                    await HolderRoleThresholdModel.filter(
+                        config=existing_config
+                    ).delete()
+                    logger.info(
+                        f"Old thresholds deleted for collection {collection_address} in guild {guild_id}"
+                    )
+                else:
+                    # An older configuration of this collection is replaced,
+                    # so the new one is the latest and current.
+                    stale_ids = await HolderVerificationConfigModel.filter(
+                        guild_id=guild_id, collection_address=collection_address
+                    ).values_list("id", flat=True)
+                    if stale_ids:
+                        await HolderRoleThresholdModel.filter(
+                            config_id__in=stale_ids
+                        ).delete()
+                        await HolderVerificationConfigModel.filter(
+                            id__in=stale_ids
+                        ).delete()
 
-            if existing_config:
-                await HolderRoleThresholdModel.filter(config=existing_config).delete()
-                logger.info(
-                    f"Old thresholds deleted for collection {collection_address} in guild {guild_id}"
-                )
-            else:
-                existing_config = await HolderVerificationConfigModel.create(
-                    guild_id=guild_id, collection_address=collection_address
-                )
+                    existing_config = await HolderVerificationConfigModel.create(
+                        guild_id=guild_id, collection_address=collection_address
+                    )
+                    # The recorded counts may be of another collection, so
+                    # they must not answer verifications of this one.
+                    if not await HolderVerificationRepository.expire_counts(guild_id):
+                        raise RuntimeError("recorded NFT counts could not be expired")
+
+                if ownership_max_age is not None:
+                    existing_config.ownership_max_age = ownership_max_age
+                    await existing_config.save(update_fields=["ownership_max_age"])
 
-            for min_nft, max_nft, role_id in roles_data:
-                await HolderRoleThresholdModel.create(
-                    config=existing_config,
-                    min_nft=min_nft,
-                    max_nft=max_nft,
-                    role_id=role_id,
+                await HolderRoleThresholdModel.bulk_create(
+                    [
+                        HolderRoleThresholdModel(
+                            config=existing_config,
+                            min_nft=min_nft,
+                            max_nft=max_nft,
+                            role_id=role_id,
+                        )
+                        for min_nft, max_nft, role_id in roles_data
+                    ]
                 )
 
+            index = RoleThresholdIndex(collection_address, roles_data)
+            HolderConfigRepository._threshold_indexes[int(guild_id)] = index
             logger.success(
                 f"Holder verification config saved for collection {collection_address} in guild {guild_id}"
             )
@@ -1,3 +1,6 @@
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
 from loguru import logger
 from tortoise.expressions import Q
 from tortoise.functions import Sum
@@ -28,24 +31,51 @@ class HolderVerificationRepository:
             )
             return
 
+    @staticmethod
+    async def get_wallet_links(
+        wallet_addresses: list, guild_id: int
+    ) -> List[Tuple[str, int]]:
+        """
+        Retrieves the (wallet_address, discord_user_id) pairs verified for a
+        list of wallet addresses in a given guild, without loading full records.
+        """
+        try:
+            wallet_addresses = [address.lower() for address in wallet_addresses]
+
+            return await HolderVerificationModel.filter(
+                wallet_address__in=wallet_addresses, guild_id=guild_id
+            ).values_list("wallet_address", "discord_user_id")
+        except Exception as e:
+            logger.error(f"Error retrieving wallet links in guild {guild_id}: {e}")
+            return []
+
     @staticmethod
     async def upsert(
-        wallet_address: str, discord_user_id: int, guild_id: int, nft_count: int
+        wallet_address: str,
+        discord_user_id: int,
+        guild_id: int,
+        nft_count: int,
+        collection_address: str,
     ):
         """
-        Inserts or updates the verification record for a wallet address and guild.
+        Inserts or updates the verification record for a wallet address and
+        guild with an NFT count that was just checked.
         """
         try:
+            checked = {
+                "nft_count": nft_count,
+                "collection_address": collection_address.lower(),
+                "updated_at": datetime.now(timezone.utc),
+            }
             verification, created = await HolderVerificationModel.get_or_create(
                 wallet_address=wallet_address.lower(),
                 discord_user_id=discord_user_id,
                 guild_id=guild_id,
-                defaults={"nft_count": nft_count},
+                defaults=checked,
             )
 
             if not created:
-                verification.nft_count = nft_count
-                await verification.save()
+                await verification.update_from_dict(checked).save()
 
             logger.info(
                 f"Verification updated for {wallet_address} in guild {guild_id}: {nft_count} NFTs assigned to {discord_user_id}"
@@ -55,6 +85,167 @@ class HolderVerificationRepository:
                 f"Error updating verification for {wallet_address} in guild {guild_id}: {e}"
             )
 
+    @staticmethod
+    async def link_wallet(
+        wallet_address: str,
+        discord_user_id: int,
+        guild_id: int,
+        nft_count: int,
+        collection_address: str,
+        checked_at: datetime,
+    ):
+        """
+        Records the verification of a wallet address with an NFT count checked
+        earlier, at checked_at. An existing record is left as it is, so the
+        count does not look fresher than it is.
+        """
+        try:
+            await HolderVerificationModel.get_or_create(
+                wallet_address=wallet_address.lower(),
+                discord_user_id=discord_user_id,
+                guild_id=guild_id,
+                defaults={
+                    "nft_count": nft_count,
+                    "collection_address": collection_address.lower(),
+                    "updated_at": checked_at,
+                },
+            )
+        except Exception as e:
+            logger.error(f"Error linking {wallet_address} in guild {guild_id}: {e}")
+
+    @staticmethod
+    async def bulk_upsert_counts(
+        guild_id: int, collection_address: str, counts: List[Tuple[str, int, int]]
+    ) -> bool:
+        """
+        Inserts or updates the NFT counts of many (wallet_address,
+        discord_user_id, nft_count) records of a guild, just checked against
+        the collection, in one statement.
+        """
+        if not counts:
+            return True
+        try:
+            checked_at = datetime.now(timezone.utc)
+            await HolderVerificationModel.bulk_create(
+                [
+                    HolderVerificationModel(
+                        wallet_address=wallet_address.lower(),
+                        discord_user_id=discord_user_id,
+                        guild_id=guild_id,
+                        nft_count=nft_count,
+                        collection_address=collection_address.lower(),
+                        updated_at=checked_at,
+                    )
+                    for wallet_address, discord_user_id, nft_count in counts
+                ],
+                on_conflict=["wallet_address", "discord_user_id", "guild_id"],
+                update_fields=["nft_count", "collection_address", "updated_at"],
+                batch_size=1000,
+            )
+            return True
+        except Exception as e:
+            logger.error(
+                f"Error updating {len(counts)} verifications in guild {guild_id}: {e}"
+            )
+            return False
+
+    @staticmethod
+    async def get_totals_by_guild(guild_id: int) -> Optional[Dict[int, int]]:
+        """
+        Fetches the total NFT count of every verified user of a guild, in one
+        grouped query. Returns None on error, which is not the same as no
+        holders.
+        """
+        try:
+            rows = (
+                await HolderVerificationModel.filter(guild_id=guild_id)
+                .annotate(total_nfts=Sum("nft_count"))
+                .group_by("discord_user_id")
+                .values("discord_user_id", "total_nfts")
+            )
+            return {row["discord_user_id"]: row["total_nfts"] or 0 for row in rows}
+        except Exception as e:
+            logger.error(f"Error retrieving total NFTs in guild {guild_id}: {e}")
+            return None
+
+    @staticmethod
+    async def zero_missing_counts(
+        guild_id: int, collection_address: str, seen_wallet_addresses: Iterable[str]
+    ) -> Optional[List[str]]:
+        """
+        Sets to zero the NFT count of the guild's wallets that hold NFTs but
+        are not among the given ones, which a complete holder scan of the
+        collection found. Returns the wallets that were zeroed, or None on error.
+        """
+        try:
+            seen = {address.lower() for address in seen_wallet_addresses}
+            holding = await HolderVerificationModel.filter(
+                guild_id=guild_id, nft_count__gt=0
+            ).values_list("wallet_address", flat=True)
+            missing = sorted(set(holding) - seen)
+
+            checked_at = datetime.now(timezone.utc)
+            for start in range(0, len(missing), 500):
+                await HolderVerificationModel.filter(
+                    guild_id=guild_id, wallet_address__in=missing[start : start + 500]
+                ).update(
+                    nft_count=0,
+                    collection_address=collection_address.lower(),
+                    updated_at=checked_at,
+                )
+
+            if missing:
+                logger.info(
+                    f"{len(missing)} wallets no longer hold NFTs in guild {guild_id}"
+                )
+            return missing
+        except Exception as e:
+            logger.error(f"Error zeroing missing holders in guild {guild_id}: {e}")
+            return None
+
+    @staticmethod
+    async def expire_counts(guild_id: int) -> bool:
+        """
+        Marks the NFT counts recorded in a guild as never checked, so they no
+        longer answer verifications until they are checked again.
+        """
+        try:
+            await HolderVerificationModel.filter(guild_id=guild_id).update(
+                updated_at=None
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error expiring recorded NFT counts in guild {guild_id}: {e}")
+            return False
+
+    @staticmethod
+    async def get_recent_count(
+        wallet_address: str, collection_address: str, guild_id: int, since: datetime
+    ) -> Optional[Tuple[int, datetime]]:
+        """
+        Returns the NFT count of a collection recorded for a wallet in a guild
+        and when it was checked, if it was checked since the given time.
+        """
+        try:
+            verification = (
+                await HolderVerificationModel.filter(
+                    wallet_address=wallet_address.lower(),
+                    collection_address=collection_address.lower(),
+                    guild_id=guild_id,
+                    updated_at__gte=since,
+                )
+                .order_by("-updated_at")
+                .first()
+            )
+            if verification is None:
+                return None
+            return verification.nft_count, verification.updated_at
+        except Exception as e:
+            logger.error(
+                f"Error retrieving recorded NFT count of {wallet_address} in guild {guild_id}: {e}"
+            )
+            return None
+
     @staticmethod
     async def get_total_nfts_by_user(discord_user_id: int, guild_id: int) -> int:
         """
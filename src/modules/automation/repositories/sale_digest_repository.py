@@ -0,0 +1,77 @@
+from typing import Iterable, List, Optional, Tuple
+
+from loguru import logger
+from tortoise.expressions import Q
+
+from ..models.sale_digest_entry_model import SaleDigestEntryModel
+from .sale_dispatch_repository import DispatchKey
+
+
+class SaleDigestRepository:
+    """
+    Repository responsible for persisting the sales queued for digests, so
+    they survive a restart before the digest is sent.
+    """
+
+    @staticmethod
+    async def save_entries(entries: Iterable[Tuple[DispatchKey, dict]]) -> bool:
+        """
+        Stores (dispatch key, sale payload) entries in a single insert.
+        Entries already stored are left as they are.
+        """
+        entries = list(entries)
+        if not entries:
+            return True
+        try:
+            await SaleDigestEntryModel.bulk_create(
+                [
+                    SaleDigestEntryModel(
+                        tx_hash=tx_hash,
+                        log_index=log_index,
+                        channel_id=channel_id,
+                        sale=payload,
+                    )
+                    for (tx_hash, log_index, channel_id), payload in entries
+                ],
+                ignore_conflicts=True,
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error saving {len(entries)} digest entries: {e}")
+            return False
+
+    @staticmethod
+    async def get_entries() -> Optional[List[Tuple[int, dict]]]:
+        """
+        Retrieves the stored (channel_id, sale payload) entries, oldest first.
+        Returns None on error.
+        """
+        try:
+            return (
+                await SaleDigestEntryModel.all()
+                .order_by("id")
+                .values_list("channel_id", "sale")
+            )
+        except Exception as e:
+            logger.error(f"Error retrieving digest entries: {e}")
+            return None
+
+    @staticmethod
+    async def delete_entries(keys: Iterable[DispatchKey]):
+        """
+        Removes the entries of the given keys in one delete.
+        """
+        keys = set(keys)
+        if not keys:
+            return
+        try:
+            condition = Q(
+                *(
+                    Q(tx_hash=tx_hash, log_index=log_index, channel_id=channel_id)
+                    for tx_hash, log_index, channel_id in keys
+                ),
+                join_type=Q.OR,
+            )
+            await SaleDigestEntryModel.filter(condition).delete()
+        except Exception as e:
+            logger.error(f"Error deleting digest entries: {e}")
@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Set, Tuple
+
+from loguru import logger
+from tortoise.expressions import Q
+
+from ..models.sale_dispatch_model import SaleDispatchModel
+
+# (tx_hash, log_index, channel_id)
+DispatchKey = Tuple[str, int, int]
+
+
+class SaleDispatchRepository:
+    """
+    Repository responsible for recording which sales were sent to which channels.
+    """
+
+    # Keys recorded per INSERT statement, four parameters each.
+    INSERT_BATCH_SIZE = 500
+
+    @staticmethod
+    async def insert_dispatched(
+        keys: Iterable[DispatchKey],
+    ) -> Optional[Set[DispatchKey]]:
+        """
+        Records the keys as dispatched and returns the ones this call
+        inserted. Keys already recorded, including by a concurrent claim, are
+        left out: INSERT ... ON CONFLICT DO NOTHING RETURNING lets the
+        database pick a single winner for each key. Returns None on error.
+        """
+        keys = list(set(keys))
+        if not keys:
+            return set()
+        try:
+            db = SaleDispatchModel._meta.db
+            created_at = datetime.now(timezone.utc)
+            inserted = set()
+            for start in range(0, len(keys), SaleDispatchRepository.INSERT_BATCH_SIZE):
+                batch = keys[start : start + SaleDispatchRepository.INSERT_BATCH_SIZE]
+                values = [value for key in batch for value in (*key, created_at)]
+                _, rows = await db.execute_query(
+                    SaleDispatchRepository._insert_query(
+                        db.capabilities.dialect, len(batch)
+                    ),
+                    values,
+                )
+                inserted.update((row[0], row[1], row[2]) for row in rows)
+            return inserted
+        except Exception as e:
+            logger.error(f"Error saving dispatched sales: {e}")
+            return None
+
+    @staticmethod
+    def _insert_query(dialect: str, rows: int) -> str:
+        if dialect == "postgres":
+            placeholders = [
+                f"(${row * 4 + 1}, ${row * 4 + 2}, ${row * 4 + 3}, ${row * 4 + 4})"
+                for row in range(rows)
+            ]
+        else:
+            placeholders = ["(?, ?, ?, ?)"] * rows
+        table = SaleDispatchModel._meta.db_table
+        return (
+            f"INSERT INTO {table} (tx_hash, log_index, channel_id, created_at) "
+            f"VALUES {', '.join(placeholders)} "
+            "ON CONFLICT (tx_hash, log_index, channel_id) DO NOTHING "
+            "RETURNING tx_hash, log_index, channel_id"
+        )
+
+    @staticmethod
+    async def delete_dispatched(keys: Iterable[DispatchKey]):
+        """
+        Forgets the given keys, so the sales can be dispatched again.
+        """
+        keys = set(keys)
+        if not keys:
+            return
+        try:
+            condition = Q(
+                *(
+                    Q(tx_hash=tx_hash, log_index=log_index, channel_id=channel_id)
+                    for tx_hash, log_index, channel_id in keys
+                ),
+                join_type=Q.OR,
+            )
+            await SaleDispatchModel.filter(condition).delete()
+        except Exception as e:
+            logger.error(f"Error deleting dispatched sales: {e}")
+
+    @staticmethod
+    async def delete_older_than(cutoff: datetime) -> int:
+        """
+        Removes the records created before cutoff. Returns how many were removed.
+        """
+        try:
+            return await SaleDispatchModel.filter(created_at__lt=cutoff).delete()
+        except Exception as e:
+            logger.error(f"Error compacting dispatched sales: {e}")
+            return 0
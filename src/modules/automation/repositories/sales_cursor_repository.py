@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from loguru import logger
+
+from ..models.sales_cursor_model import SalesCursorModel
+
+
+class SalesCursorRepository:
+    """
+    Repository responsible for persisting how far sales have been announced for each contract.
+    """
+
+    @staticmethod
+    async def get_cursors(
+        contract_addresses: Iterable[str],
+    ) -> Optional[Dict[str, SalesCursorModel]]:
+        """
+        Retrieves the cursors of the given contracts, keyed by lowercased address.
+        Contracts that were never polled have no cursor. Returns None on error.
+        """
+        try:
+            cursors = await SalesCursorModel.filter(
+                contract_address__in=[address.lower() for address in contract_addresses]
+            )
+            return {cursor.contract_address: cursor for cursor in cursors}
+        except Exception as e:
+            logger.error(f"Error retrieving sales cursors: {e}")
+            return None
+
+    @staticmethod
+    async def save_cursors(cursors: Dict[str, Tuple[int, str]]):
+        """
+        Stores the (timestamp, sale id) of the newest announced sale of each
+        contract, all in one upsert.
+        """
+        if not cursors:
+            return
+        try:
+            updated_at = datetime.now(timezone.utc)
+            models = []
+            for contract_address, (last_timestamp, last_sale_id) in cursors.items():
+                models.append(
+                    SalesCursorModel(
+                        contract_address=contract_address.lower(),
+                        last_timestamp=last_timestamp,
+                        last_sale_id=last_sale_id,
+                        updated_at=updated_at,
+                    )
+                )
+            await SalesCursorModel.bulk_create(
+                models,
+                on_conflict=["contract_address"],
+                update_fields=["last_timestamp", "last_sale_id", "updated_at"],
+            )
+            logger.info(f"Saved sales cursors for {len(cursors)} contracts.")
+        except Exception as e:
+            logger.error(f"Error saving sales cursors: {e}")
@@ -0,0 +1,91 @@
+import asyncio
+from typing import Dict, List, NamedTuple, Optional, Set
+
+from loguru import logger
+
+from src.shared.services.discord_service import DiscordService
+
+
+class RoleEdit(NamedTuple):
+    member: "discord.Member"
+    desired_role_id: Optional[int]
+    add: Set[int]
+    remove: Set[int]
+
+
+class HolderRoleReconciler:
+    """
+    Brings members' tier roles in line with their holdings.
+
+    The desired tier role of each member is derived from their total NFTs
+    and compared with the roles the member actually has in the guild cache,
+    not with what was last recorded. Only members that differ are edited,
+    each with a single roles update that adds the desired tier and removes
+    any other tier, so reruns make no calls and members whose holdings
+    dropped to zero are demoted.
+    """
+
+    def __init__(self, discord_service: DiscordService, concurrency: int = 10):
+        self.discord_service = discord_service
+        self.concurrency = concurrency
+
+    @staticmethod
+    def plan_member(
+        member: "discord.Member",
+        desired_role_id: Optional[int],
+        managed_role_ids: Set[int],
+    ) -> Optional[RoleEdit]:
+        """
+        Returns the edit a member needs to hold exactly the desired tier
+        role among the managed ones, or None when they already do.
+        """
+        current = {role.id for role in member.roles} & managed_role_ids
+        desired = {desired_role_id} if desired_role_id is not None else set()
+        if current == desired:
+            return None
+        return RoleEdit(member, desired_role_id, desired - current, current - desired)
+
+    def plan(
+        self,
+        guild: "discord.Guild",
+        index: "RoleThresholdIndex",
+        totals: Dict[int, int],
+    ) -> List[RoleEdit]:
+        """
+        Plans the edits of every cached member of the guild, given the total
+        NFTs of the verified users (absent users hold none).
+        """
+        managed_role_ids = set(index.role_ids)
+        # Tiers whose role was deleted cannot be granted.
+        grantable = {role_id for role_id in managed_role_ids if guild.get_role(role_id)}
+
+        edits = []
+        for member in guild.members:
+            if getattr(member, "bot", False):
+                continue
+            desired_role_id = index.role_for(totals.get(member.id, 0))
+            if desired_role_id not in grantable:
+                desired_role_id = None
+            edit = self.plan_member(member, desired_role_id, managed_role_ids)
+            if edit is not None:
+                edits.append(edit)
+        return edits
+
+    async def apply(self, edits: List[RoleEdit]) -> int:
+        """
+        Applies the edits, a bounded number at a time. Returns how many succeeded.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def apply_edit(edit: RoleEdit) -> bool:
+            async with semaphore:
+                logger.info(
+                    f"Updating tier roles of user {edit.member.id}: "
+                    f"+{sorted(edit.add)} -{sorted(edit.remove)}"
+                )
+                return await self.discord_service.edit_member_roles(
+                    edit.member, edit.add, edit.remove
+                )
+
+        results = await asyncio.gather(*(apply_edit(edit) for edit in edits))
+        return sum(results)
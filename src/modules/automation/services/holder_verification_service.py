@@ -1,78 +1,298 @@
 import asyncio
+from typing import (AsyncIterator, Awaitable, Callable, Dict, Iterable, List,
+                    Optional, Set, Tuple)
 
 import discord
 from loguru import logger
 
+from src.shared.services.request_scheduler import RequestPriority
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+class VerificationUnavailableError(Exception):
+    """
+    Raised when a wallet check cannot be carried out right now: the queue is
+    full, the check timed out or the lookup failed.
+    """
+
 
 class HolderVerificationService:
     """
     Service responsible for verifying the wallet details by querying the Reservoir API.
+
+    Interactive wallet checks are run by a pool of workers from a bounded
+    queue. Concurrent checks of the same wallet and collection share a single
+    lookup, and a full queue rejects new checks instead of growing.
     """
 
-    def __init__(self, reservoir_api: "ReservoirService"):
+    # Seconds between queue position updates while a check waits.
+    POSITION_UPDATE_INTERVAL = 5
+
+    def __init__(
+        self,
+        reservoir_api: "ReservoirService",
+        workers: int = 4,
+        max_queue_size: int = 500,
+        timeout: float = 120,
+    ):
         self.reservoir_api = reservoir_api
-        self.queue = asyncio.Queue()
-        self.worker_task = None
+        self.workers = workers
+        self.timeout = timeout
+        self.queue = asyncio.Queue(maxsize=max_queue_size)
+        self.worker_tasks: List[asyncio.Task] = []
+
+        self._in_flight: Dict[Tuple[str, str], asyncio.Future] = {}
+        # Sequence number of each queued check, to tell its queue position.
+        self._sequence: Dict[Tuple[str, str], int] = {}
+        self._enqueued = 0
+        self._dequeued = 0
 
-    async def start_worker(self):
+        self.coalesced = 0
+        self.rejected = 0
+
+    async def start_workers(self):
         """
-        Start the worker to process verification tasks from the queue.
+        Start the workers to process verification tasks from the queue.
         """
-        if self.worker_task is None:
-            self.worker_task = asyncio.create_task(self._worker())
+        if not self.worker_tasks:
+            self.worker_tasks = [
+                asyncio.create_task(self._worker()) for _ in range(self.workers)
+            ]
 
     async def _worker(self):
         """
         Worker that consumes tasks from the queue and processes them.
         """
         while True:
-            wallet_address, verification_event = await self.queue.get()
+            key, guild_id, future = await self.queue.get()
+            self._dequeued += 1
+            self._sequence.pop(key, None)
+            wallet_address, collection_address = key
             logger.info(f"Processing wallet {wallet_address}")
 
-            nft_count = await self.verify_wallet(wallet_address)
-            verification_event.result = nft_count
+            try:
+                nft_count = await asyncio.wait_for(
+                    self.verify_wallet(wallet_address, collection_address, guild_id),
+                    timeout=self.timeout,
+                )
+                if nft_count is None:
+                    # The NFT count is unknown, which must not read as zero.
+                    future.set_exception(
+                        VerificationUnavailableError(
+                            f"Lookup of {wallet_address} failed"
+                        )
+                    )
+                else:
+                    future.set_result(nft_count)
+            except asyncio.TimeoutError:
+                future.set_exception(
+                    VerificationUnavailableError(
+                        f"Lookup of {wallet_address} timed out"
+                    )
+                )
+            finally:
+                self._in_flight.pop(key, None)
+                self.queue.task_done()
 
-            verification_event.set()
-            self.queue.task_done()
+    def submit(
+        self,
+        wallet_address: str,
+        collection_address: str,
+        guild_id: Optional[int] = None,
+    ) -> asyncio.Future:
+        """
+        Queues a check, or joins the one already queued or running for the
+        same wallet and collection. Returns a future of the NFT count.
+        Raises VerificationUnavailableError when the queue is full.
+        """
+        key = (wallet_address.lower(), collection_address.lower())
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return future
 
-    async def add_task_to_queue(
-        self, wallet_address: str, verification_event: asyncio.Event
-    ):
+        future = asyncio.get_running_loop().create_future()
+        # Every waiter may have given up by the time a lookup fails.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        try:
+            self.queue.put_nowait((key, guild_id, future))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise VerificationUnavailableError("The verification queue is full")
+
+        self._in_flight[key] = future
+        self._sequence[key] = self._enqueued
+        self._enqueued += 1
+        return future
+
+    def queue_position(self, wallet_address: str, collection_address: str) -> int:
         """
-        Adds a check task to the queue.
+        Returns the 1-based queue position of a check, or 0 when it is not
+        waiting in the queue (running or unknown).
         """
-        await self.queue.put((wallet_address, verification_event))
+        sequence = self._sequence.get(
+            (wallet_address.lower(), collection_address.lower())
+        )
+        if sequence is None:
+            return 0
+        return sequence - self._dequeued + 1
 
-    async def verify_wallet(self, wallet_address: str) -> bool:
+    async def verify(
+        self,
+        wallet_address: str,
+        collection_address: str,
+        guild_id: Optional[int] = None,
+        on_position: Optional[Callable[[int], Awaitable]] = None,
+    ) -> int:
         """
-        Verifies if the wallet holds the required tokens by making an API call.
+        Checks a wallet through the queue and returns its NFT count. While the
+        check waits, on_position is awaited whenever its queue position changes.
+        Raises VerificationUnavailableError when the check cannot be carried
+        out within the timeout.
+        """
+        future = self.submit(wallet_address, collection_address, guild_id)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        reported = None
+        while not future.done():
+            position = self.queue_position(wallet_address, collection_address)
+            if on_position is not None and position and position != reported:
+                reported = position
+                try:
+                    await on_position(position)
+                except Exception as e:
+                    logger.error(f"Error reporting queue position: {e}")
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise VerificationUnavailableError(
+                    f"Verification of {wallet_address} timed out"
+                )
+            await asyncio.wait(
+                {future}, timeout=min(remaining, self.POSITION_UPDATE_INTERVAL)
+            )
+        return future.result()
+
+    async def verify_wallet(
+        self,
+        wallet_address: str,
+        collection_address: str,
+        guild_id: Optional[int] = None,
+    ) -> Optional[int]:
+        """
+        Returns how many NFTs of the collection the wallet holds, or None when
+        the API call failed. The call is scheduled ahead of background syncs,
+        since a user is waiting.
         """
         try:
             return await self.reservoir_api.get_nft_ownership(
-                wallet_address, "0x739e9b04d8dcd08394c0ef0372333957661712f9"
+                wallet_address,
+                collection_address,
+                priority=RequestPriority.INTERACTIVE,
+                guild_id=guild_id,
             )
         except Exception as e:
             logger.error(f"Error verifying wallet {wallet_address}: {e}")
-            return False
+            return None
+
+    def get_stats(self) -> dict:
+        return {
+            "workers": len(self.worker_tasks),
+            "queued": self.queue.qsize(),
+            "in_flight": len(self._in_flight),
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+        }
+
+    async def iter_holders_for_verification(
+        self, collection_address, guild_id: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, int]]:
+        """
+        Streams wallet addresses and their NFT counts from the Reservoir API
+        in batches, as each page arrives. Errors are logged and raised, since
+        the holders streamed so far are not the whole list.
+        """
+        try:
+            async for holders_batch in self.reservoir_api.iter_holders(
+                collection_address, priority=RequestPriority.BULK, guild_id=guild_id
+            ):
+                yield holders_batch
+        except Exception as e:
+            logger.error(f"Error streaming holders: {e}")
+            raise
 
-    async def get_all_holders_for_verification(self, collection_address):
+    async def get_changed_wallets(
+        self,
+        collection_address: str,
+        since_timestamp: int,
+        guild_id: Optional[int] = None,
+    ) -> Optional[Tuple[Set[str], int]]:
         """
-        Fetches all wallet addresses and their associated NFT counts from the Reservoir API.
+        Returns the wallets involved in transfers of the collection since the
+        given timestamp, along with the timestamp of the newest transfer.
+        Returns None when the changes could not be fetched completely.
         """
         try:
-            # Fetch all holders from the Reservoir API
-            holders_data = await self.reservoir_api.get_all_holders(collection_address)
+            transfers = await self.reservoir_api.get_transfers_since(
+                collection_address,
+                since_timestamp,
+                priority=RequestPriority.BULK,
+                guild_id=guild_id,
+            )
+            if transfers is None:
+                return None
 
-            # Example: holders_data would be in the format {'wallet_address': nft_count}
-            if not holders_data:
-                logger.warning("No holders found.")
-                return {}
+            wallets = set()
+            latest_timestamp = since_timestamp
+            for transfer in transfers:
+                for side in ("from", "to"):
+                    wallet = (transfer.get(side) or "").lower()
+                    if wallet and wallet != ZERO_ADDRESS:
+                        wallets.add(wallet)
+                latest_timestamp = max(latest_timestamp, transfer.get("timestamp", 0))
 
-            logger.info(f"Fetched {len(holders_data)} holders.")
-            return holders_data
+            logger.info(
+                f"{len(transfers)} transfers touched {len(wallets)} wallets "
+                f"in {collection_address} since {since_timestamp}."
+            )
+            return wallets, latest_timestamp
         except Exception as e:
-            logger.error(f"Error fetching all holders: {e}")
-            return {}
+            logger.error(f"Error fetching changed wallets: {e}")
+            return None
+
+    async def get_wallet_counts(
+        self,
+        wallet_addresses: Iterable[str],
+        collection_address: str,
+        guild_id: Optional[int] = None,
+    ) -> Optional[Dict[str, int]]:
+        """
+        Fetches the current NFT count of each wallet, bypassing the response cache.
+        Returns None when any lookup failed, since a missing count must not be
+        taken for zero.
+        """
+        semaphore = asyncio.Semaphore(10)
+
+        async def fetch(wallet_address: str):
+            async with semaphore:
+                count = await self.reservoir_api.get_nft_ownership(
+                    wallet_address,
+                    collection_address,
+                    use_cache=False,
+                    priority=RequestPriority.BULK,
+                    guild_id=guild_id,
+                )
+                return wallet_address, count
+
+        results = await asyncio.gather(
+            *[fetch(wallet_address) for wallet_address in wallet_addresses]
+        )
+        failed = [wallet_address for wallet_address, count in results if count is None]
+        if failed:
+            logger.error(f"NFT counts of {len(failed)} wallets could not be fetched.")
+            return None
+        return dict(results)
 
     @staticmethod
     async def create_verification_embed(interaction: discord.Interaction):
@@ -106,7 +326,10 @@ class HolderVerificationService:
 
         embed.add_field(name="Collection", value=collection_address, inline=False)
 
-        for min_nft, max_nft, role_id in roles_data:
+        # Embeds hold 25 fields; the collection takes one and the last may
+        # summarize the tiers left out.
+        shown = roles_data if len(roles_data) <= 24 else roles_data[:23]
+        for min_nft, max_nft, role_id in shown:
             role = f"role.id: {role_id}>"
             if max_nft:
                 nft_range = f"`{min_nft}-{max_nft}`"
@@ -115,4 +338,11 @@ class HolderVerificationService:
 
             embed.add_field(name=f"🔹 {role}", value=f"NFTs: {nft_range}", inline=False)
 
+        if len(shown) < len(roles_data):
+            embed.add_field(
+                name="…",
+                value=f"and {len(roles_data) - len(shown)} more tiers",
+                inline=False,
+            )
+
         return embed
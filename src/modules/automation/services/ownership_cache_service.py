@@ -0,0 +1,100 @@
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+from ..repositories.holder_verification_repository import \
+    HolderVerificationRepository
+
+OwnershipKey = Tuple[str, str]
+
+
+class OwnershipCacheService:
+    """
+    Recent NFT counts of wallets, keyed by (wallet, collection).
+
+    The most recent counts are kept in a bounded in-memory LRU; behind it,
+    the counts recorded in holder_verification serve as a second tier. Each
+    count carries the time it was checked, and get() only returns counts
+    younger than the guild's max_age, so a verification is answered without
+    an API call when the wallet was checked recently, by an interactive
+    lookup or by the holder sync.
+    """
+
+    def __init__(self, cache_size: int = 10000):
+        self.cache_size = cache_size
+
+        self._counts: "OrderedDict[OwnershipKey, Tuple[int, float]]" = OrderedDict()
+
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.misses = 0
+
+    async def get(
+        self,
+        wallet_address: str,
+        collection_address: str,
+        guild_id: int,
+        max_age: float,
+    ) -> Optional[Tuple[int, datetime]]:
+        """
+        Returns the NFT count of a wallet and when it was checked, if that was
+        within max_age seconds, or None.
+        """
+        key = (wallet_address.lower(), collection_address.lower())
+        entry = self._counts.get(key)
+        if entry is not None and time.time() - entry[1] <= max_age:
+            self._counts.move_to_end(key)
+            self.memory_hits += 1
+            return entry[0], datetime.fromtimestamp(entry[1], timezone.utc)
+
+        recorded = await HolderVerificationRepository.get_recent_count(
+            wallet_address,
+            collection_address,
+            guild_id,
+            since=datetime.now(timezone.utc) - timedelta(seconds=max_age),
+        )
+        if recorded is None:
+            self.misses += 1
+            return None
+
+        nft_count, checked_at = recorded
+        self._store(key, nft_count, checked_at.timestamp())
+        self.store_hits += 1
+        return recorded
+
+    def put(self, wallet_address: str, collection_address: str, nft_count: int):
+        """
+        Records a count that was just checked.
+        """
+        key = (wallet_address.lower(), collection_address.lower())
+        self._store(key, nft_count, time.time())
+
+    def refresh(self, holders_counts: Dict[str, int], collection_address: str):
+        """
+        Updates the cached wallets found in a batch of the holder sync. Other
+        wallets are not added, so a sync does not evict the recent lookups.
+        """
+        checked_at = time.time()
+        collection_address = collection_address.lower()
+        for wallet_address, nft_count in holders_counts.items():
+            key = (wallet_address.lower(), collection_address)
+            if key in self._counts:
+                self._counts[key] = (nft_count, checked_at)
+
+    def _store(self, key: OwnershipKey, nft_count: int, checked_at: float):
+        entry = self._counts.get(key)
+        if entry is not None and entry[1] > checked_at:
+            return
+        self._counts[key] = (nft_count, checked_at)
+        self._counts.move_to_end(key)
+        while len(self._counts) > self.cache_size:
+            self._counts.popitem(last=False)
+
+    def get_stats(self) -> dict:
+        return {
+            "cached": len(self._counts),
+            "memory_hits": self.memory_hits,
+            "store_hits": self.store_hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,115 @@
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional, Set
+
+from loguru import logger
+
+from ..repositories.sale_dispatch_repository import (DispatchKey,
+                                                     SaleDispatchRepository)
+
+
+class SaleClaimError(Exception):
+    """
+    Raised when the sales to send could not be claimed.
+    """
+
+
+class SaleDedupeService:
+    """
+    Makes sure each sale is sent to each channel only once.
+
+    Sales are keyed by (tx_hash, log_index, channel_id). claim() is called
+    right before sending: it returns the keys that were never dispatched and
+    records them at once, so an overlapping poll, a streamed duplicate or a
+    restart will skip them. If sending fails, release() hands the key back.
+
+    The most recent keys are kept in a bounded LRU, so the table is only
+    queried for sales not seen lately. Records older than ttl_days are
+    compacted away every compaction_interval seconds; by then the sale
+    cursors are long past them.
+    """
+
+    def __init__(
+        self,
+        cache_size: int = 50000,
+        ttl_days: float = 7,
+        compaction_interval: float = 3600,
+    ):
+        self.cache_size = cache_size
+        self.ttl = timedelta(days=ttl_days)
+        self.compaction_interval = compaction_interval
+
+        self._recent: "OrderedDict[DispatchKey, None]" = OrderedDict()
+        self._last_compaction: Optional[float] = None
+
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.claimed = 0
+        self.released = 0
+
+    async def claim(self, keys: Iterable[DispatchKey]) -> Set[DispatchKey]:
+        """
+        Records the keys that were never dispatched and returns them. Keys
+        already dispatched, or claimed at the same time by another poll, are
+        left out. Raises SaleClaimError when the keys could not be recorded.
+        """
+        await self._compact_if_due()
+
+        unseen = set()
+        for key in set(keys):
+            if key in self._recent:
+                self._recent.move_to_end(key)
+                self.memory_hits += 1
+            else:
+                unseen.add(key)
+
+        claimed = await SaleDispatchRepository.insert_dispatched(unseen)
+        if claimed is None:
+            raise SaleClaimError("Dispatched sales could not be recorded.")
+        dispatched = unseen - claimed
+        self.store_hits += len(dispatched)
+        self.claimed += len(claimed)
+        for key in unseen:
+            self._remember(key)
+        return claimed
+
+    async def release(self, keys: Iterable[DispatchKey]):
+        """
+        Gives back claimed keys whose message could not be sent.
+        """
+        keys = set(keys)
+        for key in keys:
+            self._recent.pop(key, None)
+        await SaleDispatchRepository.delete_dispatched(keys)
+        self.released += len(keys)
+
+    def _remember(self, key: DispatchKey):
+        self._recent[key] = None
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.cache_size:
+            self._recent.popitem(last=False)
+
+    async def _compact_if_due(self):
+        now = time.monotonic()
+        if (
+            self._last_compaction is not None
+            and now - self._last_compaction < self.compaction_interval
+        ):
+            return
+        self._last_compaction = now
+
+        removed = await SaleDispatchRepository.delete_older_than(
+            datetime.now(timezone.utc) - self.ttl
+        )
+        if removed:
+            logger.info(f"Compacted {removed} dispatched sale records.")
+
+    def get_stats(self) -> dict:
+        return {
+            "cached_keys": len(self._recent),
+            "memory_hits": self.memory_hits,
+            "store_hits": self.store_hits,
+            "claimed": self.claimed,
+            "released": self.released,
+        }
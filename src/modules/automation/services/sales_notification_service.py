@@ -3,6 +3,10 @@ from loguru import logger
 
 
 class SalesNotificationService:
+    # Rows listed in a sweep summary; the rest are counted. Keeps the embed well
+    # under Discord's description limit.
+    SUMMARY_MAX_ROWS = 40
+
     @staticmethod
     async def format_sale_embed(sale) -> discord.Embed:
         """
@@ -23,30 +27,45 @@ class SalesNotificationService:
             ):
                 logger.info(f"Processing the description for sale: {sale.contract}")
 
-                floor_price = sale.collection_data.get("floor_price")
-                volume_1day = sale.collection_data.get("volume_1day")
-                volume_change = sale.collection_data.get("volume_change")
-
-                floor_price = 0 if floor_price is None else floor_price
-                volume_1day = 0 if volume_1day is None else volume_1day
-                volume_change = 0 if volume_change is None else volume_change
-
-                difference_price = sale.price_native - floor_price
-                difference_price_pct = (
-                    (difference_price / floor_price * 100) if floor_price else 0
-                )
+                collection_data = sale.collection_data or {}
+                floor_price = collection_data.get("floor_price")
+                volume_1day = collection_data.get("volume_1day")
+                volume_change = collection_data.get("volume_change")
 
                 seller_short = f"{sale.seller[:4]}...{sale.seller[-4:]}"
                 buyer_short = f"{sale.buyer[:4]}...{sale.buyer[-4:]}"
 
-                embed.description = (
+                description = (
                     f"🔗 **Token ID:** [{sale.token_id}](https://opensea.io/assets/ethereum/{sale.contract}/{sale.token_id})\n\n"
                     f"💰 **Sale Price:** {sale.price_native} ETH (${sale.price_usd:.2f})\n"
-                    f"🏷️ **Floor Price:** {floor_price} ETH \n"
-                    f"📉 **{'Below Floor' if difference_price < 0 else 'Above Floor'}:** "
-                    f"{abs(difference_price):.4f} ETH ({difference_price_pct:.2f}% {'⬆️' if difference_price > 0 else '⬇️'})\n\n"
-                    f"📈 **24h Volume:** {volume_1day:.2f} ETH ({volume_change:.2f}% {'⬆️' if volume_change > 0 else '⬇️'})\n\n"
-                    f"👤 **Seller:** [{seller_short}](https://opensea.io/{sale.seller})  👤 **Buyer:** [{buyer_short}](https://opensea.io/{sale.buyer})"
+                )
+
+                # Collection stats come from the stats cache; they are left out
+                # when missing and dated when stale.
+                as_of = ""
+                if collection_data.get("stale") and collection_data.get("updated_at"):
+                    as_of = f" (as of {collection_data['updated_at']:%H:%M} UTC)"
+
+                if floor_price is not None:
+                    difference_price = sale.price_native - floor_price
+                    difference_price_pct = (
+                        (difference_price / floor_price * 100) if floor_price else 0
+                    )
+                    description += (
+                        f"🏷️ **Floor Price:** {floor_price} ETH{as_of} \n"
+                        f"📉 **{'Below Floor' if difference_price < 0 else 'Above Floor'}:** "
+                        f"{abs(difference_price):.4f} ETH ({difference_price_pct:.2f}% {'⬆️' if difference_price > 0 else '⬇️'})\n\n"
+                    )
+                else:
+                    description += "\n"
+
+                if volume_1day is not None:
+                    volume_change = 0 if volume_change is None else volume_change
+                    description += f"📈 **24h Volume:** {volume_1day:.2f} ETH ({volume_change:.2f}% {'⬆️' if volume_change > 0 else '⬇️'})\n\n"
+
+                embed.description = (
+                    description
+                    + f"👤 **Seller:** [{seller_short}](https://opensea.io/{sale.seller})  👤 **Buyer:** [{buyer_short}](https://opensea.io/{sale.buyer})"
                 )
                 logger.info(f"Definied description {embed.description}")
 
@@ -62,3 +81,42 @@ class SalesNotificationService:
         except Exception as e:
             logger.error(f"Error formatting sale embed: {e}")
             raise
+
+    @staticmethod
+    async def format_sweep_summary_embed(sales) -> discord.Embed:
+        """
+        Format several sales as a single table-style Discord Embed.
+        """
+        try:
+            total_native = sum(sale.price_native or 0 for sale in sales)
+            total_usd = sum(sale.price_usd or 0 for sale in sales)
+            embed = discord.Embed(
+                title=f"🧹 {len(sales)} sales",
+                color=discord.Color.default(),
+            )
+
+            rows = []
+            for sale in sales[: SalesNotificationService.SUMMARY_MAX_ROWS]:
+                price = f"{sale.price_native:.4f}" if sale.price_native else "?"
+                buyer_short = f"{sale.buyer[:4]}...{sale.buyer[-4:]}"
+                rows.append(f"#{sale.token_id:<8} {price:>10} ETH  {buyer_short}")
+            hidden = len(sales) - len(rows)
+            if hidden:
+                rows.append(f"... and {hidden} more")
+
+            embed.description = (
+                f"💰 **Total:** {total_native:.4f} ETH (${total_usd:.2f})\n"
+                "```\n" + "\n".join(rows) + "\n```"
+            )
+
+            timestamps = [sale.timestamp for sale in sales if sale.timestamp]
+            if timestamps:
+                embed.set_footer(
+                    text=f"{min(timestamps).strftime('%d-%b-%Y %H:%M:%S')} - "
+                    f"{max(timestamps).strftime('%H:%M:%S UTC')}"
+                )
+
+            return embed
+        except Exception as e:
+            logger.error(f"Error formatting sweep summary embed: {e}")
+            raise
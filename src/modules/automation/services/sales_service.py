@@ -1,9 +1,14 @@
-from datetime import datetime, timezone
-from typing import List
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
 
 from loguru import logger
 
+from src.shared.models.reservoir_models import ReservoirSale, ReservoirToken
+from src.shared.services.collection_stats_cache import CollectionStatsCache
+
 from ..models.sales_entity import Sale
+from ..repositories.sales_cursor_repository import SalesCursorRepository
 
 
 class SalesService:
@@ -11,85 +16,303 @@ class SalesService:
     Service responsible for fetching and processing sales data.
     """
 
-    def __init__(self, reservoir_service):
+    def __init__(
+        self,
+        reservoir_service,
+        page_size: int = 100,
+        max_pages: int = 20,
+        shard_size: Optional[int] = None,
+        collection_stats: Optional[CollectionStatsCache] = None,
+    ):
         self.reservoir_service = reservoir_service
-        self.last_timestamp = None
+        self.collection_stats = collection_stats or CollectionStatsCache(
+            reservoir_service
+        )
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.shard_size = shard_size or reservoir_service.SALES_CONTRACTS_PER_REQUEST
+        self.pending_cursors: Dict[str, Tuple[int, Optional[str]]] = {}
+        self.last_enrichment_timings = {}
 
-    async def get_new_sales(self, collection_contracts: List[str]) -> List[dict]:
+    async def get_new_sales(
+        self, collection_contracts: List[str]
+    ) -> List[ReservoirSale]:
         """
-        Fetches and filters new sales for a list of collection contracts.
+        Fetches the sales made since each contract's stored cursor, newest first.
+        Contracts are polled in shards of at most shard_size contracts, all
+        shards concurrently, so a busy collection only pages through its own
+        shard and a failed shard does not hold back the others.
+        Contracts polled for the first time are seeded with their newest sale
+        instead of announcing their history. The advanced cursors are kept in
+        pending_cursors until commit_cursors() is called, once the sales have
+        been announced.
         """
-        logger.info(f"Fetching sales for contracts: {collection_contracts}")
-
-        sales_data = await self.reservoir_service.get_latest_sales(collection_contracts)
-        logger.info(f"Fetched {len(sales_data)} sales records")
+        contracts = list(dict.fromkeys(c.lower() for c in collection_contracts))
+        shards = [
+            contracts[i : i + self.shard_size]
+            for i in range(0, len(contracts), self.shard_size)
+        ]
+        logger.info(
+            f"Fetching sales for {len(contracts)} contracts in {len(shards)} shards"
+        )
 
-        new_sales = []
+        cursors = await SalesCursorRepository.get_cursors(contracts)
+        if cursors is None:
+            # Without the cursors every contract would look new and be seeded
+            # past its unannounced sales, so this poll is skipped instead.
+            logger.error("Sales cursors unavailable, skipping this poll.")
+            self.pending_cursors = {}
+            return []
 
-        for sale in sales_data:
-            sale_time = datetime.fromtimestamp(sale["timestamp"], timezone.utc)
+        results = await asyncio.gather(
+            *[self._get_shard_sales(shard, cursors) for shard in shards]
+        )
 
-            if self.last_timestamp is None:
-                self.last_timestamp = sale_time
-                continue
+        new_sales = []
+        newest: Dict[str, Tuple[int, Optional[str]]] = {}
+        for result in results:
+            if result is not None:
+                shard_sales, shard_newest = result
+                new_sales.extend(shard_sales)
+                newest.update(shard_newest)
+        new_sales.sort(key=lambda sale: sale.timestamp, reverse=True)
 
-            if sale_time > self.last_timestamp:
-                new_sales.append(sale)
+        self.pending_cursors = self._changed_cursors(newest, cursors)
+        seeded = [c for c in newest if c not in cursors]
+        if seeded:
+            logger.info(f"Seeded sales cursors for {len(seeded)} new contracts")
 
         if new_sales:
-            self.last_timestamp = datetime.fromtimestamp(
-                new_sales[0]["timestamp"], timezone.utc
-            )
             logger.info(f"Found {len(new_sales)} new sales")
         else:
             logger.info("No new sales found")
 
         return new_sales
 
-    async def get_sales_with_metadata(self, sales: List[dict]) -> List[Sale]:
+    async def filter_new_sales(self, sales: List[ReservoirSale]) -> List[ReservoirSale]:
+        """
+        Keeps the pushed sales that are newer than their contract's cursor,
+        newest first, and advances pending_cursors past them like
+        get_new_sales() does.
+        """
+        cursors = await SalesCursorRepository.get_cursors(
+            {sale.token.contract.lower() for sale in sales}
+        )
+        if cursors is None:
+            logger.error("Sales cursors unavailable, streamed sales left to the poll.")
+            self.pending_cursors = {}
+            return []
+
+        new_sales = []
+        newest: Dict[str, Tuple[int, Optional[str]]] = {}
+        for sale in sales:
+            contract = sale.token.contract.lower()
+            cursor = cursors.get(contract)
+            if cursor is not None and self._is_announced(sale, cursor):
+                continue
+            new_sales.append(sale)
+            if contract not in newest or sale.timestamp >= newest[contract][0]:
+                newest[contract] = (sale.timestamp, sale.id)
+
+        new_sales.sort(key=lambda sale: sale.timestamp, reverse=True)
+        self.pending_cursors = self._changed_cursors(newest, cursors)
+        return new_sales
+
+    async def _get_shard_sales(
+        self, contracts: List[str], cursors: Dict[str, "SalesCursorModel"]
+    ) -> Optional[Tuple[List[ReservoirSale], Dict[str, Tuple[int, Optional[str]]]]]:
+        """
+        Pages through the sales of one shard until every contract's cursor is
+        reached, so a burst bigger than one page is not lost.
+        Returns the new sales and the advanced cursors, or None when a request
+        failed, in which case the shard's cursors are left unchanged.
+        """
+        pending = set(contracts)
+        newest: Dict[str, Tuple[int, Optional[str]]] = {}
+        new_sales = []
+        continuation = None
+
+        for page_number in range(self.max_pages):
+            sales, continuation = await self.reservoir_service.get_sales_page(
+                contracts, continuation, limit=self.page_size
+            )
+            if sales is None:
+                logger.error(
+                    f"Error fetching sales for {len(contracts)} contracts, "
+                    "cursors left unchanged."
+                )
+                return None
+
+            for sale in sales:
+                contract = sale.token.contract.lower()
+                if contract not in pending:
+                    continue
+                newest.setdefault(contract, (sale.timestamp, sale.id))
+
+                cursor = cursors.get(contract)
+                if cursor is None:
+                    pending.discard(contract)
+                elif self._is_announced(sale, cursor):
+                    pending.discard(contract)
+                else:
+                    new_sales.append(sale)
+
+            if page_number == 0:
+                # Contracts without sales on the first page have nothing new
+                # to announce; seed the unseen ones at the poll's newest time.
+                seed_timestamp = sales[0].timestamp if sales else int(time.time())
+                for contract in [c for c in pending if c not in cursors]:
+                    newest[contract] = (seed_timestamp, None)
+                    pending.discard(contract)
+
+            if sales:
+                # Pages go back in time, so cursors older than this page are reached.
+                oldest = sales[-1].timestamp
+                pending = {c for c in pending if cursors[c].last_timestamp <= oldest}
+
+            if not pending or not continuation or not sales:
+                break
+        else:
+            logger.warning(
+                f"Sales backlog exceeds {self.max_pages} pages, older sales are skipped."
+            )
+
+        return new_sales, newest
+
+    @staticmethod
+    def _changed_cursors(
+        newest: Dict[str, Tuple[int, Optional[str]]],
+        cursors: Dict[str, "SalesCursorModel"],
+    ) -> Dict[str, Tuple[int, Optional[str]]]:
+        """
+        Keeps the advanced cursors that differ from the stored ones, so a
+        quiet poll writes nothing.
+        """
+        return {
+            contract: cursor
+            for contract, cursor in newest.items()
+            if contract not in cursors
+            or (cursors[contract].last_timestamp, cursors[contract].last_sale_id)
+            != cursor
+        }
+
+    @staticmethod
+    def _is_announced(sale: ReservoirSale, cursor: "SalesCursorModel") -> bool:
+        """
+        Whether a sale is at or before the cursor. Seeded cursors have no sale
+        id and cover every sale up to and including their timestamp.
+        """
+        if cursor.last_sale_id is None:
+            return sale.timestamp <= cursor.last_timestamp
+        return sale.id == cursor.last_sale_id or sale.timestamp < cursor.last_timestamp
+
+    async def commit_cursors(self):
+        """
+        Persists the cursors advanced by the last get_new_sales() call.
+        """
+        if self.pending_cursors:
+            await SalesCursorRepository.save_cursors(self.pending_cursors)
+            self.pending_cursors = {}
+
+    def discard_cursors(self):
+        """
+        Drops the cursors of the last get_new_sales() call, so the same sales
+        are fetched again on the next poll.
+        """
+        self.pending_cursors = {}
+
+    async def get_sales_with_metadata(self, sales: List[ReservoirSale]) -> List[Sale]:
         """
         Adds metadata to sales and converts them to Sale objects.
+        Token metadata is fetched in batches and collection stats are read from
+        the stats cache, and a sale that fails to convert is skipped without
+        dropping the rest of the batch.
         """
         logger.info(f"Fetching metadata for {len(sales)} sales")
+        timings = {}
+        started = time.perf_counter()
+
+        collections_data = self._resolve_collections_data(sales)
+        tokens_metadata = await self._timed(
+            "tokens", self._resolve_tokens_metadata(sales), timings
+        )
+
+        build_started = time.perf_counter()
         sales_with_metadata = []
-        try:
-            for sale in sales:
-                sale_contract = sale["token"]["contract"]
-                token_metadata = await self.reservoir_service.get_token_details(
-                    sale_contract, sale["token"]["tokenId"]
+        for sale in sales:
+            try:
+                token = tokens_metadata.get(sale.token.key) or sale.token
+                sales_with_metadata.append(
+                    Sale.from_reservoir(
+                        sale,
+                        token,
+                        collections_data.get(sale.token.contract.lower()) or {},
+                    )
                 )
+            except Exception as e:
+                logger.error(f"Error adding metadata to sale {sale.id}: {e}")
 
-                collection_data_response = (
-                    await self.reservoir_service.get_collection_data(sale_contract)
-                )
-                collection_data = collection_data_response["collections"][0]
-
-                if token_metadata:
-                    sales_with_metadata.append(
-                        Sale(
-                            token_id=sale["token"]["tokenId"],
-                            contract=sale["token"]["contract"],
-                            price_native=sale["price"]["amount"]["native"],
-                            price_usd=sale["price"]["amount"]["usd"],
-                            timestamp=datetime.fromtimestamp(
-                                sale["timestamp"], timezone.utc
-                            ),
-                            seller=sale["from"],
-                            buyer=sale["to"],
-                            name=token_metadata.get("name"),
-                            image=token_metadata.get("image"),
-                            collection_data={
-                                "floor_price": collection_data["floorAsk"]["price"][
-                                    "amount"
-                                ]["native"],
-                                "volume_1day": collection_data["volume"]["1day"],
-                                "volume_change": collection_data["volumeChange"][
-                                    "1day"
-                                ],
-                            },
-                        )
-                    )
-            logger.info(f"Metadata added to {len(sales_with_metadata)} sales")
-            return sales_with_metadata
-        except Exception as e:
-            logger.error(f"Error adding metadata to sales: {e}")
+        timings["build"] = time.perf_counter() - build_started
+        timings["total"] = time.perf_counter() - started
+        self.last_enrichment_timings = timings
+
+        logger.info(
+            f"Metadata added to {len(sales_with_metadata)}/{len(sales)} sales | "
+            + " | ".join(
+                f"{stage}: {seconds * 1000:.0f}ms" for stage, seconds in timings.items()
+            )
+        )
+        return sales_with_metadata
+
+    @staticmethod
+    async def _timed(stage: str, coroutine, timings: Dict[str, float]):
+        started = time.perf_counter()
+        try:
+            return await coroutine
+        finally:
+            timings[stage] = time.perf_counter() - started
+
+    async def _resolve_tokens_metadata(
+        self, sales: List[ReservoirSale]
+    ) -> Dict[str, ReservoirToken]:
+        """
+        Returns token metadata keyed by "contract:tokenId". Tokens whose sale
+        already carries a name and image are taken as-is; the rest are looked
+        up in a single batched request.
+        """
+        metadata = {}
+        missing = []
+
+        for sale in sales:
+            if sale.token.name and sale.token.image:
+                metadata[sale.token.key] = sale.token
+            else:
+                missing.append(sale.token.key)
+
+        if missing:
+            metadata.update(await self.reservoir_service.get_tokens_details(missing))
+
+        return metadata
+
+    def _resolve_collections_data(
+        self, sales: List[ReservoirSale]
+    ) -> Dict[str, Optional[dict]]:
+        """
+        Reads the stats of each sale's collection from the stats cache, after
+        adding the sales to the cached volumes. Nothing is fetched here.
+        """
+        for sale in sales:
+            self.collection_stats.update_from_sale(sale)
+
+        contracts = {sale.token.contract.lower() for sale in sales}
+        stats = {
+            contract: self.collection_stats.get(contract) for contract in contracts
+        }
+        missing = sum(1 for data in stats.values() if data is None)
+        stale = sum(1 for data in stats.values() if data and data["stale"])
+        if missing or stale:
+            logger.warning(
+                f"Collection stats missing for {missing} and stale for {stale} "
+                f"of {len(contracts)} contracts."
+            )
+        return stats
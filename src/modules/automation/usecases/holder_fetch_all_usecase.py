@@ -1,9 +1,16 @@
-import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Set
 
 from loguru import logger
+from tortoise.transactions import in_transaction
 
+from src.modules.automation.repositories.holder_sync_cursor_repository import \
+    HolderSyncCursorRepository
 from src.modules.automation.repositories.holder_user_role_repository import \
     HolderUserRoleRepository
+from src.modules.automation.services.holder_role_reconciler import \
+    HolderRoleReconciler
 from src.shared.services.discord_service import DiscordService
 
 
@@ -18,15 +25,29 @@ class HolderFetchAllUseCase:
         holder_repository: "HolderVerificationRepository",
         config_repository: "HolderConfigRepository",
         bot: "discord.Client",
+        full_scan_interval: timedelta = timedelta(hours=6),
+        discord_service: Optional[DiscordService] = None,
+        ownership_cache: Optional["OwnershipCacheService"] = None,
+        role_reconciler: Optional[HolderRoleReconciler] = None,
     ):
         self.holder_service = holder_service
         self.holder_repository = holder_repository
         self.holder_config_repository = config_repository
         self.bot = bot
+        self.full_scan_interval = full_scan_interval
+        self.discord_service = discord_service or DiscordService(bot)
+        self.ownership_cache = ownership_cache
+        self.role_reconciler = role_reconciler or HolderRoleReconciler(
+            self.discord_service
+        )
 
     async def execute(self, guild_id: int) -> int:
         """
-        Fetches all holders, checks their NFT amounts, and updates their roles accordingly.
+        Syncs holders' roles with their NFTs.
+        Only wallets touched by transfers since the last sync are re-checked;
+        the full owner list is scanned on the first run, when the transfer
+        history cannot be followed, and periodically as a consistency check.
+        The tier roles of the guild's members are then reconciled once.
         """
         try:
             collection_address = (
@@ -36,102 +57,192 @@ class HolderFetchAllUseCase:
             )
 
             if collection_address:
-                holders_data = (
-                    await self.holder_service.get_all_holders_for_verification(
-                        collection_address
-                    )
+                cursor = await HolderSyncCursorRepository.get_cursor(
+                    guild_id, collection_address
                 )
-
-                wallet_addresses = list(holders_data.keys())
-                users = await self.holder_repository.get_all_users_by_wallet_addresses(
-                    wallet_addresses, guild_id
-                )
-                user_dict = {user.wallet_address: user for user in users}
-
-                semaphore = asyncio.Semaphore(100)
-                tasks = [
-                    self.update_user_role_semaphore(
-                        wallet_address,
-                        user.discord_user_id,
-                        user.guild_id,
-                        nft_count,
-                        semaphore,
+                if not self._is_full_scan_due(cursor):
+                    updated_count = await self._incremental_sync(
+                        guild_id, collection_address, cursor.last_event_timestamp
+                    )
+                    if updated_count is not None:
+                        await self._reconcile_roles(guild_id)
+                        return updated_count
+                    logger.warning(
+                        f"Incremental sync unavailable for guild {guild_id}, running a full scan."
                     )
-                    for wallet_address, nft_count in holders_data.items()
-                    if (user := user_dict.get(wallet_address))
-                ]
-
-                completed_tasks = 0
-                batch_size = 100
-
-                for i in range(0, len(tasks), batch_size):
-                    current_batch = tasks[i : i + batch_size]
-                    await asyncio.gather(*current_batch)
-                    completed_tasks += len(current_batch)
 
-                logger.success("Batch verification and role updates completed.")
-                return completed_tasks
+                updated_count = await self._full_sync(guild_id, collection_address)
+                await self._reconcile_roles(guild_id)
+                return updated_count
             else:
                 logger.error(f"No collection address found for guild {guild_id}")
                 return 0
         except Exception as e:
             logger.error(f"Error during batch wallet verification: {e}")
 
-    async def update_user_role_semaphore(
-        self,
-        wallet_address: str,
-        user_id: int,
-        guild_id: int,
-        nft_count: int,
-        semaphore: asyncio.Semaphore,
-    ):
-        async with semaphore:
-            await self.update_user_role_based_on_nfts(
-                wallet_address, user_id, guild_id, nft_count
-            )
+    def _is_full_scan_due(self, cursor) -> bool:
+        if cursor is None or cursor.last_event_timestamp is None:
+            return True
+        if cursor.last_full_scan_at is None:
+            return True
+        return (
+            datetime.now(timezone.utc) - cursor.last_full_scan_at
+            >= self.full_scan_interval
+        )
 
-    async def update_user_role_based_on_nfts(
-        self, wallet_address: str, user_id: int, guild_id: int, nft_count: int
-    ):
+    async def _full_sync(self, guild_id: int, collection_address: str) -> int:
         """
-        Updates the role for a given wallet based on NFT count.
+        Scans every holder of the collection, saving the counts batch by batch
+        while later pages are still downloading. Once the scan completes, the
+        verified wallets it did not find are set to zero NFTs.
         """
-        total_nft_count = await self.holder_repository.get_total_nfts_by_user(
-            user_id, guild_id
-        )
-        new_role_id = await self.holder_config_repository.get_role_by_nft_amount(
-            total_nft_count
-        )
+        scan_started = int(time.time())
+        seen_wallets: Set[str] = set()
+        completed_tasks = 0
 
-        if new_role_id is None:
-            logger.warning(
-                f"No role found for user {user_id} in guild {guild_id} with {total_nft_count} NFTs."
+        try:
+            async for batch in self.holder_service.iter_holders_for_verification(
+                collection_address, guild_id
+            ):
+                seen_wallets.update(batch.keys())
+                completed_tasks += await self._save_batch(
+                    batch, guild_id, collection_address
+                )
+        except Exception as e:
+            # The scan stays due, so the next run starts it over.
+            logger.error(f"Full holder scan of {collection_address} aborted: {e}")
+            return completed_tasks
+
+        zeroed_wallets = await self.holder_repository.zero_missing_counts(
+            guild_id, collection_address, seen_wallets
+        )
+        if zeroed_wallets is None:
+            return completed_tasks
+        if self.ownership_cache is not None:
+            self.ownership_cache.refresh(
+                dict.fromkeys(zeroed_wallets, 0), collection_address
             )
-            return
 
-        current_role_id = await HolderUserRoleRepository.get_current_user_role(
-            user_id, guild_id
+        await HolderSyncCursorRepository.save_cursor(
+            guild_id, collection_address, scan_started, full_scan=True
         )
+        logger.success("Batch verification completed.")
+        return completed_tasks + len(zeroed_wallets)
 
-        user = self.bot.get_user(user_id)
+    async def _incremental_sync(
+        self, guild_id: int, collection_address: str, since_timestamp: int
+    ) -> Optional[int]:
+        """
+        Re-checks only the verified wallets involved in transfers since the
+        cursor. Returns None when the transfers could not be followed.
+        """
+        changes = await self.holder_service.get_changed_wallets(
+            collection_address, since_timestamp, guild_id
+        )
+        if changes is None:
+            return None
 
-        if not user:
-            logger.warning(f"User with ID {user_id} not found in bot cache.")
-            return
+        changed_wallets, latest_timestamp = changes
+        updated_count = 0
 
-        if new_role_id != current_role_id:
-            logger.info(
-                f"Updating role for user {user_id} in guild {guild_id}: {current_role_id} -> {new_role_id}"
+        if changed_wallets:
+            users = await self.holder_repository.get_all_users_by_wallet_addresses(
+                list(changed_wallets), guild_id
             )
+            linked_wallets = {user.wallet_address for user in users or []}
+            if linked_wallets:
+                holders_counts = await self.holder_service.get_wallet_counts(
+                    linked_wallets, collection_address, guild_id
+                )
+                if holders_counts is None:
+                    # The cursor stays put, so the next run checks them again.
+                    logger.warning(
+                        f"Incremental sync for guild {guild_id} postponed, NFT counts unavailable."
+                    )
+                    return 0
+                updated_count = await self._save_batch(
+                    holders_counts, guild_id, collection_address
+                )
 
-            if current_role_id:
-                await DiscordService.remove_role_from_user(user, current_role_id)
+        await HolderSyncCursorRepository.save_cursor(
+            guild_id, collection_address, latest_timestamp
+        )
+        logger.success(
+            f"Incremental sync for guild {guild_id}: {len(changed_wallets)} changed wallets, "
+            f"{updated_count} verified holders updated."
+        )
+        return updated_count
 
-            await DiscordService.add_role_to_user(user, new_role_id)
-            await HolderUserRoleRepository.update_user_role(
-                user_id, guild_id, new_role_id
-            )
+    async def _save_batch(
+        self, holders_batch: dict, guild_id: int, collection_address: str
+    ) -> int:
+        """
+        Saves the NFT counts of the verified wallets found in one batch of
+        holders, in one upsert.
+        """
+        if self.ownership_cache is not None:
+            self.ownership_cache.refresh(holders_batch, collection_address)
+
+        links = await self.holder_repository.get_wallet_links(
+            list(holders_batch.keys()), guild_id
+        )
+        counts = [
+            (wallet_address, discord_user_id, holders_batch[wallet_address])
+            for wallet_address, discord_user_id in links
+            if wallet_address in holders_batch
+        ]
+        if not counts:
+            return 0
+
+        if not await self.holder_repository.bulk_upsert_counts(
+            guild_id, collection_address, counts
+        ):
+            logger.error(f"Error saving holders batch in guild {guild_id}")
+            return 0
+        return len(counts)
+
+    async def _reconcile_roles(self, guild_id: int) -> int:
+        """
+        Gives every member of the guild the tier role matching their total
+        NFTs, and removes the other tiers, with one edit per member that
+        differs. Returns how many members were edited.
+        """
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            logger.warning(f"Guild {guild_id} not found, tier roles not reconciled.")
+            return 0
+        index = await self.holder_config_repository.get_threshold_index(guild_id)
+        if index is None:
+            return 0
+
+        totals = await self.holder_repository.get_totals_by_guild(guild_id)
+        if totals is None:
+            # Planning without totals would demote every holder.
+            logger.warning(f"Tier roles of guild {guild_id} not reconciled.")
+            return 0
+        edits = self.role_reconciler.plan(guild, index, totals)
+        if not edits:
+            return 0
+
+        try:
+            async with in_transaction():
+                granted = {
+                    edit.member.id: edit.desired_role_id
+                    for edit in edits
+                    if edit.desired_role_id is not None
+                }
+                if not await HolderUserRoleRepository.save_roles(granted, guild_id):
+                    raise RuntimeError("roles could not be saved")
+                demoted = [
+                    edit.member.id for edit in edits if edit.desired_role_id is None
+                ]
+                if not await HolderUserRoleRepository.delete_roles(demoted, guild_id):
+                    raise RuntimeError("roles could not be deleted")
+        except Exception as e:
+            logger.error(f"Error recording tier roles in guild {guild_id}: {e}")
 
-        await self.holder_repository.upsert(
-            wallet_address, user_id, guild_id, nft_count
+        edited = await self.role_reconciler.apply(edits)
+        logger.success(
+            f"Tier roles reconciled in guild {guild_id}: {edited}/{len(edits)} members updated."
         )
+        return edited
@@ -1,9 +1,14 @@
-import asyncio
+from datetime import datetime
+from typing import Awaitable, Callable, Optional, Tuple
 
 from loguru import logger
 
 from src.modules.automation.repositories.holder_user_role_repository import \
     HolderUserRoleRepository
+from src.modules.automation.services.holder_role_reconciler import \
+    HolderRoleReconciler
+from src.modules.automation.services.holder_verification_service import \
+    VerificationUnavailableError
 from src.shared.services.discord_service import DiscordService
 
 
@@ -17,40 +22,109 @@ class HolderVerificationUseCase:
         holder_service: "HolderVerificationService",
         holder_config_repository: "HolderConfigRepository",
         holder_verification_repository: "HolderVerificationRepository",
+        discord_service: DiscordService,
+        ownership_cache: Optional["OwnershipCacheService"] = None,
     ):
         self.holder_service = holder_service
         self.holder_config_repository = holder_config_repository
         self.holder_verification_repository = holder_verification_repository
+        self.discord_service = discord_service
+        self.ownership_cache = ownership_cache
 
-    async def execute(self, wallet_address: str, user: "discord.Member"):
+    async def execute(
+        self,
+        wallet_address: str,
+        user: "discord.Member",
+        on_position: Optional[Callable[[int], Awaitable]] = None,
+    ):
         """
-        Executes the verification logic to check if the wallet address holds tokens.
+        Executes the verification logic to check if the wallet address holds
+        tokens of the guild's collection. on_position is awaited with the
+        check's place in the queue while it waits.
+        Raises VerificationUnavailableError when the check cannot be carried out.
         """
         try:
-            verification_event = asyncio.Event()
-
-            await self.holder_service.add_task_to_queue(
-                wallet_address, verification_event
+            config = await self.holder_config_repository.get_config_by_guild_id(
+                user.guild.id
             )
+            if not config:
+                logger.error(f"No collection address found for guild {user.guild.id}")
+                return False
 
-            await verification_event.wait()
-
-            nft_count = verification_event.result
-            await self.holder_verification_repository.upsert(
-                wallet_address, user.id, user.guild.id, nft_count
+            nft_count, cached_at = await self._get_nft_count(
+                wallet_address, config, user.guild.id, on_position
             )
+            if cached_at is None:
+                await self.holder_verification_repository.upsert(
+                    wallet_address,
+                    user.id,
+                    user.guild.id,
+                    nft_count,
+                    config.collection_address,
+                )
+            else:
+                # Not a new check, so the recorded count keeps its check time.
+                await self.holder_verification_repository.link_wallet(
+                    wallet_address,
+                    user.id,
+                    user.guild.id,
+                    nft_count,
+                    config.collection_address,
+                    cached_at,
+                )
 
             if nft_count == 0:
                 logger.info(f"Wallet {wallet_address} has no tokens in the collection.")
-                return False
 
+            # Runs even without tokens, so a tier the user no longer holds is removed.
             return await self._update_user_role(user)
+        except VerificationUnavailableError:
+            raise
         except Exception as e:
             logger.error(f"Error during wallet verification for {wallet_address}: {e}")
 
+    async def _get_nft_count(
+        self,
+        wallet_address: str,
+        config: "HolderVerificationConfigModel",
+        guild_id: int,
+        on_position: Optional[Callable[[int], Awaitable]],
+    ) -> Tuple[int, Optional[datetime]]:
+        """
+        Returns the wallet's NFT count from the ownership cache when it was
+        checked recently enough for the guild, with the time it was checked,
+        otherwise checks it through the queue and returns it with None.
+        """
+        if self.ownership_cache is not None:
+            cached = await self.ownership_cache.get(
+                wallet_address,
+                config.collection_address,
+                guild_id,
+                config.ownership_max_age,
+            )
+            if cached is not None:
+                logger.info(f"Wallet {wallet_address} answered from ownership cache.")
+                return cached
+
+        # Raises VerificationUnavailableError rather than returning an unknown
+        # count, so only counts that were actually looked up are cached.
+        nft_count = await self.holder_service.verify(
+            wallet_address,
+            config.collection_address,
+            guild_id=guild_id,
+            on_position=on_position,
+        )
+        if self.ownership_cache is not None:
+            self.ownership_cache.put(
+                wallet_address, config.collection_address, nft_count
+            )
+        return nft_count, None
+
     async def _update_user_role(self, user: "discord.Member"):
         """
-        Auxiliary method that updates the user role based on the amount of NFTs
+        Auxiliary method that updates the user role based on the amount of NFTs.
+        The user ends up with only the tier role matching their total, in one
+        roles update, or with none when no tier matches.
         """
         user_id = user.id
         guild_id = user.guild.id
@@ -60,25 +134,25 @@ class HolderVerificationUseCase:
                 user_id, guild_id
             )
         )
-        new_role_id = await self.holder_config_repository.get_role_by_nft_amount(
-            total_nft_count
-        )
+        index = await self.holder_config_repository.get_threshold_index(guild_id)
+        new_role_id = index.role_for(total_nft_count) if index else None
 
-        if new_role_id:
-            current_role_id = await HolderUserRoleRepository.get_current_user_role(
-                user_id, guild_id
+        if index:
+            edit = HolderRoleReconciler.plan_member(
+                user, new_role_id, set(index.role_ids)
             )
+            if edit is not None:
+                await self.discord_service.edit_member_roles(
+                    user, edit.add, edit.remove
+                )
 
-            if new_role_id != current_role_id:
-                if current_role_id:
-                    await DiscordService.remove_role_from_user(user, current_role_id)
-            await DiscordService.add_role_to_user(user, new_role_id)
-
+        if new_role_id:
             await HolderUserRoleRepository.update_user_role(
                 user_id, guild_id, new_role_id
             )
             return True
         else:
+            await HolderUserRoleRepository.delete_roles([user_id], guild_id)
             logger.warning(
                 f"No role found for user {user_id} in guild {guild_id} with {total_nft_count} NFTs."
             )
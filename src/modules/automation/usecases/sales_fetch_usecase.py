@@ -34,8 +34,49 @@ class SalesFetchUseCase:
 
         except Exception as e:
             logger.error(f"SalesFetch error: {e}")
+            self.sales_service.discard_cursors()
             return []
 
+    async def execute_for_sales(
+        self,
+        raw_sales: List["ReservoirSale"],
+        tracked_contracts: List["TrackedContract"],
+    ) -> List[Sale]:
+        """
+        Prepares sales pushed by the sales stream, dropping the ones that
+        were already announced, and assigns channel_ids.
+        """
+        try:
+            raw_sales = await self.sales_service.filter_new_sales(raw_sales)
+
+            if not raw_sales:
+                return None
+
+            sales = await self.sales_service.get_sales_with_metadata(raw_sales)
+
+            self._assign_channel_ids_to_sales(sales, tracked_contracts)
+
+            return sales
+
+        except Exception as e:
+            logger.error(f"SalesFetch error: {e}")
+            self.sales_service.discard_cursors()
+            return []
+
+    async def commit(self):
+        """
+        Marks the sales returned by the last execute() as announced, so they
+        are not fetched again, even after a restart.
+        """
+        await self.sales_service.commit_cursors()
+
+    def discard(self):
+        """
+        Forgets the sales returned by the last execute(), so they are fetched
+        again on the next poll.
+        """
+        self.sales_service.discard_cursors()
+
     @staticmethod
     def _assign_channel_ids_to_sales(
         sales: List[Sale], tracked_contracts: List["TrackedContract"]
@@ -1,53 +1,277 @@
-from typing import List
+import asyncio
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
 
 from loguru import logger
 
 from src.shared.services.discord_service import DiscordService
 
 from ..models.sales_entity import Sale
+from ..repositories.sale_digest_repository import SaleDigestRepository
+from ..services.sale_dedupe_service import SaleClaimError, SaleDedupeService
 from ..services.sales_notification_service import SalesNotificationService
 
+# Discord accepts up to 10 embeds per message, 6000 characters in total.
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARACTERS_PER_MESSAGE = 6000
+
 
 class SalesSendUseCase:
     """
     Use case responsible for sending sales data to Discord.
+
+    By default every sale is sent as its own message. With a digest_window,
+    sales bound for the same channel are collected for that many seconds and
+    sent together, up to 10 embeds per message; when a channel collects at
+    least summary_min_sales (0 to disable), they are sent as one summary
+    table instead. Queued sales are stored until their digest is sent, and
+    restore() queues the ones left by the last run.
     """
 
     def __init__(
         self,
         discord_service: DiscordService,
         sales_notification_service: SalesNotificationService,
+        sale_dedupe_service: Optional[SaleDedupeService] = None,
+        digest_window: Optional[float] = None,
+        summary_min_sales: int = 0,
     ):
         self.discord_service = discord_service
         self.sales_notification_service = sales_notification_service
+        self.sale_dedupe_service = sale_dedupe_service
+        self.digest_window = digest_window
+        self.summary_min_sales = summary_min_sales
+
+        self._digests: Dict[int, List[Sale]] = defaultdict(list)
+        self._flush_task: Optional[asyncio.Task] = None
 
     async def execute(self, sales: List[Sale]):
         """
-        Sends sales to the respective channels on Discord.
+        Sends sales to the respective channels on Discord, skipping the
+        channels a sale was already sent to. In digest mode the sales are
+        only queued here and sent when the digest window closes.
+        Raises SaleClaimError when the sales could not be claimed, in which
+        case none of them were sent.
         """
         logger.info("Starting execution of SalesSendUseCase.")
         logger.info(f"Received {len(sales)} sales to process.")
 
         try:
+            claimed = await self._claim(sales)
+            if self.digest_window is not None:
+                await self._queue_digests(sales, claimed)
+                return
+
             for sale in reversed(sales):
+                channel_ids = self._channels_to_send(sale, claimed)
+                if not channel_ids:
+                    logger.info(f"Sale {sale.contract} was already sent, skipping.")
+                    continue
+
                 logger.info(f"Creating embed for sale: {sale.contract}")
                 embed = await self.sales_notification_service.format_sale_embed(sale)
-                for channel_id in sale.channel_ids:
+                for channel_id in channel_ids:
                     try:
                         if channel_id:
-                            await self.discord_service.send_message(
+                            if await self.discord_service.send_message(
                                 channel_id, embed=embed
-                            )
-                            logger.info(
-                                f"Successfully sent sale {sale.contract} to channel ID: {channel_id}"
-                            )
+                            ):
+                                logger.info(
+                                    f"Successfully sent sale {sale.contract} to channel ID: {channel_id}"
+                                )
+                            else:
+                                await self._release([sale], channel_id)
                         else:
                             logger.warning(f"Channel id not being processed")
                     except Exception as e:
                         logger.error(
                             f"Error processing sale {sale.contract}: {e}", exc_info=True
                         )
+                        await self._release([sale], channel_id)
 
             logger.success("Finished execution of SalesSendUseCase.")
+        except SaleClaimError:
+            raise
         except Exception as e:
             logger.error(f"Error in execute: {e}", exc_info=True)
+
+    def _channels_to_send(self, sale: Sale, claimed: Set[tuple]) -> List[int]:
+        return [
+            channel_id
+            for channel_id in sale.channel_ids
+            if not self._is_deduplicated(sale)
+            or sale.dispatch_key(channel_id) in claimed
+        ]
+
+    async def _queue_digests(self, sales: List[Sale], claimed: Set[tuple]):
+        """
+        Stores the sales to send and queues them for the next digest. The
+        sale cursors move on once this returns, so sales that could not be
+        stored are sent right away instead of being held only in memory.
+        """
+        queue = [
+            (channel_id, sale)
+            for sale in reversed(sales)
+            for channel_id in self._channels_to_send(sale, claimed)
+            if channel_id
+        ]
+        if not await SaleDigestRepository.save_entries(
+            (sale.dispatch_key(channel_id), sale.to_payload())
+            for channel_id, sale in queue
+            if sale.tx_hash is not None
+        ):
+            unsent = defaultdict(list)
+            for channel_id, sale in queue:
+                unsent[channel_id].append(sale)
+            await asyncio.gather(
+                *(
+                    self._send_digest(channel_id, channel_sales)
+                    for channel_id, channel_sales in unsent.items()
+                )
+            )
+            return
+
+        for channel_id, sale in queue:
+            self._digests[channel_id].append(sale)
+        logger.info(f"Queued {len(queue)} sales for the next digest.")
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self._digests and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+
+    async def restore(self):
+        """
+        Queues the digest sales stored by the last run, which ended before
+        sending them. They are sent right away when digests are disabled.
+        """
+        entries = await SaleDigestRepository.get_entries()
+        if not entries:
+            return
+
+        queued = {
+            sale.dispatch_key(channel_id)
+            for channel_id, sales in self._digests.items()
+            for sale in sales
+        }
+        restored = 0
+        for channel_id, payload in entries:
+            try:
+                sale = Sale.from_payload(payload)
+            except Exception as e:
+                logger.error(
+                    f"Error restoring digest sale {payload.get('tx_hash')}: {e}"
+                )
+                continue
+            if sale.dispatch_key(channel_id) not in queued:
+                self._digests[channel_id].append(sale)
+                restored += 1
+        logger.info(f"Restored {restored} sales queued for digests.")
+
+        if self.digest_window is None:
+            await self.flush()
+        else:
+            self._schedule_flush()
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(self.digest_window)
+        await self.flush()
+
+    async def flush(self):
+        """
+        Sends every queued digest right away.
+        """
+        digests, self._digests = self._digests, defaultdict(list)
+        if not digests:
+            return
+        await asyncio.gather(
+            *(
+                self._send_digest(channel_id, sales)
+                for channel_id, sales in digests.items()
+            )
+        )
+        logger.success(f"Sent sales digests to {len(digests)} channels.")
+
+    async def _send_digest(self, channel_id: int, sales: List[Sale]):
+        """
+        Sends the sales queued for a channel in as few messages as possible,
+        oldest sale first.
+        """
+        notifications = self.sales_notification_service
+        try:
+            if self.summary_min_sales and len(sales) >= self.summary_min_sales:
+                embed = await notifications.format_sweep_summary_embed(sales)
+                messages = [([embed], sales)]
+            else:
+                embeds = [await notifications.format_sale_embed(sale) for sale in sales]
+                messages = self._pack_embeds(embeds, sales)
+        except Exception as e:
+            logger.error(f"Error formatting digest for channel {channel_id}: {e}")
+            await self._release(sales, channel_id)
+            await self._forget_queued(sales, channel_id)
+            return
+
+        for embeds, message_sales in messages:
+            if await self.discord_service.send_message(channel_id, embeds=embeds):
+                logger.info(
+                    f"Successfully sent {len(message_sales)} sales to channel ID: {channel_id}"
+                )
+            else:
+                await self._release(message_sales, channel_id)
+            await self._forget_queued(message_sales, channel_id)
+
+    @staticmethod
+    async def _forget_queued(sales: List[Sale], channel_id: int):
+        await SaleDigestRepository.delete_entries(
+            sale.dispatch_key(channel_id) for sale in sales if sale.tx_hash is not None
+        )
+
+    @staticmethod
+    def _pack_embeds(embeds: List["discord.Embed"], sales: List[Sale]) -> List[tuple]:
+        """
+        Groups the embeds into messages within Discord's per-message limits.
+        Returns (embeds, sales) pairs, one per message.
+        """
+        messages = []
+        current_embeds, current_sales, characters = [], [], 0
+        for embed, sale in zip(embeds, sales):
+            if current_embeds and (
+                len(current_embeds) == MAX_EMBEDS_PER_MESSAGE
+                or characters + len(embed) > MAX_EMBED_CHARACTERS_PER_MESSAGE
+            ):
+                messages.append((current_embeds, current_sales))
+                current_embeds, current_sales, characters = [], [], 0
+            current_embeds.append(embed)
+            current_sales.append(sale)
+            characters += len(embed)
+        if current_embeds:
+            messages.append((current_embeds, current_sales))
+        return messages
+
+    def _is_deduplicated(self, sale: Sale) -> bool:
+        # Sales without a transaction hash cannot be told apart, so they are always sent.
+        return self.sale_dedupe_service is not None and sale.tx_hash is not None
+
+    async def _claim(self, sales: List[Sale]) -> Set[tuple]:
+        """
+        Claims every (sale, channel) pair to send in one batch.
+        """
+        keys = [
+            sale.dispatch_key(channel_id)
+            for sale in sales
+            if self._is_deduplicated(sale)
+            for channel_id in sale.channel_ids
+            if channel_id
+        ]
+        if not keys:
+            return set()
+        return await self.sale_dedupe_service.claim(keys)
+
+    async def _release(self, sales: List[Sale], channel_id: int):
+        keys = [
+            sale.dispatch_key(channel_id)
+            for sale in sales
+            if channel_id and self._is_deduplicated(sale)
+        ]
+        if keys:
+            await self.sale_dedupe_service.release(keys)
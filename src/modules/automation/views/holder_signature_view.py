@@ -2,6 +2,8 @@ import discord
 from discord.ui import Button, Modal, TextInput, View
 from loguru import logger
 
+from ..services.holder_verification_service import VerificationUnavailableError
+
 
 class SignatureButtonView(View):
     """
@@ -99,19 +101,39 @@ class SignatureVerificationModal(Modal):
 
             logger.info(f"Signature validated for {self.wallet_address}")
 
-            result = await self.verification_controller.handle_individual_verification(
-                self.wallet_address,
-                interaction.user,
-            )
+            # The check may wait in the queue longer than an interaction
+            # allows for a response, so the response is deferred and edited.
+            await interaction.response.defer(ephemeral=True, thinking=True)
+
+            async def on_position(position: int):
+                await interaction.edit_original_response(
+                    content=f"You are number {position} in the verification queue, please wait..."
+                )
+
+            try:
+                result = (
+                    await self.verification_controller.handle_individual_verification(
+                        self.wallet_address,
+                        interaction.user,
+                        on_position=on_position,
+                    )
+                )
+            except VerificationUnavailableError as e:
+                logger.warning(
+                    f"Verification of {self.wallet_address} unavailable: {e}"
+                )
+                await interaction.edit_original_response(
+                    content="Verification is unavailable right now, please try again in a few minutes."
+                )
+                return
 
             if result:
-                await interaction.response.send_message(
-                    "Your wallet has been successfully verified!", ephemeral=True
+                await interaction.edit_original_response(
+                    content="Your wallet has been successfully verified!"
                 )
             else:
-                await interaction.response.send_message(
-                    "You do not have enough NFTs to be given a role.",
-                    ephemeral=True,
+                await interaction.edit_original_response(
+                    content="You do not have enough NFTs to be given a role."
                 )
         except Exception as e:
             logger.error(f"Error processing signature: {e}")
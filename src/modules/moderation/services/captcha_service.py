@@ -6,16 +6,15 @@ import discord
 from captcha.image import ImageCaptcha
 from loguru import logger
 
-from src.shared.services.http_client import AioHttpClient
 from src.shared.services.imgbb_service import ImgBBService
 
 
 class CaptchaService:
-    def __init__(self, bot: "discord.Client") -> None:
+    def __init__(self, bot: "discord.Client", http_client: "HttpClient") -> None:
         self.bot = bot
+        self.imgbb_service = ImgBBService(http_client=http_client)
 
-    @staticmethod
-    async def generate_captcha() -> Tuple[str, str]:
+    async def generate_captcha(self) -> Tuple[str, str]:
         """
         Generates a captcha and returns the text and image URL.
         """
@@ -28,8 +27,7 @@ class CaptchaService:
             image.write(captcha_text, img_bytes, format="PNG")
             img_bytes.seek(0)
 
-            imgur_service = ImgBBService(http_client=AioHttpClient())
-            img_url = await imgur_service.upload_image(img_bytes.getvalue())
+            img_url = await self.imgbb_service.upload_image(img_bytes.getvalue())
             logger.success(f"Captcha uploaded to Imgur: {img_url}")
 
             return captcha_text, img_url
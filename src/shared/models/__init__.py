@@ -0,0 +1,2 @@
+from .reservoir_models import (ReservoirCollection, ReservoirOwner,
+                               ReservoirSale, ReservoirToken)
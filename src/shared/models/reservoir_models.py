@@ -0,0 +1,156 @@
+from typing import Optional
+
+
+class ReservoirToken:
+    """
+    Token identity and display metadata, as returned by the sales and tokens endpoints.
+    """
+
+    __slots__ = ("contract", "token_id", "name", "image")
+
+    def __init__(
+        self,
+        contract: str,
+        token_id: str,
+        name: Optional[str] = None,
+        image: Optional[str] = None,
+    ):
+        self.contract = contract
+        self.token_id = token_id
+        self.name = name
+        self.image = image
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "ReservoirToken":
+        return cls(
+            contract=payload["contract"],
+            token_id=str(payload["tokenId"]),
+            name=payload.get("name"),
+            image=payload.get("image"),
+        )
+
+    @property
+    def key(self) -> str:
+        """
+        Lowercased "contract:tokenId", the key tokens are looked up by.
+        """
+        return f"{self.contract}:{self.token_id}".lower()
+
+
+class ReservoirSale:
+    """
+    A sale from the /sales endpoint.
+    """
+
+    __slots__ = (
+        "id",
+        "tx_hash",
+        "log_index",
+        "timestamp",
+        "price_native",
+        "price_usd",
+        "seller",
+        "buyer",
+        "token",
+    )
+
+    def __init__(
+        self,
+        id: Optional[str],
+        tx_hash: Optional[str],
+        log_index: Optional[int],
+        timestamp: int,
+        price_native: Optional[float],
+        price_usd: Optional[float],
+        seller: str,
+        buyer: str,
+        token: ReservoirToken,
+    ):
+        self.id = id
+        self.tx_hash = tx_hash
+        self.log_index = log_index
+        self.timestamp = timestamp
+        self.price_native = price_native
+        self.price_usd = price_usd
+        self.seller = seller
+        self.buyer = buyer
+        self.token = token
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "ReservoirSale":
+        amount = payload["price"]["amount"]
+        return cls(
+            id=payload.get("id"),
+            tx_hash=payload.get("txHash"),
+            log_index=payload.get("logIndex"),
+            timestamp=payload["timestamp"],
+            price_native=amount.get("native"),
+            price_usd=amount.get("usd"),
+            seller=payload["from"],
+            buyer=payload["to"],
+            token=ReservoirToken.from_payload(payload["token"]),
+        )
+
+
+class ReservoirCollection:
+    """
+    Floor price and volume stats of a collection from the /collections endpoint.
+    """
+
+    __slots__ = ("contract", "name", "floor_price", "volume_1day", "volume_change")
+
+    def __init__(
+        self,
+        contract: str,
+        name: Optional[str],
+        floor_price: Optional[float],
+        volume_1day: Optional[float],
+        volume_change: Optional[float],
+    ):
+        self.contract = contract
+        self.name = name
+        self.floor_price = floor_price
+        self.volume_1day = volume_1day
+        self.volume_change = volume_change
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "ReservoirCollection":
+        floor_ask = payload.get("floorAsk") or {}
+        price = floor_ask.get("price") or {}
+        return cls(
+            contract=payload.get("primaryContract") or payload["id"],
+            name=payload.get("name"),
+            floor_price=(price.get("amount") or {}).get("native"),
+            volume_1day=(payload.get("volume") or {}).get("1day"),
+            volume_change=(payload.get("volumeChange") or {}).get("1day"),
+        )
+
+    def to_stats(self) -> dict:
+        """
+        Returns the stats shown in sale embeds.
+        """
+        return {
+            "floor_price": self.floor_price,
+            "volume_1day": self.volume_1day,
+            "volume_change": self.volume_change,
+        }
+
+
+class ReservoirOwner:
+    """
+    A holder of a collection from the /owners endpoint.
+    """
+
+    __slots__ = ("address", "token_count")
+
+    def __init__(self, address: str, token_count: int):
+        self.address = address
+        self.token_count = token_count
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "ReservoirOwner":
+        raw_count = (payload.get("ownership") or {}).get("tokenCount")
+        return cls(
+            address=(payload.get("address") or "").lower(),
+            token_count=int(raw_count) if raw_count is not None else 0,
+        )
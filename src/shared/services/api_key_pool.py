@@ -0,0 +1,135 @@
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from .rate_limiter import AdaptiveRateLimiter
+
+
+class ApiKey:
+    """
+    One API key with its own rate limit accounting and health.
+    """
+
+    def __init__(self, key: str, rate: float, burst: int):
+        self.key = key
+        self.limiter = AdaptiveRateLimiter(rate=rate, burst=burst)
+        self.in_flight = 0
+        self.requests = 0
+        self.disabled_until = 0.0
+        self.disabled_reason: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        """
+        Masked form of the key, safe to log.
+        """
+        return f"...{self.key[-4:]}" if len(self.key) > 4 else "..."
+
+    @property
+    def healthy(self) -> bool:
+        if self.disabled_reason is None:
+            return True
+        if time.monotonic() >= self.disabled_until:
+            logger.info(f"API key {self.name} back in rotation.")
+            self.disabled_reason = None
+            return True
+        return False
+
+
+class ApiKeyPool:
+    """
+    Spreads requests over several API keys, each with its own rate limiter.
+
+    acquire() waits for a rate limit slot on any healthy key and returns the
+    least loaded one, so throughput grows with the number of keys. Keys that
+    are rejected (invalid or revoked) leave the rotation until auth_cooldown
+    has passed, and keys that ran out of quota until quota_cooldown has
+    passed. The last healthy key is never taken out for a rejection, since a
+    single one may be transient and would stop all traffic.
+    """
+
+    def __init__(
+        self,
+        keys: List[str],
+        rate: float,
+        burst: int,
+        quota_cooldown: float = 3600,
+        auth_cooldown: float = 6 * 3600,
+    ):
+        self.keys = [ApiKey(key, rate, burst) for key in dict.fromkeys(keys) if key]
+        self.quota_cooldown = quota_cooldown
+        self.auth_cooldown = auth_cooldown
+        if not self.keys:
+            logger.error("No Reservoir API key configured.")
+
+    def healthy_keys(self) -> List[ApiKey]:
+        return [key for key in self.keys if key.healthy]
+
+    async def acquire(self) -> Optional[ApiKey]:
+        """
+        Waits until a healthy key has a free slot and returns the least loaded
+        one. Returns None when no key is left in rotation.
+        """
+        while True:
+            healthy = self.healthy_keys()
+            if not healthy:
+                return None
+
+            # Prefer the fullest bucket, then the key with fewer requests in flight.
+            for key in sorted(
+                healthy, key=lambda key: (-key.limiter.available, key.in_flight)
+            ):
+                if key.limiter.try_acquire():
+                    key.requests += 1
+                    return key
+
+            await asyncio.sleep(
+                min(key.limiter.time_until_available() for key in healthy)
+            )
+
+    def on_auth_error(self, key: ApiKey, status: int):
+        """
+        Takes a key that was rejected by the API out of rotation for
+        auth_cooldown seconds, unless it is the last healthy one.
+        """
+        if not any(other.healthy for other in self.keys if other is not key):
+            logger.error(
+                f"API key {key.name} rejected with HTTP {status}, kept in rotation "
+                "as the last healthy key."
+            )
+            return
+
+        key.disabled_reason = f"HTTP {status}"
+        key.disabled_until = time.monotonic() + self.auth_cooldown
+        logger.error(
+            f"API key {key.name} rejected with HTTP {status}, removed from rotation for "
+            f"{self.auth_cooldown:.0f}s ({len(self.healthy_keys())} healthy keys left)."
+        )
+
+    def on_quota_exhausted(self, key: ApiKey):
+        """
+        Takes a key whose quota is used up out of rotation for quota_cooldown seconds.
+        """
+        key.disabled_reason = "quota exhausted"
+        key.disabled_until = time.monotonic() + self.quota_cooldown
+        logger.warning(
+            f"API key {key.name} is out of quota, removed from rotation for "
+            f"{self.quota_cooldown:.0f}s ({len(self.healthy_keys())} healthy keys left)."
+        )
+
+    def get_stats(self) -> Dict[str, dict]:
+        """
+        Returns the load, rate and health of each key, keyed by position and masked name.
+        """
+        return {
+            f"{index}:{key.name}": {
+                "healthy": key.healthy,
+                "disabled_reason": key.disabled_reason,
+                "requests": key.requests,
+                "in_flight": key.in_flight,
+                **key.limiter.get_stats(),
+            }
+            for index, key in enumerate(self.keys)
+        }
@@ -0,0 +1,98 @@
+import time
+from enum import Enum
+
+from loguru import logger
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing dependency for a while instead of waiting for it to time out.
+
+    After failure_threshold consecutive failures the circuit opens and every
+    request is rejected immediately. Once recovery_timeout has passed, up to
+    half_open_probes requests are let through: a success closes the circuit
+    again and a failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30,
+        half_open_probes: int = 1,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_probes = half_open_probes
+
+        self.state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+
+    def allow_request(self) -> bool:
+        """
+        Returns whether a request may be sent now. In the half-open state,
+        every allowed request is a probe and must be followed by a
+        record_success(), record_failure() or release_probe() call.
+        """
+        if self.state is CircuitState.CLOSED:
+            return True
+
+        if self.state is CircuitState.OPEN:
+            if time.monotonic() - self._opened_at < self.recovery_timeout:
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self._probes_in_flight = 0
+            logger.info(f"Circuit {self.name} half-open, probing.")
+
+        if self._probes_in_flight < self.half_open_probes:
+            self._probes_in_flight += 1
+            return True
+        return False
+
+    def release_probe(self):
+        """
+        Hands back the slot of a half-open probe that ended without an
+        outcome, such as a cancelled request.
+        """
+        if self.state is CircuitState.HALF_OPEN and self._probes_in_flight > 0:
+            self._probes_in_flight -= 1
+
+    def record_success(self):
+        if self.state is not CircuitState.CLOSED:
+            logger.success(f"Circuit {self.name} closed, dependency recovered.")
+        self.state = CircuitState.CLOSED
+        self._failures = 0
+        self._probes_in_flight = 0
+
+    def record_failure(self):
+        if self.state is CircuitState.HALF_OPEN:
+            self._open()
+            return
+
+        self._failures += 1
+        if (
+            self.state is CircuitState.CLOSED
+            and self._failures >= self.failure_threshold
+        ):
+            self._open()
+
+    def _open(self):
+        self.state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._probes_in_flight = 0
+        logger.warning(
+            f"Circuit {self.name} open after {self._failures} failures, "
+            f"rejecting requests for {self.recovery_timeout}s."
+        )
+
+    def get_stats(self) -> dict:
+        return {"state": self.state.value, "failures": self._failures}
@@ -0,0 +1,199 @@
+import asyncio
+import math
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from ..models.reservoir_models import ReservoirSale
+
+
+class CollectionStatsCache:
+    """
+    Floor price and volume stats of the tracked collections, kept in memory.
+
+    run() refreshes every tracked contract in the background, in batches
+    spread evenly over refresh_interval. When the tracked set would need more
+    than max_requests_per_minute, the round is stretched instead, so the
+    refresh only ever uses a bounded share of the API budget. In between,
+    announced sales are added to the cached 1-day volume, and contracts seen
+    for the first time or sold below their cached floor are refreshed first.
+
+    get() never waits on the network: it returns the cached stats with the
+    time they were fetched and whether they are stale, or None.
+    """
+
+    def __init__(
+        self,
+        reservoir_service: "ReservoirService",
+        refresh_interval: float = 300,
+        max_requests_per_minute: float = 6,
+        stale_after: float = 900,
+    ):
+        self.reservoir_service = reservoir_service
+        self.refresh_interval = refresh_interval
+        self.max_requests_per_minute = max_requests_per_minute
+        self.stale_after = stale_after
+
+        self._stats: Dict[str, dict] = {}
+        self._fetched_at: Dict[str, float] = {}
+        # Sales added to each contract's volume since its last refresh, with
+        # their timestamps.
+        self._counted_sales: Dict[str, Dict[Tuple[str, int], int]] = {}
+        self._tracked: List[str] = []
+        # Contracts to refresh before the regular round, in insertion order.
+        self._urgent: Dict[str, None] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+
+        self.refreshed = 0
+        self.failed = 0
+        self.sale_updates = 0
+
+    @property
+    def batch_size(self) -> int:
+        return self.reservoir_service.COLLECTIONS_BATCH_SIZE
+
+    @property
+    def interval(self) -> float:
+        """
+        Seconds a full refresh round takes for the current tracked set.
+        """
+        batches = math.ceil(len(self._tracked) / self.batch_size)
+        return max(self.refresh_interval, batches * 60 / self.max_requests_per_minute)
+
+    def get(self, contract: str) -> Optional[dict]:
+        """
+        Returns the cached stats of a collection, with updated_at and stale,
+        or None when they were never fetched (they are then fetched soon).
+        """
+        contract = contract.lower()
+        stats = self._stats.get(contract)
+        if stats is None:
+            self.request_refresh([contract])
+            return None
+
+        fetched_at = self._fetched_at[contract]
+        return {
+            **stats,
+            "updated_at": datetime.fromtimestamp(fetched_at, timezone.utc),
+            "stale": time.time() - fetched_at
+            > max(self.stale_after, 2 * self.interval),
+        }
+
+    def request_refresh(self, contracts: Iterable[str]):
+        """
+        Moves contracts to the front of the refresh queue.
+        """
+        for contract in contracts:
+            self._urgent[contract.lower()] = None
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def update_from_sale(self, sale: ReservoirSale):
+        """
+        Adds a sale to the cached 1-day volume of its collection, unless the
+        last refresh already included it or it was added before, as when a
+        poll is retried or overlaps the sales stream.
+        """
+        contract = sale.token.contract.lower()
+        stats = self._stats.get(contract)
+        if stats is None or sale.price_native is None:
+            return
+        if sale.timestamp <= self._fetched_at[contract]:
+            return
+        sale_key = (sale.tx_hash or sale.id, sale.log_index or 0)
+        if sale_key[0] is not None:
+            counted = self._counted_sales.setdefault(contract, {})
+            if sale_key in counted:
+                return
+            counted[sale_key] = sale.timestamp
+
+        stats["volume_1day"] = (stats["volume_1day"] or 0) + sale.price_native
+        self.sale_updates += 1
+        floor_price = stats["floor_price"]
+        if floor_price is not None and sale.price_native < floor_price:
+            # Bought below the cached floor, so the floor has moved.
+            self.request_refresh([contract])
+
+    async def refresh(self, contracts: List[str]) -> int:
+        """
+        Fetches the stats of the given contracts now. Returns how many were updated.
+        """
+        fetched_at = time.time()
+        collections = await self.reservoir_service.get_collections_stats(contracts)
+        for contract, collection in collections.items():
+            self._stats[contract] = collection.to_stats()
+            self._fetched_at[contract] = fetched_at
+            # The fetched volume includes the sales made before the fetch.
+            counted = self._counted_sales.get(contract, {})
+            for sale_key, timestamp in list(counted.items()):
+                if timestamp <= fetched_at:
+                    del counted[sale_key]
+
+        self.refreshed += len(collections)
+        self.failed += len(contracts) - len(collections)
+        return len(collections)
+
+    async def run(self, get_contracts: Callable[[], Awaitable[List[str]]]):
+        """
+        Keeps the stats of the tracked contracts fresh until cancelled.
+        """
+        self._wakeup = asyncio.Event()
+        queue = deque()
+        while True:
+            try:
+                if not queue:
+                    self._set_tracked(await get_contracts())
+                    queue.extend(self._tracked)
+
+                batch = self._next_batch(queue)
+                if batch:
+                    await self.refresh(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error refreshing collection stats: {e}")
+
+            batches = max(1, math.ceil(len(self._tracked) / self.batch_size))
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self.interval / batches
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def _set_tracked(self, contracts: List[str]):
+        self._tracked = list(dict.fromkeys(contract.lower() for contract in contracts))
+        tracked = set(self._tracked)
+        for contract in set(self._stats) - tracked:
+            del self._stats[contract]
+            del self._fetched_at[contract]
+            self._counted_sales.pop(contract, None)
+
+    def _next_batch(self, queue: deque) -> List[str]:
+        batch = list(self._urgent)[: self.batch_size]
+        for contract in batch:
+            del self._urgent[contract]
+        while queue and len(batch) < self.batch_size:
+            contract = queue.popleft()
+            if contract not in batch:
+                batch.append(contract)
+        return batch
+
+    def get_stats(self) -> dict:
+        now = time.time()
+        return {
+            "tracked": len(self._tracked),
+            "cached": len(self._stats),
+            "interval": self.interval,
+            "oldest_age": max(
+                (now - fetched_at for fetched_at in self._fetched_at.values()),
+                default=0.0,
+            ),
+            "refreshed": self.refreshed,
+            "failed": self.failed,
+            "sale_updates": self.sale_updates,
+        }
@@ -0,0 +1,293 @@
+import asyncio
+import random
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, List, Optional, Tuple
+
+import aiohttp
+import discord
+from loguru import logger
+
+from .discord_service import DiscordService
+from .rate_limiter import AdaptiveRateLimiter, parse_retry_after
+
+
+class DiscordActionExecutor:
+    """
+    Carries out Discord API calls from a durable outbox.
+
+    Every action is stored before it is attempted, and only removed once it
+    went through, so failed calls are retried and a restart resumes where it
+    stopped (start() reloads the pending actions).
+
+    Actions are grouped by route, the resource Discord rate limits them on: a
+    channel for messages, a guild for role changes. Each route has a token
+    bucket sized like Discord's and runs its actions one at a time, in order,
+    so a channel's messages keep their order while different channels and
+    guilds proceed concurrently, up to max_concurrency calls at once and
+    within the global rate limit. A failed call is retried with exponential
+    backoff, holding back the rest of its route, until max_attempts; calls
+    that cannot succeed (unknown channel, missing permissions) fail at once.
+    """
+
+    SEND_MESSAGE = "send_message"
+    ADD_ROLE = "add_role"
+    REMOVE_ROLE = "remove_role"
+    EDIT_ROLES = "edit_roles"
+
+    # (requests per second, burst) of Discord's buckets for each kind of
+    # route, and of its global limit.
+    ROUTE_LIMITS = {"channel": (1.0, 5), "guild": (1.0, 10)}
+    GLOBAL_LIMIT = (50.0, 50)
+
+    def __init__(
+        self,
+        client: discord.Client,
+        action_repository: "DiscordActionRepository",
+        max_concurrency: int = 10,
+        max_attempts: int = 8,
+        backoff_base: float = 2,
+        backoff_max: float = 600,
+        failed_retention: timedelta = timedelta(days=7),
+    ):
+        self.client = client
+        self.action_repository = action_repository
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failed_retention = failed_retention
+
+        self._queues: Dict[str, Deque["DiscordActionModel"]] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        self._buckets: Dict[str, AdaptiveRateLimiter] = {}
+        self._global_bucket = AdaptiveRateLimiter(*self.GLOBAL_LIMIT)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._started = False
+
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+
+    async def send_message(
+        self,
+        channel_id: int,
+        content: Optional[str] = None,
+        embeds: Optional[List[discord.Embed]] = None,
+    ) -> bool:
+        """
+        Queues a message. Returns whether it was stored in the outbox.
+        """
+        payload = {
+            "channel_id": channel_id,
+            "content": content,
+            "embeds": [embed.to_dict() for embed in embeds or []],
+        }
+        return await self._enqueue(self.SEND_MESSAGE, f"channel:{channel_id}", payload)
+
+    async def add_role(self, guild_id: int, user_id: int, role_id: int) -> bool:
+        """
+        Queues adding a role to a member. Returns whether it was stored in the outbox.
+        """
+        return await self._enqueue_role(self.ADD_ROLE, guild_id, user_id, role_id)
+
+    async def remove_role(self, guild_id: int, user_id: int, role_id: int) -> bool:
+        """
+        Queues removing a role from a member. Returns whether it was stored in the outbox.
+        """
+        return await self._enqueue_role(self.REMOVE_ROLE, guild_id, user_id, role_id)
+
+    async def edit_roles(
+        self, guild_id: int, user_id: int, add_role_ids: set, remove_role_ids: set
+    ) -> bool:
+        """
+        Queues adding and removing roles of a member in one roles update. The
+        member's other roles are read when it runs, so they are kept even if
+        they changed meanwhile. Returns whether it was stored in the outbox.
+        """
+        payload = {
+            "guild_id": guild_id,
+            "user_id": user_id,
+            "add": sorted(add_role_ids),
+            "remove": sorted(remove_role_ids),
+        }
+        return await self._enqueue(self.EDIT_ROLES, f"guild:{guild_id}", payload)
+
+    async def _enqueue_role(
+        self, kind: str, guild_id: int, user_id: int, role_id: int
+    ) -> bool:
+        payload = {"guild_id": guild_id, "user_id": user_id, "role_id": role_id}
+        return await self._enqueue(kind, f"guild:{guild_id}", payload)
+
+    async def _enqueue(self, kind: str, route: str, payload: dict) -> bool:
+        action = await self.action_repository.create(kind, route, payload)
+        if action is None:
+            return False
+        if self._started:
+            self._schedule(action)
+        return True
+
+    async def start(self):
+        """
+        Resumes the pending actions and runs new ones as they are queued.
+        Actions queued before start() wait in the outbox until then.
+        """
+        if self._started:
+            return
+        self._started = True
+
+        removed = await self.action_repository.delete_failed_before(
+            datetime.now(timezone.utc) - self.failed_retention
+        )
+        if removed:
+            logger.info(f"Removed {removed} old failed Discord actions.")
+
+        pending = await self.action_repository.get_pending()
+        for action in pending:
+            self._schedule(action)
+        if pending:
+            logger.info(f"Resuming {len(pending)} pending Discord actions.")
+
+    async def close(self):
+        """
+        Stops running actions. Those not carried out stay in the outbox.
+        """
+        self._started = False
+        for worker in self._workers.values():
+            worker.cancel()
+        self._workers.clear()
+        self._queues.clear()
+
+    def _schedule(self, action: "DiscordActionModel"):
+        self._queues.setdefault(action.route, deque()).append(action)
+        worker = self._workers.get(action.route)
+        if worker is None or worker.done():
+            self._workers[action.route] = asyncio.create_task(
+                self._run_route(action.route)
+            )
+
+    def _bucket(self, route: str) -> AdaptiveRateLimiter:
+        bucket = self._buckets.get(route)
+        if bucket is None:
+            rate, burst = self.ROUTE_LIMITS[route.split(":", 1)[0]]
+            bucket = self._buckets[route] = AdaptiveRateLimiter(rate, burst)
+        return bucket
+
+    async def _run_route(self, route: str):
+        """
+        Runs the actions of one route in order until its queue is empty.
+        """
+        queue = self._queues[route]
+        bucket = self._bucket(route)
+        while queue:
+            action = queue[0]
+            if action.next_attempt_at is not None:
+                delay = (
+                    action.next_attempt_at - datetime.now(timezone.utc)
+                ).total_seconds()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            await bucket.acquire()
+            await self._global_bucket.acquire()
+            async with self._semaphore:
+                error, retryable, retry_after = await self._execute(action)
+
+            if error is None:
+                bucket.on_success()
+                queue.popleft()
+                self.completed += 1
+                await self.action_repository.delete(action)
+                continue
+
+            if retry_after is not None:
+                bucket.on_throttled(retry_after)
+
+            if retryable and action.attempts + 1 < self.max_attempts:
+                delay = retry_after or min(
+                    self.backoff_max, self.backoff_base * 2**action.attempts
+                ) * random.uniform(0.5, 1)
+                await self.action_repository.save_attempt(
+                    action, error, datetime.now(timezone.utc) + timedelta(seconds=delay)
+                )
+                self.retried += 1
+                logger.warning(
+                    f"Discord action {action.kind} on {route} failed "
+                    f"(attempt {action.attempts}), retrying in {delay:.1f}s: {error}"
+                )
+            else:
+                queue.popleft()
+                await self.action_repository.save_attempt(action, error)
+                self.failed += 1
+                logger.error(
+                    f"Discord action {action.kind} on {route} failed "
+                    f"after {action.attempts} attempts: {error}"
+                )
+
+        del self._queues[route]
+        self._workers.pop(route, None)
+
+    async def _execute(
+        self, action: "DiscordActionModel"
+    ) -> Tuple[Optional[str], bool, Optional[float]]:
+        """
+        Makes the API call of an action. Returns (error, retryable, retry_after),
+        with error None on success.
+        """
+        payload = action.payload
+        try:
+            if action.kind == self.SEND_MESSAGE:
+                channel = self.client.get_channel(
+                    payload["channel_id"]
+                ) or await self.client.fetch_channel(payload["channel_id"])
+                await channel.send(
+                    content=payload.get("content"),
+                    embeds=[
+                        discord.Embed.from_dict(embed)
+                        for embed in payload.get("embeds") or []
+                    ],
+                )
+            elif action.kind in (self.ADD_ROLE, self.REMOVE_ROLE, self.EDIT_ROLES):
+                guild = self.client.get_guild(payload["guild_id"])
+                if guild is None:
+                    return f"Guild {payload['guild_id']} not found", False, None
+                member = guild.get_member(
+                    payload["user_id"]
+                ) or await guild.fetch_member(payload["user_id"])
+                if action.kind == self.EDIT_ROLES:
+                    await member.edit(
+                        roles=DiscordService.merge_roles(
+                            member, set(payload["add"]), set(payload["remove"])
+                        )
+                    )
+                    return None, False, None
+
+                role = guild.get_role(payload["role_id"])
+                if role is None:
+                    return f"Role {payload['role_id']} not found", False, None
+                if action.kind == self.ADD_ROLE:
+                    await member.add_roles(role)
+                else:
+                    await member.remove_roles(role)
+            else:
+                return f"Unknown action kind {action.kind}", False, None
+            return None, False, None
+        except (discord.NotFound, discord.Forbidden) as e:
+            return str(e), False, None
+        except discord.HTTPException as e:
+            if e.status == 429:
+                headers = e.response.headers if e.response is not None else {}
+                return str(e), True, parse_retry_after(headers)
+            return str(e), e.status >= 500, None
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+            return str(e) or type(e).__name__, True, None
+        except Exception as e:
+            return str(e) or type(e).__name__, False, None
+
+    def get_stats(self) -> dict:
+        return {
+            "pending": sum(len(queue) for queue in self._queues.values()),
+            "routes": len(self._queues),
+            "completed": self.completed,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
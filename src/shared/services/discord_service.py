@@ -1,24 +1,50 @@
+from typing import Iterable, Optional
+
 import discord
 from loguru import logger
 
 
 class DiscordService:
-    def __init__(self, client: discord.Client):
+    """
+    Sends messages and manages roles on Discord. With an action_executor,
+    messages without a view and role changes go through its durable outbox,
+    and True means the call was queued there.
+    """
+
+    def __init__(
+        self,
+        client: discord.Client,
+        action_executor: Optional["DiscordActionExecutor"] = None,
+    ):
         self.client = client
+        self.action_executor = action_executor
 
-    async def send_message(self, channel_id: int, content=None, embed=None, view=None):
+    async def send_message(
+        self, channel_id: int, content=None, embed=None, view=None, embeds=None
+    ) -> bool:
         """
         Sends a message to Discord. Can include a plain text message, an embed, or both, along with a view (e.g., buttons).
+        Up to 10 embeds can be sent in one message with embeds.
+        Returns whether the message was sent.
         """
+        if self.action_executor is not None and view is None:
+            return await self.action_executor.send_message(
+                channel_id,
+                content=content,
+                embeds=embeds or ([embed] if embed else None),
+            )
+
         try:
             channel = self.client.get_channel(channel_id)
             if channel is None:
                 logger.error(
                     "ERROR: Channel not found! Check that the CHANNEL_ID is correct."
                 )
-                return
+                return False
 
-            if content and embed and not view:
+            if embeds:
+                await channel.send(content=content, embeds=embeds, view=view)
+            elif content and embed and not view:
                 await channel.send(content=content, embed=embed, view=view)
             elif embed and view:
                 await channel.send(embed=embed, view=view)
@@ -28,15 +54,19 @@ class DiscordService:
                 await channel.send(embed=embed, view=view)
             elif view:
                 await channel.send(view=view)
+            return True
 
         except Exception as e:
             logger.error(f"Error sending message: {e}")
+            return False
 
-    @staticmethod
-    async def add_role_to_user(user: discord.Member, role_id: int) -> bool:
+    async def add_role_to_user(self, user: discord.Member, role_id: int) -> bool:
         """
         Adds a role to the user if the role exists in the guild.
         """
+        if self.action_executor is not None:
+            return await self.action_executor.add_role(user.guild.id, user.id, role_id)
+
         try:
             role = user.guild.get_role(role_id)
             if role:
@@ -51,11 +81,15 @@ class DiscordService:
             logger.error(f"Error adding role to user {user.id}: {e}")
             return False
 
-    @staticmethod
-    async def remove_role_from_user(user: discord.Member, role_id: int) -> bool:
+    async def remove_role_from_user(self, user: discord.Member, role_id: int) -> bool:
         """
         Removes a role from the user if the role exists in the guild.
         """
+        if self.action_executor is not None:
+            return await self.action_executor.remove_role(
+                user.guild.id, user.id, role_id
+            )
+
         try:
             role = user.guild.get_role(role_id)
             if role:
@@ -69,3 +103,56 @@ class DiscordService:
         except Exception as e:
             logger.error(f"Error removing role from user {user.id}: {e}")
             return False
+
+    async def edit_member_roles(
+        self,
+        member: discord.Member,
+        add_role_ids: Iterable[int],
+        remove_role_ids: Iterable[int],
+    ) -> bool:
+        """
+        Adds and removes roles of a member in a single roles update, keeping
+        their other roles.
+        """
+        add_role_ids, remove_role_ids = set(add_role_ids), set(remove_role_ids)
+        if self.action_executor is not None:
+            return await self.action_executor.edit_roles(
+                member.guild.id, member.id, add_role_ids, remove_role_ids
+            )
+
+        try:
+            await member.edit(
+                roles=DiscordService.merge_roles(member, add_role_ids, remove_role_ids)
+            )
+            logger.success(
+                f"Roles of user {member.id} updated: +{sorted(add_role_ids)} -{sorted(remove_role_ids)}"
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error updating roles of user {member.id}: {e}")
+            return False
+
+    @staticmethod
+    def merge_roles(
+        member: discord.Member, add_role_ids: set, remove_role_ids: set
+    ) -> list:
+        """
+        Returns the member's roles with the given roles added and removed.
+        Roles that do not exist in the guild, and @everyone, are left out.
+        """
+        roles = [
+            role
+            for role in member.roles
+            if role.id != member.guild.id
+            and role.id not in remove_role_ids
+            and role.id not in add_role_ids
+        ]
+        for role_id in add_role_ids:
+            role = member.guild.get_role(role_id)
+            if role is not None:
+                roles.append(role)
+            else:
+                logger.warning(
+                    f"Role with ID {role_id} not found in guild {member.guild.id}"
+                )
+        return roles
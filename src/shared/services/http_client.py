@@ -1,6 +1,30 @@
+import json
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Callable, Mapping, Optional
 
 import aiohttp
+from loguru import logger
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson decodes straight from bytes and is several times faster than the
+# standard library on large payloads; it is used when installed.
+default_json_loads: Callable[[bytes], Any] = orjson.loads if orjson else json.loads
+
+
+@dataclass
+class HttpResponse:
+    """
+    Status, headers and decoded body of a response that was not raised on.
+    """
+
+    status: int
+    data: Any = None
+    headers: Mapping[str, str] = field(default_factory=dict)
 
 
 class HttpClient(ABC):
@@ -9,6 +33,16 @@ class HttpClient(ABC):
     Allows swapping out the HTTP client implementation.
     """
 
+    async def start(self):
+        """
+        Opens any long-lived resources held by the client.
+        """
+
+    async def close(self):
+        """
+        Releases any long-lived resources held by the client.
+        """
+
     @abstractmethod
     async def get(self, url: str, headers: dict, params: dict) -> dict:
         pass
@@ -17,20 +51,130 @@ class HttpClient(ABC):
     async def post(self, url: str, headers: dict, data: dict) -> dict:
         pass
 
+    async def get_response(self, url: str, headers: dict, params: dict) -> HttpResponse:
+        """
+        Performs a GET and returns the status and headers alongside the body
+        instead of raising on error statuses.
+        """
+        return HttpResponse(status=200, data=await self.get(url, headers, params))
+
+    async def ws_connect(self, url: str, **kwargs) -> "aiohttp.ClientWebSocketResponse":
+        """
+        Opens a websocket connection. The caller is responsible for closing it.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support websockets")
+
 
 class AioHttpClient(HttpClient):
     """
     A concrete implementation of HttpClient using aiohttp.
+
+    Keeps a single pooled ClientSession alive between requests so connections
+    (TCP + TLS) and DNS lookups are reused instead of renegotiated per call.
     """
 
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        ttl_dns_cache: int = 300,
+        keepalive_timeout: float = 30,
+        request_timeout: float = 30,
+        json_loads: Optional[Callable[[bytes], Any]] = None,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.ttl_dns_cache = ttl_dns_cache
+        self.keepalive_timeout = keepalive_timeout
+        self.request_timeout = request_timeout
+        self.json_loads = json_loads or default_json_loads
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def start(self):
+        """
+        Opens the pooled session. Calling it on an open client is a no-op.
+        """
+        if self._session is not None and not self._session.closed:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.ttl_dns_cache,
+            use_dns_cache=True,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+        )
+        logger.info(
+            f"HTTP session opened (limit={self.limit}, per host={self.limit_per_host}, "
+            f"dns ttl={self.ttl_dns_cache}s, keep-alive={self.keepalive_timeout}s)"
+        )
+
+    async def close(self):
+        """
+        Closes the pooled session and every connection it holds.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("HTTP session closed.")
+        self._session = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            await self.start()
+        return self._session
+
+    def get_pool_stats(self) -> dict:
+        """
+        Returns the number of open, idle and waiting connections in the pool.
+        """
+        if self._session is None or self._session.closed:
+            return {"open": 0, "idle": 0, "in_use": 0, "waiting": 0}
+
+        connector = self._session.connector
+        in_use = len(connector._acquired)
+        idle = sum(len(conns) for conns in connector._conns.values())
+        waiting = sum(len(waiters) for waiters in connector._waiters.values())
+        return {
+            "open": in_use + idle,
+            "idle": idle,
+            "in_use": in_use,
+            "waiting": waiting,
+        }
+
+    async def _decode(self, response: aiohttp.ClientResponse) -> Any:
+        """
+        Decodes the JSON body from the raw bytes with the configured decoder.
+        """
+        body = await response.read()
+        return self.json_loads(body) if body.strip() else None
+
     async def get(self, url: str, headers: dict, params: dict) -> dict:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, params=params) as response:
-                response.raise_for_status()
-                return await response.json()
+        session = await self._get_session()
+        async with session.get(url, headers=headers, params=params) as response:
+            response.raise_for_status()
+            return await self._decode(response)
+
+    async def get_response(self, url: str, headers: dict, params: dict) -> HttpResponse:
+        session = await self._get_session()
+        async with session.get(url, headers=headers, params=params) as response:
+            try:
+                data = await self._decode(response)
+            except ValueError:
+                data = None
+            return HttpResponse(
+                status=response.status, data=data, headers=response.headers
+            )
+
+    async def ws_connect(self, url: str, **kwargs) -> aiohttp.ClientWebSocketResponse:
+        session = await self._get_session()
+        return await session.ws_connect(url, **kwargs)
 
     async def post(self, url: str, headers: dict, data: dict) -> dict:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, data=data) as response:
-                response.raise_for_status()
-                return await response.json()
+        session = await self._get_session()
+        async with session.post(url, headers=headers, data=data) as response:
+            response.raise_for_status()
+            return await self._decode(response)
@@ -0,0 +1,190 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+from loguru import logger
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Returns the number of seconds requested by a Retry-After header, if any.
+    Accepts both the delta-seconds and the HTTP-date forms.
+    """
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket limiter whose refill rate adapts to observed throttling.
+
+    The bucket starts at the plan rate. Every 429 cuts the rate
+    multiplicatively and pauses the bucket, and a streak of successful
+    requests ramps it back up additively until the plan rate is reached.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        min_rate: Optional[float] = None,
+        decrease_factor: float = 0.5,
+        increase_step: Optional[float] = None,
+        success_streak: int = 10,
+    ):
+        self.max_rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 20
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step if increase_step else rate / 10
+        self.success_streak = success_streak
+
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._successes = 0
+        self._throttled_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated_at
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    async def acquire(self):
+        """
+        Waits until a request may be sent and consumes one token.
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def try_acquire(self) -> bool:
+        """
+        Consumes one token if one is available right now, without waiting.
+        """
+        now = time.monotonic()
+        if now < self._paused_until:
+            return False
+
+        self._refill(now)
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def time_until_available(self) -> float:
+        """
+        Returns the number of seconds until a token becomes available.
+        """
+        now = time.monotonic()
+        if now < self._paused_until:
+            return self._paused_until - now
+
+        self._refill(now)
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+    @property
+    def available(self) -> float:
+        """
+        Fraction of the bucket currently filled, from 0 to 1.
+        """
+        now = time.monotonic()
+        if now < self._paused_until:
+            return 0.0
+        self._refill(now)
+        return self._tokens / self.burst
+
+    def pause(self, seconds: float):
+        """
+        Blocks every caller for the given number of seconds.
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def on_success(self):
+        """
+        Records a successful request and ramps the rate back up after a streak.
+        """
+        self._successes += 1
+        if self._successes >= self.success_streak and self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.increase_step)
+            self._successes = 0
+            logger.debug(f"Rate limiter ramped up to {self.rate:.2f} req/s")
+
+    def on_throttled(self, retry_after: Optional[float] = None):
+        """
+        Records a 429 response: lowers the rate, drains the bucket and pauses it.
+        """
+        self._successes = 0
+        now = time.monotonic()
+        # Requests already in flight when the first 429 arrives report the same
+        # throttling episode, so only cut the rate once per episode.
+        if now - self._throttled_at > 1:
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        self._throttled_at = now
+        self._tokens = 0.0
+        if retry_after:
+            self.pause(retry_after)
+        logger.warning(
+            f"Rate limited, slowing down to {self.rate:.2f} req/s"
+            + (f" after a {retry_after:.1f}s pause" if retry_after else "")
+        )
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """
+        Pauses the bucket when the server reports the quota as exhausted.
+        """
+        remaining = headers.get("X-RateLimit-Remaining") or headers.get(
+            "x-ratelimit-remaining"
+        )
+        reset = headers.get("X-RateLimit-Reset") or headers.get("x-ratelimit-reset")
+        if remaining is None or reset is None:
+            return
+
+        try:
+            remaining = int(float(remaining))
+            reset = float(reset)
+        except ValueError:
+            return
+
+        if remaining > 0:
+            return
+
+        # The reset header is either seconds until reset or an epoch timestamp.
+        wait = reset - time.time() if reset > time.time() / 2 else reset
+        if wait > 0:
+            self.pause(wait)
+            logger.warning(f"Rate limit quota exhausted, pausing for {wait:.1f}s")
+
+    def get_stats(self) -> dict:
+        return {
+            "rate": self.rate,
+            "max_rate": self.max_rate,
+            "tokens": self._tokens,
+            "paused_for": max(0.0, self._paused_until - time.monotonic()),
+        }
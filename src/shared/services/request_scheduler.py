@@ -0,0 +1,182 @@
+import asyncio
+import heapq
+import itertools
+import time
+from enum import IntEnum
+from typing import Any, Dict, Hashable, List, Optional, Union
+
+from loguru import logger
+
+
+class RequestPriority(IntEnum):
+    """
+    Priority classes of outbound API calls, most urgent first.
+    """
+
+    INTERACTIVE = 0
+    NEAR_REAL_TIME = 1
+    BULK = 2
+
+
+class RequestScheduler:
+    """
+    Hands out rate limit slots by priority class, then fairly between guilds.
+
+    A waiting interactive request always gets the next token before any
+    near-real-time one, and those before bulk work. Inside a class, guilds are
+    served by start-time fair queuing: each guild gets a share of the class
+    proportional to its weight, so one guild queueing thousands of requests
+    does not delay the others' by more than a few slots.
+
+    Slots come from anything with an async acquire(): a single rate limiter,
+    or an ApiKeyPool, in which case each request is handed the key to use.
+    """
+
+    # Seconds the dispatcher pauses after an error before serving again.
+    ERROR_DELAY = 1.0
+
+    def __init__(
+        self,
+        rate_limiter: Union["AdaptiveRateLimiter", "ApiKeyPool"],
+        guild_weights: Optional[Dict[Hashable, float]] = None,
+    ):
+        self.rate_limiter = rate_limiter
+        self.guild_weights = dict(guild_weights or {})
+
+        self._queues: Dict[RequestPriority, List[tuple]] = {
+            priority: [] for priority in RequestPriority
+        }
+        self._virtual_time: Dict[RequestPriority, float] = {
+            priority: 0.0 for priority in RequestPriority
+        }
+        self._last_finish: Dict[RequestPriority, Dict[Hashable, float]] = {
+            priority: {} for priority in RequestPriority
+        }
+        self._sequence = itertools.count()
+        self._pending: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+
+        self._dispatched = {priority: 0 for priority in RequestPriority}
+        self._total_wait = {priority: 0.0 for priority in RequestPriority}
+        self._max_wait = {priority: 0.0 for priority in RequestPriority}
+
+    def set_guild_weight(self, guild_id: Hashable, weight: float):
+        """
+        Sets the relative share of a guild within each priority class (default 1).
+        """
+        self.guild_weights[guild_id] = weight
+
+    async def acquire(
+        self,
+        priority: RequestPriority = RequestPriority.NEAR_REAL_TIME,
+        guild_id: Optional[Hashable] = None,
+    ) -> Any:
+        """
+        Waits until the request may be sent, ahead of lower priority classes
+        and fairly with other guilds in the same class. Returns whatever the
+        rate limiter's acquire() returned for this slot.
+        """
+        if self._dispatcher is None or self._dispatcher.done():
+            self._pending = asyncio.Event()
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+        future = asyncio.get_running_loop().create_future()
+        start_tag = max(
+            self._virtual_time[priority],
+            self._last_finish[priority].get(guild_id, 0.0),
+        )
+        weight = self.guild_weights.get(guild_id, 1.0)
+        self._last_finish[priority][guild_id] = start_tag + 1 / weight
+        heapq.heappush(
+            self._queues[priority],
+            (start_tag, next(self._sequence), time.monotonic(), future),
+        )
+        self._pending.set()
+
+        return await future
+
+    def _pop_next(self) -> Optional[tuple]:
+        """
+        Removes and returns the next request to serve, skipping cancelled ones.
+        """
+        for priority in RequestPriority:
+            queue = self._queues[priority]
+            while queue:
+                start_tag, _, enqueued_at, future = heapq.heappop(queue)
+                if future.done():
+                    continue
+                self._virtual_time[priority] = start_tag
+                if not queue:
+                    # Idle class: forget old finish tags so they do not grow forever.
+                    self._last_finish[priority].clear()
+                return priority, enqueued_at, future
+        return None
+
+    async def _dispatch(self):
+        while True:
+            if not any(self._queues.values()):
+                self._pending.clear()
+                await self._pending.wait()
+                continue
+
+            try:
+                await self._dispatch_next()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Every waiting request depends on this loop, so it keeps
+                # going; the requests are served once slots can be had again.
+                logger.error(f"Error dispatching rate limit slots: {e}")
+                await asyncio.sleep(self.ERROR_DELAY)
+
+    async def _dispatch_next(self):
+        # Take the token first, so a request arriving while we wait for it
+        # still competes on priority for that token.
+        grant = await self.rate_limiter.acquire()
+
+        entry = self._pop_next()
+        if entry is None:
+            return
+
+        priority, enqueued_at, future = entry
+        waited = time.monotonic() - enqueued_at
+        self._dispatched[priority] += 1
+        self._total_wait[priority] += waited
+        self._max_wait[priority] = max(self._max_wait[priority], waited)
+        future.set_result(grant)
+
+        if priority is not RequestPriority.BULK and waited > 10:
+            logger.warning(
+                f"{priority.name} request waited {waited:.1f}s for a rate limit slot."
+            )
+
+    async def close(self):
+        """
+        Stops the dispatcher. Requests still waiting are cancelled.
+        """
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            self._dispatcher = None
+        for queue in self._queues.values():
+            for *_, future in queue:
+                future.cancel()
+            queue.clear()
+
+    def get_stats(self) -> Dict[str, dict]:
+        """
+        Returns the queue depth and wait times of each priority class.
+        """
+        stats = {}
+        for priority in RequestPriority:
+            dispatched = self._dispatched[priority]
+            stats[priority.name.lower()] = {
+                "depth": sum(
+                    1 for *_, future in self._queues[priority] if not future.done()
+                ),
+                "dispatched": dispatched,
+                "avg_wait": self._total_wait[priority] / dispatched
+                if dispatched
+                else 0.0,
+                "max_wait": self._max_wait[priority],
+            }
+        return stats
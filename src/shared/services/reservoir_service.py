@@ -1,9 +1,16 @@
 import asyncio
-from typing import Dict, List, Optional
+import random
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 from loguru import logger
 
-from .http_client import AioHttpClient
+from ..models.reservoir_models import (ReservoirCollection, ReservoirOwner,
+                                       ReservoirSale, ReservoirToken)
+from .api_key_pool import ApiKeyPool
+from .circuit_breaker import CircuitBreaker, CircuitState
+from .rate_limiter import parse_retry_after
+from .request_scheduler import RequestPriority, RequestScheduler
+from .response_cache import ResponseCache, StaleResponse
 
 
 class ReservoirService:
@@ -11,134 +18,683 @@ class ReservoirService:
     Repository responsible for fetching sales data and token metadata from the Reservoir API.
     """
 
-    def __init__(self, api_key: str, http_client: "HttpClient"):
-        self.api_key = api_key
+    # Seconds each endpoint's responses stay fresh in the response cache.
+    # Endpoints missing here (sales, owners) are always fetched live.
+    CACHE_TTLS = {
+        "collections": 60,
+        "tokens": 3600,
+        "ownership": 60,
+    }
+
+    # Maximum number of tokens the /tokens endpoint accepts per request.
+    TOKENS_BATCH_SIZE = 50
+
+    # Maximum number of contracts the /sales endpoint filters on per request.
+    SALES_CONTRACTS_PER_REQUEST = 20
+
+    # Maximum number of contracts the /collections endpoint accepts per request.
+    COLLECTIONS_BATCH_SIZE = 20
+
+    def __init__(
+        self,
+        api_key: str,
+        http_client: "HttpClient",
+        requests_per_minute: int = 120,
+        burst: int = 10,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30,
+        cache_size: int = 2048,
+        base_url: str = "https://api.reservoir.tools",
+        circuit_failure_threshold: int = 5,
+        circuit_recovery_timeout: float = 30,
+        api_keys: Optional[List[str]] = None,
+        quota_cooldown: float = 3600,
+        auth_cooldown: float = 6 * 3600,
+    ):
         self.http_client = http_client
+        self.base_url = base_url.rstrip("/")
+        # requests_per_minute and burst are the limits of a single key; every
+        # key in the pool gets its own budget.
+        self.key_pool = ApiKeyPool(
+            api_keys or [api_key],
+            rate=requests_per_minute / 60,
+            burst=burst,
+            quota_cooldown=quota_cooldown,
+            auth_cooldown=auth_cooldown,
+        )
+        self.scheduler = RequestScheduler(self.key_pool)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.cache = ResponseCache(maxsize=cache_size)
+        self.circuit_failure_threshold = circuit_failure_threshold
+        self.circuit_recovery_timeout = circuit_recovery_timeout
+        self.circuits: Dict[str, CircuitBreaker] = {}
 
-    async def _make_request(self, url: str, params: dict) -> dict:
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        Exponential backoff with full jitter.
+        """
+        return random.uniform(
+            0, min(self.backoff_max, self.backoff_base * 2**attempt)
+        )
+
+    def _get_circuit(self, endpoint: str) -> CircuitBreaker:
+        circuit = self.circuits.get(endpoint)
+        if circuit is None:
+            circuit = CircuitBreaker(
+                f"reservoir:{endpoint}",
+                failure_threshold=self.circuit_failure_threshold,
+                recovery_timeout=self.circuit_recovery_timeout,
+            )
+            self.circuits[endpoint] = circuit
+        return circuit
+
+    async def _make_request(
+        self,
+        url: str,
+        params: dict,
+        endpoint: str,
+        priority: RequestPriority = RequestPriority.NEAR_REAL_TIME,
+        guild_id: Optional[int] = None,
+    ) -> dict:
         """
         Helper method to make API requests with error handling and logging.
+        Requests wait for a rate limit slot in the scheduler (by priority, then
+        fairly per guild) and are retried on 429, 5xx and network errors,
+        honouring Retry-After when the server sends it. Each attempt is sent
+        with the least loaded healthy API key, and a key rejected by the API
+        is dropped from the pool and the request retried with another one.
+        Each endpoint has its own circuit breaker: while it is open, requests
+        fail immediately instead of waiting on a degraded API.
         """
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.api_key}",
-        }
+        circuit = self._get_circuit(endpoint)
+        if not circuit.allow_request():
+            logger.warning(f"Circuit for {endpoint} is open, skipping {url}")
+            return {}
+
+        # A half-open probe only gets one attempt, so recovery is detected quickly.
+        is_probe = circuit.state is CircuitState.HALF_OPEN
+        max_retries = 0 if is_probe else self.max_retries
 
         try:
-            data = await self.http_client.get(url, headers=headers, params=params)
+            return await self._send_with_retries(
+                url, params, circuit, max_retries, priority, guild_id
+            )
+        except BaseException:
+            # A cancelled probe records no outcome, so its slot is handed back
+            # for the next request to probe with.
+            if is_probe:
+                circuit.release_probe()
+            raise
+
+    async def _send_with_retries(
+        self,
+        url: str,
+        params: dict,
+        circuit: CircuitBreaker,
+        max_retries: int,
+        priority: RequestPriority,
+        guild_id: Optional[int],
+    ) -> dict:
+        """
+        Sends the request, retrying up to max_retries times, and records the
+        outcome on the circuit.
+        """
+        for attempt in range(max_retries + 1):
+            api_key = await self.scheduler.acquire(priority, guild_id)
+            if api_key is None:
+                logger.error(f"Error making request to {url}: no healthy API key")
+                circuit.record_failure()
+                return {}
+            is_last_attempt = attempt == max_retries
+
+            headers = {
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {api_key.key}",
+            }
+            api_key.in_flight += 1
+            try:
+                response = await self.http_client.get_response(
+                    url, headers=headers, params=params
+                )
+            except Exception as e:
+                if is_last_attempt:
+                    logger.error(f"Error making request to {url}: {e}")
+                    circuit.record_failure()
+                    return {}
+                delay = self._backoff_delay(attempt)
+                logger.warning(
+                    f"Request to {url} failed ({e}), retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+                if circuit.state is CircuitState.OPEN:
+                    break
+                continue
+            finally:
+                api_key.in_flight -= 1
+
+            api_key.limiter.update_from_headers(response.headers)
+
+            if response.status < 400:
+                api_key.limiter.on_success()
+                circuit.record_success()
+                return response.data if response.data is not None else {}
+
+            if response.status in (401, 403) or self._is_quota_error(response):
+                if response.status in (401, 403):
+                    self.key_pool.on_auth_error(api_key, response.status)
+                else:
+                    self.key_pool.on_quota_exhausted(api_key)
+                if not is_last_attempt and self.key_pool.healthy_keys():
+                    continue
+                circuit.record_success()
+                return {}
+
+            if response.status != 429 and response.status < 500:
+                logger.error(f"Error making request to {url}: HTTP {response.status}")
+                # The API answered, so this says nothing about its health.
+                circuit.record_success()
+                return {}
+
+            if is_last_attempt:
+                break
+
+            retry_after = parse_retry_after(response.headers)
+            delay = (
+                retry_after if retry_after is not None else self._backoff_delay(attempt)
+            )
+            if response.status == 429:
+                # The key's limiter pauses itself, so the scheduler moves on
+                # to other keys, or waits, on the next acquire().
+                api_key.limiter.on_throttled(delay)
+                continue
+
+            logger.warning(
+                f"HTTP {response.status} from {url}, retrying in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+            if circuit.state is CircuitState.OPEN:
+                # Another request tripped the circuit meanwhile, stop retrying.
+                break
+
+        logger.error(
+            f"Error making request to {url}: giving up after {attempt + 1} attempts"
+        )
+        circuit.record_failure()
+        return {}
+
+    @staticmethod
+    def _is_quota_error(response: "HttpResponse") -> bool:
+        """
+        Whether the API refused the request because the key's quota is used up,
+        as opposed to a short-term rate limit.
+        """
+        if response.status == 402:
+            return True
+        message = (
+            response.data.get("message") if isinstance(response.data, dict) else ""
+        )
+        return response.status == 429 and "quota" in str(message).lower()
+
+    async def _cached_request(
+        self,
+        endpoint: str,
+        url: str,
+        params: dict,
+        priority: RequestPriority = RequestPriority.NEAR_REAL_TIME,
+        guild_id: Optional[int] = None,
+    ) -> dict:
+        """
+        Serves the request from the response cache when fresh, coalescing
+        concurrent identical requests into a single HTTP call.
+        Failed (empty) responses are never cached. When the live request
+        fails, the last-known-good response is returned as a StaleResponse.
+        """
+        ttl = self.CACHE_TTLS.get(endpoint)
+        if not ttl:
+            return await self._make_request(url, params, endpoint, priority, guild_id)
+
+        key = ResponseCache.make_key(url, params)
+        data = await self.cache.get_or_fetch(
+            key,
+            ttl,
+            lambda: self._make_request(url, params, endpoint, priority, guild_id),
+        )
+        if data:
             return data
-        except Exception as e:
-            logger.error(f"Error making request to {url}: {e}")
-            return {}
 
-    async def get_latest_sales(self, collection_contracts: List[str]) -> List[dict]:
+        stale = self.cache.get_stale(key)
+        if stale is not None:
+            logger.warning(f"Serving stale {endpoint} response for {url}")
+            return StaleResponse(stale)
+        return data
+
+    def get_circuit_stats(self) -> Dict[str, dict]:
+        """
+        Returns the state of every endpoint's circuit breaker.
+        """
+        return {
+            endpoint: circuit.get_stats() for endpoint, circuit in self.circuits.items()
+        }
+
+    async def close(self):
+        """
+        Stops the request scheduler.
+        """
+        await self.scheduler.close()
+
+    def get_key_pool_stats(self) -> Dict[str, dict]:
+        """
+        Returns the load, rate and health of each API key.
+        """
+        return self.key_pool.get_stats()
+
+    def get_scheduler_stats(self) -> Dict[str, dict]:
+        """
+        Returns the queue depth and wait times of each request priority class.
+        """
+        return self.scheduler.get_stats()
+
+    def get_cache_stats(self) -> dict:
+        """
+        Returns hit/miss/eviction counters of the response cache.
+        """
+        return self.cache.get_stats()
+
+    async def get_latest_sales(
+        self,
+        collection_contracts: List[str],
+        priority: RequestPriority = RequestPriority.NEAR_REAL_TIME,
+        guild_id: Optional[int] = None,
+    ) -> List[ReservoirSale]:
         """
         Fetches sales data for a list of collection contracts.
+        Malformed sales are logged and skipped.
         """
-        url = "https://api.reservoir.tools/sales/v5"
+        sales, _ = await self.get_sales_page(
+            collection_contracts, limit=20, priority=priority, guild_id=guild_id
+        )
+        return sales or []
+
+    async def get_sales_page(
+        self,
+        collection_contracts: List[str],
+        continuation: Optional[str] = None,
+        limit: int = 100,
+        priority: RequestPriority = RequestPriority.NEAR_REAL_TIME,
+        guild_id: Optional[int] = None,
+    ) -> Tuple[Optional[List[ReservoirSale]], Optional[str]]:
+        """
+        Fetches one page of sales of the given contracts, newest sale first,
+        and the continuation of the next page.
+        Returns None instead of the sales when the request failed.
+        """
+        url = f"{self.base_url}/sales/v5"
         params = {
             "contract": collection_contracts,
-            "limit": 20,
-            "orderBy": "updated_at",
+            "limit": limit,
+            "orderBy": "time",
             "sortDirection": "desc",
+            "includeTokenMetadata": "true",
         }
+        if continuation:
+            params["continuation"] = continuation
+
+        data = await self._make_request(url, params, "sales", priority, guild_id)
+        if "sales" not in data:
+            return None, None
 
-        data = await self._make_request(url, params)
-        if "sales" in data:
-            logger.success(f"Fetched {len(data['sales'])} sales.")
-            return data["sales"]
-        return []
+        sales = []
+        for payload in data["sales"]:
+            try:
+                sales.append(ReservoirSale.from_payload(payload))
+            except Exception as e:
+                logger.error(f"Error parsing sale {payload.get('id')}: {e}")
+        logger.success(f"Fetched {len(sales)} sales.")
+        return sales, data.get("continuation")
 
-    async def get_token_details(self, contract: str, token_id: str) -> Optional[dict]:
+    async def get_token_details(
+        self,
+        contract: str,
+        token_id: str,
+        priority: RequestPriority = RequestPriority.NEAR_REAL_TIME,
+        guild_id: Optional[int] = None,
+    ) -> Optional[ReservoirToken]:
         """
         Fetches metadata for a specific token.
         """
-        url = "https://api.reservoir.tools/tokens/v7"
-        params = {"tokens": [f"{contract}:{token_id}"]}
+        token = f"{contract}:{token_id}"
+        tokens = await self.get_tokens_details([token], priority, guild_id)
+        return tokens.get(token.lower())
 
-        data = await self._make_request(url, params)
-        if "tokens" in data and len(data["tokens"]) > 0:
-            logger.success(f"Fetched metadata for token {contract}:{token_id}.")
-            return data["tokens"][0]["token"]
-        return None
+    async def get_tokens_details(
+        self,
+        tokens: List[str],
+        priority: RequestPriority = RequestPriority.NEAR_REAL_TIME,
+        guild_id: Optional[int] = None,
+    ) -> Dict[str, ReservoirToken]:
+        """
+        Fetches metadata for many "contract:tokenId" tokens at once.
+        Cached tokens are served from memory and the rest are requested in
+        chunks of up to TOKENS_BATCH_SIZE, concurrently.
+        Returns a dict keyed by the lowercased "contract:tokenId".
+        """
+        url = f"{self.base_url}/tokens/v7"
+        ttl = self.CACHE_TTLS["tokens"]
+        details = {}
+        missing = []
+
+        for token in dict.fromkeys(token.lower() for token in tokens):
+            cached = self.cache.get(("tokens", token))
+            if cached is not None:
+                details[token] = cached
+            else:
+                missing.append(token)
+
+        if not missing:
+            return details
+
+        chunks = [
+            missing[i : i + self.TOKENS_BATCH_SIZE]
+            for i in range(0, len(missing), self.TOKENS_BATCH_SIZE)
+        ]
+        responses = await asyncio.gather(
+            *[
+                self._make_request(
+                    url,
+                    {"tokens": chunk, "limit": len(chunk)},
+                    "tokens",
+                    priority,
+                    guild_id,
+                )
+                for chunk in chunks
+            ]
+        )
+
+        fetched = 0
+        for data in responses:
+            for item in data.get("tokens", []):
+                try:
+                    token = ReservoirToken.from_payload(item["token"])
+                except Exception:
+                    continue
+                details[token.key] = token
+                self.cache.set(("tokens", token.key), token, ttl)
+                fetched += 1
+
+        stale = 0
+        for key in missing:
+            if key not in details:
+                token = self.cache.get_stale(("tokens", key))
+                if token is not None:
+                    details[key] = token
+                    stale += 1
+        if stale:
+            logger.warning(f"Serving stale metadata for {stale} tokens.")
+
+        logger.success(
+            f"Fetched metadata for {fetched}/{len(missing)} tokens "
+            f"in {len(chunks)} request(s)."
+        )
+        return details
 
-    async def get_collection_data(self, collection_contract: str) -> dict:
+    async def get_collection_data(
+        self,
+        collection_contract: str,
+        priority: RequestPriority = RequestPriority.NEAR_REAL_TIME,
+        guild_id: Optional[int] = None,
+    ) -> dict:
         """
         Fetches data for a specific collection.
         """
-        url = "https://api.reservoir.tools/collections/v7"
+        url = f"{self.base_url}/collections/v7"
         params = {"contract": collection_contract}
 
-        data = await self._make_request(url, params)
+        data = await self._cached_request(
+            "collections", url, params, priority, guild_id
+        )
         return data
 
-    async def get_all_holders(self, collection_address: str) -> Dict[str, int]:
+    async def get_collections_stats(
+        self,
+        collection_contracts: List[str],
+        priority: RequestPriority = RequestPriority.BULK,
+        guild_id: Optional[int] = None,
+    ) -> Dict[str, ReservoirCollection]:
         """
-        Fetches all holders for a given collection.
+        Fetches the floor price and volume stats of several collections,
+        COLLECTIONS_BATCH_SIZE per request, keyed by lowercased contract.
+        Collections whose request failed are left out.
         """
-        url = "https://api.reservoir.tools/owners/v2"
-        all_holders = {}
+        url = f"{self.base_url}/collections/v7"
+        contracts = list(dict.fromkeys(c.lower() for c in collection_contracts))
+        chunks = [
+            contracts[i : i + self.COLLECTIONS_BATCH_SIZE]
+            for i in range(0, len(contracts), self.COLLECTIONS_BATCH_SIZE)
+        ]
+        responses = await asyncio.gather(
+            *[
+                self._make_request(
+                    url,
+                    {"contract": chunk, "limit": len(chunk)},
+                    "collections",
+                    priority,
+                    guild_id,
+                )
+                for chunk in chunks
+            ]
+        )
+
+        stats = {}
+        for data in responses:
+            for item in (data or {}).get("collections", []):
+                try:
+                    collection = ReservoirCollection.from_payload(item)
+                except Exception:
+                    continue
+                stats[collection.contract.lower()] = collection
+        return stats
+
+    async def iter_holders(
+        self,
+        collection_address: str,
+        limit: int = 500,
+        priority: RequestPriority = RequestPriority.BULK,
+        guild_id: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, int]]:
+        """
+        Yields the holders of a collection page by page as {wallet: nft_count}.
+        Pages are followed by continuation token (falling back to offset when
+        the API does not return one), and the next page is already being
+        downloaded while the caller processes the current batch.
+        Raises ValueError when a page cannot be fetched, so an incomplete
+        list is never mistaken for the whole.
+        """
+        url = f"{self.base_url}/owners/v2"
+        params = {"collection": collection_address, "limit": limit}
         offset = 0
-        limit = 500
+        total = 0
 
-        while True:
-            params = {
-                "collection": collection_address,
-                "limit": limit,
-                "offset": offset,
-            }
+        def fetch_page(page_params: dict) -> asyncio.Task:
+            return asyncio.create_task(
+                self._make_request(url, page_params, "owners", priority, guild_id)
+            )
 
-            data = await self._make_request(url, params)
-            if "owners" in data:
-                new_holders = 0
-                for owner in data["owners"]:
-                    wallet = owner.get("address", "").lower()
-                    ownership = owner.get("ownership", {})
-                    raw_count = ownership.get("tokenCount")
-                    try:
-                        count = int(raw_count) if raw_count is not None else 0
-                    except Exception as e:
-                        logger.error(f"Error converting tokenCount: {e}")
-                        count = 0
-
-                    if wallet and count > 0:
-                        all_holders[wallet] = count
-                        new_holders += 1
-
-                if len(data["owners"]) < limit:
-                    logger.info(
-                        f"End of data reached for collection {collection_address}."
+        next_page = fetch_page(dict(params))
+        try:
+            while next_page is not None:
+                data = await next_page
+                next_page = None
+
+                if "owners" not in data:
+                    raise ValueError(
+                        f"Error fetching owners data for {collection_address}."
                     )
-                    break
 
-                offset += limit
+                owners = data["owners"]
+                continuation = data.get("continuation")
+                if continuation and owners:
+                    next_page = fetch_page({**params, "continuation": continuation})
+                elif len(owners) >= limit:
+                    offset += limit
+                    next_page = fetch_page({**params, "offset": offset})
+
+                batch = self._parse_owners(owners)
+                total += len(batch)
                 logger.success(
-                    f"Processed batch | New holders: {new_holders} | Total: {len(all_holders)}"
+                    f"Processed batch | New holders: {len(batch)} | Total: {total}"
                 )
-            else:
-                logger.error(f"Error fetching owners data for {collection_address}.")
-                break
+                if batch:
+                    yield batch
+
+            logger.info(f"End of data reached for collection {collection_address}.")
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    @staticmethod
+    def _parse_owners(owners: List[dict]) -> Dict[str, int]:
+        holders = {}
+        for payload in owners:
+            try:
+                owner = ReservoirOwner.from_payload(payload)
+            except Exception as e:
+                logger.error(f"Error converting tokenCount: {e}")
+                continue
 
-            await asyncio.sleep(5)
+            if owner.address and owner.token_count > 0:
+                holders[owner.address] = owner.token_count
+        return holders
 
+    async def get_all_holders(
+        self,
+        collection_address: str,
+        priority: RequestPriority = RequestPriority.BULK,
+        guild_id: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """
+        Fetches all holders for a given collection.
+        """
+        all_holders = {}
+        async for batch in self.iter_holders(
+            collection_address, priority=priority, guild_id=guild_id
+        ):
+            all_holders.update(batch)
         return all_holders
 
+    async def get_transfers_since(
+        self,
+        collection_address: str,
+        since_timestamp: int,
+        limit: int = 100,
+        max_pages: int = 20,
+        priority: RequestPriority = RequestPriority.BULK,
+        guild_id: Optional[int] = None,
+        overlap: int = 60,
+    ) -> Optional[List[dict]]:
+        """
+        Fetches the transfers (mints and sales included) of a collection that
+        happened after since_timestamp, newest first.
+        The overlap seconds before since_timestamp are read again, since
+        transfers can be indexed after newer ones of the same second were
+        seen; re-checking their wallets is harmless.
+        Returns None when the cursor could not be reached, either because a
+        request failed or because there were more than max_pages of changes.
+        """
+        url = f"{self.base_url}/transfers/v4"
+        params = {"contract": collection_address, "limit": limit}
+        since_timestamp -= overlap
+        transfers = []
+
+        for _ in range(max_pages):
+            data = await self._make_request(
+                url, params, "transfers", priority, guild_id
+            )
+            if "transfers" not in data:
+                logger.error(f"Error fetching transfers for {collection_address}.")
+                return None
+
+            for transfer in data["transfers"]:
+                if transfer.get("timestamp", 0) <= since_timestamp:
+                    return transfers
+                transfers.append(transfer)
+
+            continuation = data.get("continuation")
+            if not continuation or not data["transfers"]:
+                return transfers
+            params = {**params, "continuation": continuation}
+
+        logger.warning(
+            f"More than {max_pages} pages of transfers for {collection_address} "
+            f"since {since_timestamp}."
+        )
+        return None
+
     async def get_nft_ownership(
-        self, wallet_address: str, collection_address: str
+        self,
+        wallet_address: str,
+        collection_address: str,
+        use_cache: bool = True,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+        guild_id: Optional[int] = None,
+        limit: int = 200,
+        max_pages: int = 50,
     ) -> Optional[int]:
         """
         Verifies the ownership of NFTs for a given wallet address and collection.
+        The tokenCount of every token is summed across all pages of the
+        wallet's tokens. Returns None when a page could not be fetched, so a
+        failed lookup is never mistaken for a wallet holding nothing.
         """
-        url = f"https://api.reservoir.tools/users/{wallet_address}/tokens/v10"
-        params = {"collection": collection_address}
+        url = f"{self.base_url}/users/{wallet_address}/tokens/v10"
+        params = {"collection": collection_address, "limit": limit}
+        nft_count = 0
+
+        for _ in range(max_pages):
+            if use_cache:
+                data = await self._cached_request(
+                    "ownership", url, params, priority, guild_id
+                )
+            else:
+                data = await self._make_request(
+                    url, params, "ownership", priority, guild_id
+                )
+            if "tokens" not in data:
+                logger.error(
+                    f"Error fetching ownership of {wallet_address} in {collection_address}."
+                )
+                return None
+            if isinstance(data, StaleResponse):
+                logger.warning(
+                    f"Ownership of {wallet_address} in {collection_address} is served stale."
+                )
+
+            for token in data["tokens"]:
+                ownership = token.get("ownership") or {}
+                try:
+                    nft_count += int(ownership.get("tokenCount", 1))
+                except (TypeError, ValueError):
+                    nft_count += 1
+
+            continuation = data.get("continuation")
+            if not continuation or not data["tokens"]:
+                break
+            params = {**params, "continuation": continuation}
+        else:
+            logger.error(
+                f"More than {max_pages} pages of tokens for {wallet_address} "
+                f"in {collection_address}."
+            )
+            return None
 
-        data = await self._make_request(url, params)
-        if "tokens" in data and len(data["tokens"]) > 0:
+        if nft_count:
             logger.success(
-                f"Wallet {wallet_address} owns {len(data['tokens'])} tokens in collection {collection_address}."
+                f"Wallet {wallet_address} owns {nft_count} tokens in collection {collection_address}."
             )
-            return len(data["tokens"])
-        logger.warning(
-            f"Wallet {wallet_address} does not own any tokens in collection {collection_address}."
-        )
-        return 0
+        else:
+            logger.warning(
+                f"Wallet {wallet_address} does not own any tokens in collection {collection_address}."
+            )
+        return nft_count
@@ -0,0 +1,207 @@
+import asyncio
+import random
+from typing import Any, Awaitable, Callable, List, Optional, Set
+
+import aiohttp
+from loguru import logger
+
+from ..models.reservoir_models import ReservoirSale
+from .http_client import default_json_loads
+
+
+class ReservoirStreamService:
+    """
+    Subscribes to sale events on the Reservoir websocket.
+
+    run() keeps a connection open, subscribes to the sales of the tracked
+    contracts and hands every sale to on_sales as it is published. After each
+    (re)connection on_connected is awaited before any event is delivered, so
+    the caller can catch up on what happened while the stream was down.
+    Dropped connections are retried with exponential backoff.
+    """
+
+    EVENT = "sale.created"
+
+    def __init__(
+        self,
+        api_key: str,
+        http_client: "HttpClient",
+        ws_url: str = "wss://ws.reservoir.tools",
+        reconnect_base: float = 1,
+        reconnect_max: float = 60,
+        heartbeat: float = 30,
+        refresh_interval: float = 60,
+        json_loads: Optional[Callable[[str], Any]] = None,
+    ):
+        self.api_key = api_key
+        self.http_client = http_client
+        self.ws_url = ws_url
+        self.reconnect_base = reconnect_base
+        self.reconnect_max = reconnect_max
+        self.heartbeat = heartbeat
+        self.refresh_interval = refresh_interval
+        self.json_loads = json_loads or default_json_loads
+
+        self.connected = False
+        self.events_received = 0
+        self.reconnects = 0
+        self._subscribed: Set[str] = set()
+
+    async def run(
+        self,
+        get_contracts: Callable[[], Awaitable[List[str]]],
+        on_sales: Callable[[List[ReservoirSale]], Awaitable],
+        on_connected: Callable[[], Awaitable],
+    ):
+        """
+        Streams sales until cancelled, reconnecting whenever the connection drops.
+        """
+        attempt = 0
+        while True:
+            try:
+                ws = await self.http_client.ws_connect(
+                    f"{self.ws_url}?api_key={self.api_key}", heartbeat=self.heartbeat
+                )
+                try:
+                    await self._consume(ws, get_contracts, on_sales, on_connected)
+                finally:
+                    if self.connected:
+                        attempt = 0
+                    self.connected = False
+                    self._subscribed = set()
+                    await ws.close()
+                logger.warning("Sales stream disconnected.")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Sales stream unavailable: {self._redact(e)}")
+
+            self.reconnects += 1
+            delay = random.uniform(
+                0, min(self.reconnect_max, self.reconnect_base * 2**attempt)
+            )
+            attempt += 1
+            logger.info(f"Reconnecting sales stream in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def _consume(
+        self,
+        ws: aiohttp.ClientWebSocketResponse,
+        get_contracts: Callable[[], Awaitable[List[str]]],
+        on_sales: Callable[[List[ReservoirSale]], Awaitable],
+        on_connected: Callable[[], Awaitable],
+    ):
+        await self._sync_subscriptions(ws, await get_contracts())
+        refresher = asyncio.create_task(self._refresh_subscriptions(ws, get_contracts))
+        # Events published while catching up are buffered and delivered after.
+        buffered: Optional[List[ReservoirSale]] = []
+
+        async def catch_up():
+            nonlocal buffered
+            try:
+                await on_connected()
+            except Exception as e:
+                logger.error(f"Sales stream catch-up failed, reconnecting: {e}")
+                await ws.close()
+                return
+            self.connected = True
+            logger.success("Sales stream connected.")
+            pending, buffered = buffered, None
+            if pending:
+                await self._deliver(on_sales, pending)
+
+        catching_up = asyncio.create_task(catch_up())
+        try:
+            async for message in ws:
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    if message.type in (
+                        aiohttp.WSMsgType.CLOSED,
+                        aiohttp.WSMsgType.ERROR,
+                    ):
+                        break
+                    continue
+
+                sale = self._parse_event(message.data)
+                if sale is None:
+                    continue
+                self.events_received += 1
+                if buffered is not None:
+                    buffered.append(sale)
+                else:
+                    await self._deliver(on_sales, [sale])
+        finally:
+            refresher.cancel()
+            catching_up.cancel()
+
+    @staticmethod
+    async def _deliver(
+        on_sales: Callable[[List[ReservoirSale]], Awaitable],
+        sales: List[ReservoirSale],
+    ):
+        try:
+            await on_sales(sales)
+        except Exception as e:
+            logger.error(f"Error handling streamed sales: {e}")
+
+    def _parse_event(self, raw: str) -> Optional[ReservoirSale]:
+        try:
+            message = self.json_loads(raw)
+            if message.get("event") != self.EVENT:
+                if message.get("status") == "error":
+                    logger.error(f"Sales stream error message: {message}")
+                return None
+            return ReservoirSale.from_payload(message["data"])
+        except Exception as e:
+            logger.error(f"Error parsing sales stream event: {e}")
+            return None
+
+    async def _refresh_subscriptions(
+        self,
+        ws: aiohttp.ClientWebSocketResponse,
+        get_contracts: Callable[[], Awaitable[List[str]]],
+    ):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self._sync_subscriptions(ws, await get_contracts())
+            except Exception as e:
+                logger.error(f"Error refreshing sales stream subscriptions: {e}")
+
+    async def _sync_subscriptions(
+        self, ws: aiohttp.ClientWebSocketResponse, contracts: List[str]
+    ):
+        """
+        Subscribes to newly tracked contracts and unsubscribes from dropped ones.
+        """
+        wanted = {contract.lower() for contract in contracts}
+        for contract in wanted - self._subscribed:
+            await ws.send_json(
+                {
+                    "type": "subscribe",
+                    "event": self.EVENT,
+                    "filters": {"contract": contract},
+                }
+            )
+        for contract in self._subscribed - wanted:
+            await ws.send_json(
+                {
+                    "type": "unsubscribe",
+                    "event": self.EVENT,
+                    "filters": {"contract": contract},
+                }
+            )
+        if wanted != self._subscribed:
+            logger.info(f"Sales stream subscribed to {len(wanted)} contracts.")
+        self._subscribed = wanted
+
+    def _redact(self, error: Exception) -> str:
+        # Connection errors quote the URL, which carries the API key.
+        return str(error).replace(self.api_key, "<api key>")
+
+    def get_stats(self) -> dict:
+        return {
+            "connected": self.connected,
+            "subscriptions": len(self._subscribed),
+            "events_received": self.events_received,
+            "reconnects": self.reconnects,
+        }
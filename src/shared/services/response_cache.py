@@ -0,0 +1,146 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class StaleResponse(dict):
+    """
+    Response served from an expired cache entry because the live request failed.
+    """
+
+    stale = True
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache with per-entry TTLs and in-flight request coalescing.
+
+    Concurrent callers asking for the same key while it is being fetched
+    share the pending fetch instead of issuing their own request.
+    """
+
+    def __init__(self, maxsize: int = 2048):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0
+        self.stale_hits = 0
+
+    @staticmethod
+    def make_key(url: str, params: dict) -> Hashable:
+        """
+        Builds a hashable key from a URL and its query parameters.
+        """
+        items = []
+        for name, value in sorted(params.items()):
+            if isinstance(value, (list, tuple)):
+                value = tuple(value)
+            items.append((name, value))
+        return url, tuple(items)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Returns the cached value if it has not expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def get_stale(self, key: Hashable) -> Optional[Any]:
+        """
+        Returns the last stored value for key even if it has expired.
+        Expired entries are kept until the LRU evicts them, so this is the
+        last-known-good response for the key.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self.stale_hits += 1
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: float):
+        """
+        Stores a value for ttl seconds, evicting the least recently used entry
+        when the cache is full.
+        """
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        ttl: float,
+        fetcher: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool] = bool,
+    ) -> Any:
+        """
+        Returns the cached value for key, or fetches it once for every
+        concurrent caller and caches the result when should_cache allows it.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            # The fetch runs in its own task, so a caller that is cancelled
+            # stops waiting without cancelling it for everyone else.
+            task = asyncio.create_task(self._fetch(key, ttl, fetcher, should_cache))
+            task.add_done_callback(self._retrieve_exception)
+            self._in_flight[key] = task
+        return await asyncio.shield(task)
+
+    async def _fetch(
+        self,
+        key: Hashable,
+        ttl: float,
+        fetcher: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool],
+    ) -> Any:
+        try:
+            value = await fetcher()
+            if should_cache(value):
+                self.set(key, value, ttl)
+            return value
+        finally:
+            self._in_flight.pop(key, None)
+
+    @staticmethod
+    def _retrieve_exception(task: asyncio.Task):
+        # Mark the exception as retrieved in case every caller stopped waiting.
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "coalesced": self.coalesced,
+            "stale_hits": self.stale_hits,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
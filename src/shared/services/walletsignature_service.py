@@ -1,4 +1,5 @@
 import random
+from typing import Optional
 
 from eth_account.messages import encode_defunct
 from hexbytes import HexBytes
@@ -13,7 +14,11 @@ class WalletSignatureService:
     Service to handle Ethereum wallet signature verification using Web3.
     """
 
-    def __init__(self):
+    def __init__(self, w3: Optional[Web3] = None):
+        if w3 is not None:
+            self.w3 = w3
+            return
+
         self.w3 = Web3(
             Web3.HTTPProvider(f"https://mainnet.infura.io/v3/{INFURA_PROJECT_ID}")
         )
@@ -0,0 +1,27 @@
+import asyncio
+
+from src.shared.services.api_key_pool import ApiKeyPool
+
+
+def test_last_key_stays_in_rotation_after_auth_error():
+    pool = ApiKeyPool(["only-key"], rate=100, burst=10)
+
+    pool.on_auth_error(pool.keys[0], 401)
+
+    assert pool.healthy_keys() == pool.keys
+    assert asyncio.run(pool.acquire()) is pool.keys[0]
+
+
+def test_rejected_key_leaves_rotation_until_auth_cooldown():
+    pool = ApiKeyPool(["first-key", "second-key"], rate=100, burst=10)
+    first, second = pool.keys
+
+    pool.on_auth_error(first, 403)
+    assert pool.healthy_keys() == [second]
+
+    # The remaining key is the last one, so it is not taken out.
+    pool.on_auth_error(second, 403)
+    assert pool.healthy_keys() == [second]
+
+    first.disabled_until = 0
+    assert pool.healthy_keys() == [first, second]
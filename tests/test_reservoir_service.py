@@ -0,0 +1,65 @@
+import asyncio
+
+from src.shared.services.circuit_breaker import CircuitState
+from src.shared.services.http_client import HttpClient, HttpResponse
+from src.shared.services.reservoir_service import ReservoirService
+
+
+class ScriptedHttpClient(HttpClient):
+    """
+    Answers with the given statuses in turn; None hangs until cancelled.
+    """
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.requests = 0
+
+    async def get_response(self, url: str, headers: dict, params: dict) -> HttpResponse:
+        self.requests += 1
+        status = self.statuses.pop(0)
+        if status is None:
+            await asyncio.Event().wait()
+        return HttpResponse(status=status, data={"ok": True})
+
+    async def get(self, url: str, headers: dict, params: dict) -> dict:
+        return (await self.get_response(url, headers, params)).data
+
+    async def post(self, url: str, headers: dict, data: dict) -> dict:
+        raise NotImplementedError
+
+
+def make_service(http_client: HttpClient) -> ReservoirService:
+    return ReservoirService(
+        "test",
+        http_client,
+        requests_per_minute=10**6,
+        burst=10**3,
+        max_retries=0,
+        circuit_failure_threshold=1,
+        circuit_recovery_timeout=0,
+    )
+
+
+def test_cancelled_probe_hands_back_its_slot():
+    async def scenario():
+        http_client = ScriptedHttpClient([500, None, 200])
+        service = make_service(http_client)
+        circuit = service._get_circuit("sales")
+        try:
+            await service._make_request("url", {}, "sales")
+            assert circuit.state is CircuitState.OPEN
+
+            probe = asyncio.create_task(service._make_request("url", {}, "sales"))
+            while http_client.requests < 2:
+                await asyncio.sleep(0)
+            assert circuit.state is CircuitState.HALF_OPEN
+            probe.cancel()
+            await asyncio.gather(probe, return_exceptions=True)
+
+            assert await service._make_request("url", {}, "sales") == {"ok": True}
+            assert http_client.requests == 3
+            assert circuit.state is CircuitState.CLOSED
+        finally:
+            await service.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,111 @@
+import asyncio
+
+from src.modules.automation.controllers.sales_controller import SalesController
+from src.modules.automation.models.sales_entity import Sale
+from src.modules.automation.repositories.sale_dispatch_repository import \
+    SaleDispatchRepository
+from src.modules.automation.services.sale_dedupe_service import \
+    SaleDedupeService
+from src.modules.automation.usecases.sales_fetch_usecase import \
+    SalesFetchUseCase
+from src.modules.automation.usecases.sales_send_usecase import SalesSendUseCase
+
+CONTRACT = "0xabc"
+CHANNEL_ID = 1
+
+
+class FakeSalesService:
+    def __init__(self, sales):
+        self.sales = sales
+        self.pending_cursors = {}
+        self.committed = []
+
+    async def get_new_sales(self, contracts):
+        self.pending_cursors = {CONTRACT: (2, "sale-2")}
+        return self.sales
+
+    async def get_sales_with_metadata(self, sales):
+        return sales
+
+    async def commit_cursors(self):
+        self.committed.append(self.pending_cursors)
+        self.pending_cursors = {}
+
+    def discard_cursors(self):
+        self.pending_cursors = {}
+
+
+class FakeDiscordService:
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, channel_id, embed=None):
+        self.sent.append((channel_id, embed))
+        return True
+
+
+class FakeNotificationService:
+    @staticmethod
+    async def format_sale_embed(sale):
+        return sale.token_id
+
+
+def make_sale(token_id: str, tx_hash: str) -> Sale:
+    return Sale(
+        name=f"Token {token_id}",
+        token_id=token_id,
+        contract=CONTRACT,
+        price_native=1.0,
+        price_usd=2000.0,
+        timestamp=None,
+        seller="0xseller",
+        buyer="0xbuyer",
+        image=None,
+        collection_data={},
+        tx_hash=tx_hash,
+        log_index=0,
+    )
+
+
+def make_controller(monkeypatch, claimed):
+    async def insert_dispatched(keys):
+        return claimed(set(keys))
+
+    async def delete_older_than(cutoff):
+        return 0
+
+    monkeypatch.setattr(SaleDispatchRepository, "insert_dispatched", insert_dispatched)
+    monkeypatch.setattr(SaleDispatchRepository, "delete_older_than", delete_older_than)
+
+    sales_service = FakeSalesService([make_sale("1", "0x1"), make_sale("2", "0x2")])
+    discord_service = FakeDiscordService()
+    controller = SalesController(
+        SalesFetchUseCase(sales_service),
+        SalesSendUseCase(
+            discord_service, FakeNotificationService(), SaleDedupeService()
+        ),
+    )
+    return controller, sales_service, discord_service
+
+
+def test_claimed_sales_are_sent_and_cursors_committed(monkeypatch):
+    controller, sales_service, discord_service = make_controller(
+        monkeypatch, lambda keys: keys
+    )
+
+    asyncio.run(controller.handle_sale([(CHANNEL_ID, CONTRACT)]))
+
+    assert len(discord_service.sent) == 2
+    assert sales_service.committed == [{CONTRACT: (2, "sale-2")}]
+
+
+def test_failed_claim_discards_cursors_so_sales_are_fetched_again(monkeypatch):
+    controller, sales_service, discord_service = make_controller(
+        monkeypatch, lambda keys: None
+    )
+
+    asyncio.run(controller.handle_sale([(CHANNEL_ID, CONTRACT)]))
+
+    assert discord_service.sent == []
+    assert sales_service.committed == []
+    assert sales_service.pending_cursors == {}
@@ -0,0 +1,3 @@
+from .fixtures import (SyntheticCollection, generate_collections,
+                       load_fixtures, save_fixtures)
+from .server import ReservoirStandin, StandinConfig
@@ -0,0 +1,79 @@
+import argparse
+import asyncio
+
+from loguru import logger
+
+from .fixtures import generate_collections, load_fixtures, save_fixtures
+from .server import ReservoirStandin, StandinConfig
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Local stand-in for the Reservoir API, for offline load tests."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--fixtures", help="Load collections from a JSON fixture")
+    parser.add_argument(
+        "--record", help="Write the generated collections to a JSON fixture"
+    )
+    parser.add_argument("--collections", type=int, default=3)
+    parser.add_argument("--supply", type=int, default=1000)
+    parser.add_argument("--holders", type=int, default=400)
+    parser.add_argument("--sales", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-per-minute", type=int, default=None)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--sales-per-minute", type=float, default=0)
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+
+    if args.fixtures:
+        collections = load_fixtures(args.fixtures)
+    else:
+        collections = generate_collections(
+            count=args.collections,
+            supply=args.supply,
+            holders=args.holders,
+            sales=args.sales,
+            seed=args.seed,
+        )
+    if args.record:
+        save_fixtures(collections, args.record)
+        logger.info(f"Fixtures recorded to {args.record}")
+
+    for contract, collection in collections.items():
+        logger.info(
+            f"{collection.name}: {contract} | {len(collection.owners)} tokens | "
+            f"{len(collection.holder_counts())} holders | {len(collection.sales)} sales"
+        )
+
+    config = StandinConfig(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        rate_limit_per_minute=args.rate_limit_per_minute,
+        retry_after=args.retry_after,
+        sales_per_minute=args.sales_per_minute,
+        seed=args.seed,
+    )
+    runner = await ReservoirStandin(collections, config).start(args.host, args.port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logger.warning("Stand-in stopped by the user.")
@@ -0,0 +1,175 @@
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+def random_address(rng: random.Random) -> str:
+    return f"0x{rng.getrandbits(160):040x}"
+
+
+@dataclass
+class SyntheticCollection:
+    """
+    In-memory collection served by the stand-in: token owners, sales and transfers.
+    Sales and transfers are kept newest first, like the real API returns them.
+    """
+
+    contract: str
+    name: str
+    floor_price: float
+    volume_1day: float
+    volume_change: float
+    owners: Dict[str, str] = field(default_factory=dict)
+    sales: List[dict] = field(default_factory=list)
+    transfers: List[dict] = field(default_factory=list)
+
+    def holder_counts(self) -> Dict[str, int]:
+        return dict(Counter(self.owners.values()))
+
+    def token_payload(self, token_id: str) -> dict:
+        return {
+            "contract": self.contract,
+            "tokenId": token_id,
+            "name": f"{self.name} #{token_id}",
+            "image": f"https://img.standin.local/{self.contract}/{token_id}.png",
+            "collection": {"id": self.contract, "name": self.name},
+            "owner": self.owners.get(token_id),
+        }
+
+    def collection_payload(self) -> dict:
+        return {
+            "id": self.contract,
+            "name": self.name,
+            "tokenCount": str(len(self.owners)),
+            "ownerCount": len(set(self.owners.values())),
+            "floorAsk": {"price": {"amount": {"native": self.floor_price}}},
+            "volume": {"1day": self.volume_1day},
+            "volumeChange": {"1day": self.volume_change},
+        }
+
+    def record_sale(self, rng: random.Random, timestamp: Optional[int] = None):
+        """
+        Moves a random token to a new wallet and records the sale and transfer.
+        """
+        token_id = rng.choice(list(self.owners))
+        seller = self.owners[token_id]
+        buyer = random_address(rng)
+        timestamp = timestamp or int(time.time())
+        price = round(self.floor_price * rng.uniform(0.8, 1.6), 4)
+        sequence = len(self.sales)
+        tx_hash = f"0x{rng.getrandbits(256):064x}"
+
+        self.owners[token_id] = buyer
+        self.sales.insert(
+            0,
+            {
+                "id": f"{self.contract}-{sequence}",
+                "saleId": f"{self.contract}-{sequence}",
+                "txHash": tx_hash,
+                "logIndex": 0,
+                "batchIndex": 0,
+                "timestamp": timestamp,
+                "updatedAt": timestamp,
+                "from": seller,
+                "to": buyer,
+                "token": {
+                    "contract": self.contract,
+                    "tokenId": token_id,
+                    "name": f"{self.name} #{token_id}",
+                    "image": f"https://img.standin.local/{self.contract}/{token_id}.png",
+                    "collection": {"id": self.contract, "name": self.name},
+                },
+                "price": {
+                    "currency": {"symbol": "ETH"},
+                    "amount": {"native": price, "usd": round(price * 3000, 2)},
+                },
+            },
+        )
+        self.transfers.insert(
+            0,
+            {
+                "id": f"{tx_hash}:0",
+                "token": {"contract": self.contract, "tokenId": token_id},
+                "from": seller,
+                "to": buyer,
+                "amount": "1",
+                "txHash": tx_hash,
+                "logIndex": 0,
+                "batchIndex": 0,
+                "timestamp": timestamp,
+            },
+        )
+        self.volume_1day = round(self.volume_1day + price, 4)
+
+
+def generate_collections(
+    count: int = 3,
+    supply: int = 1000,
+    holders: int = 400,
+    sales: int = 50,
+    seed: int = 42,
+) -> Dict[str, SyntheticCollection]:
+    """
+    Builds deterministic synthetic collections keyed by lowercase contract.
+    """
+    rng = random.Random(seed)
+    now = int(time.time())
+    collections = {}
+
+    for index in range(count):
+        contract = random_address(rng)
+        collection = SyntheticCollection(
+            contract=contract,
+            name=f"Standin Collection {index + 1}",
+            floor_price=round(rng.uniform(0.05, 2), 4),
+            volume_1day=round(rng.uniform(1, 200), 2),
+            volume_change=round(rng.uniform(-50, 50), 2),
+        )
+
+        wallets = [random_address(rng) for _ in range(max(1, holders))]
+        for token_id in range(1, supply + 1):
+            owner = rng.choice(wallets)
+            collection.owners[str(token_id)] = owner
+            collection.transfers.insert(
+                0,
+                {
+                    "id": f"mint-{contract}-{token_id}",
+                    "token": {"contract": contract, "tokenId": str(token_id)},
+                    "from": ZERO_ADDRESS,
+                    "to": owner,
+                    "amount": "1",
+                    "txHash": f"0x{rng.getrandbits(256):064x}",
+                    "logIndex": 0,
+                    "batchIndex": 0,
+                    "timestamp": now - 86400 * 30,
+                },
+            )
+
+        for offset in range(sales, 0, -1):
+            collection.record_sale(rng, timestamp=now - offset * 60)
+
+        collections[contract] = collection
+
+    return collections
+
+
+def save_fixtures(collections: Dict[str, SyntheticCollection], path: Path):
+    """
+    Records collections to a JSON fixture file.
+    """
+    payload = [asdict(collection) for collection in collections.values()]
+    Path(path).write_text(json.dumps(payload), encoding="utf-8")
+
+
+def load_fixtures(path: Path) -> Dict[str, SyntheticCollection]:
+    """
+    Loads collections previously recorded with save_fixtures.
+    """
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    return {item["contract"].lower(): SyntheticCollection(**item) for item in payload}
@@ -0,0 +1,341 @@
+import asyncio
+import json
+import random
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Set, Tuple
+
+from aiohttp import WSMsgType, web
+from loguru import logger
+
+from .fixtures import SyntheticCollection
+
+
+@dataclass
+class StandinConfig:
+    """
+    Knobs for how the stand-in misbehaves.
+    """
+
+    latency_ms: float = 0
+    latency_jitter_ms: float = 0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    rate_limit_per_minute: Optional[int] = None
+    retry_after: float = 1.0
+    sales_per_minute: float = 0
+    seed: int = 42
+
+
+USER_TOKENS_PATH = re.compile(r"/users/([^/]+)/tokens/v10$")
+
+
+def _page(items: List, query: Mapping, default_limit: int, max_limit: int):
+    """
+    Slices items by limit/offset/continuation. Continuations are opaque
+    strings holding the offset of the next page.
+    """
+    limit = min(int(query.get("limit", default_limit)), max_limit)
+    start = int(query.get("continuation") or query.get("offset", 0))
+    page = items[start : start + limit]
+    next_start = start + limit
+    continuation = str(next_start) if next_start < len(items) else None
+    return page, continuation
+
+
+class ReservoirStandin:
+    """
+    Local aiohttp stand-in for the subset of the Reservoir API used by the bot.
+    """
+
+    def __init__(
+        self,
+        collections: Dict[str, SyntheticCollection],
+        config: Optional[StandinConfig] = None,
+    ):
+        self.collections = collections
+        self.config = config or StandinConfig()
+        self.rng = random.Random(self.config.seed)
+        self.stats = Counter()
+        self._window_started = time.monotonic()
+        self._window_count = 0
+        self._sales_task = None
+        self._sockets: Dict[web.WebSocketResponse, Set[str]] = {}
+        # Owners sorted for /owners, per contract, until its next transfer.
+        self._owner_rankings: Dict[str, Tuple[int, List[Tuple[str, int]]]] = {}
+
+    def create_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        for path in (
+            "/sales/v5",
+            "/tokens/v7",
+            "/collections/v7",
+            "/owners/v2",
+            "/transfers/v4",
+            "/users/{address}/tokens/v10",
+        ):
+            app.router.add_get(path, self.handle)
+        app.router.add_get("/ws", self.websocket_endpoint)
+        app.router.add_get("/_standin/stats", self.stats_endpoint)
+        app.router.add_post("/_standin/drop_streams", self.drop_streams_endpoint)
+        app.on_startup.append(self._start_sales_generator)
+        app.on_shutdown.append(self._close_sockets)
+        app.on_cleanup.append(self._stop_sales_generator)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8787) -> web.AppRunner:
+        """
+        Starts the stand-in in the running event loop. Stop it with runner.cleanup().
+        """
+        runner = web.AppRunner(self.create_app())
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        logger.info(f"Reservoir stand-in listening on http://{host}:{port}")
+        return runner
+
+    def _collection(self, contract: Optional[str]) -> Optional[SyntheticCollection]:
+        return self.collections.get((contract or "").lower())
+
+    def _rate_limit_headers(self) -> dict:
+        limit = self.config.rate_limit_per_minute
+        if not limit:
+            return {}
+        reset = max(0.0, 60 - (time.monotonic() - self._window_started))
+        return {
+            "X-RateLimit-Limit": str(limit),
+            "X-RateLimit-Remaining": str(max(0, limit - self._window_count)),
+            "X-RateLimit-Reset": f"{reset:.0f}",
+        }
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        if request.path.startswith("/_standin") or request.path == "/ws":
+            return await handler(request)
+
+        self.stats["requests"] += 1
+        self.stats[f"requests:{request.match_info.route.resource.canonical}"] += 1
+
+        config = self.config
+        if config.latency_ms or config.latency_jitter_ms:
+            delay = config.latency_ms + self.rng.uniform(0, config.latency_jitter_ms)
+            await asyncio.sleep(delay / 1000)
+
+        if config.rate_limit_per_minute:
+            if time.monotonic() - self._window_started >= 60:
+                self._window_started = time.monotonic()
+                self._window_count = 0
+            self._window_count += 1
+            if self._window_count > config.rate_limit_per_minute:
+                return self._throttled(
+                    max(1.0, 60 - (time.monotonic() - self._window_started))
+                )
+
+        if config.throttle_rate and self.rng.random() < config.throttle_rate:
+            return self._throttled(config.retry_after)
+
+        if config.error_rate and self.rng.random() < config.error_rate:
+            self.stats["errors"] += 1
+            return web.json_response(
+                {"message": "Injected failure"},
+                status=self.rng.choice([500, 502, 503]),
+                headers=self._rate_limit_headers(),
+            )
+
+        response = await handler(request)
+        response.headers.update(self._rate_limit_headers())
+        return response
+
+    def _throttled(self, retry_after: float) -> web.Response:
+        self.stats["throttled"] += 1
+        headers = self._rate_limit_headers()
+        headers["Retry-After"] = f"{retry_after:.0f}"
+        return web.json_response(
+            {"message": "Too many requests"}, status=429, headers=headers
+        )
+
+    async def _start_sales_generator(self, app: web.Application):
+        if self.config.sales_per_minute > 0 and self.collections:
+            self._sales_task = asyncio.create_task(self._generate_sales())
+
+    async def _stop_sales_generator(self, app: web.Application):
+        if self._sales_task:
+            self._sales_task.cancel()
+
+    async def _generate_sales(self):
+        interval = 60 / self.config.sales_per_minute
+        collections = list(self.collections.values())
+        while True:
+            await asyncio.sleep(interval)
+            collection = self.rng.choice(collections)
+            collection.record_sale(self.rng)
+            await self.publish_sale(collection.sales[0])
+
+    async def websocket_endpoint(self, request: web.Request) -> web.WebSocketResponse:
+        """
+        Websocket in the style of the Reservoir one: clients subscribe to
+        sale.created per contract and receive new sales as they are recorded.
+        """
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self._sockets[ws] = set()
+        self.stats["ws_connections"] += 1
+        await ws.send_json({"type": "connection", "status": "ready"})
+
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    payload = json.loads(message.data)
+                    contract = payload["filters"]["contract"].lower()
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    await ws.send_json({"status": "error", "message": "Bad request"})
+                    continue
+
+                if payload.get("type") == "subscribe":
+                    self._sockets[ws].add(contract)
+                elif payload.get("type") == "unsubscribe":
+                    self._sockets[ws].discard(contract)
+                await ws.send_json(
+                    {"type": payload.get("type"), "status": "success", "data": contract}
+                )
+        finally:
+            self._sockets.pop(ws, None)
+        return ws
+
+    async def publish_sale(self, sale: dict):
+        """
+        Pushes a sale.created event to every socket subscribed to its contract.
+        """
+        contract = sale["token"]["contract"].lower()
+        event = {
+            "type": "event",
+            "event": "sale.created",
+            "tags": {"contract": contract},
+            "data": sale,
+            "published_at": int(time.time() * 1000),
+        }
+        for ws, contracts in list(self._sockets.items()):
+            if contract in contracts and not ws.closed:
+                await ws.send_json(event)
+                self.stats["ws_events"] += 1
+
+    async def _close_sockets(self, app: web.Application):
+        for ws in list(self._sockets):
+            await ws.close()
+
+    async def drop_streams_endpoint(self, request: web.Request) -> web.Response:
+        """
+        Closes every websocket, to exercise the clients' reconnection.
+        """
+        dropped = len(self._sockets)
+        await self._close_sockets(request.app)
+        return web.json_response({"dropped": dropped})
+
+    def build_payload(self, path: str, query: Mapping) -> Optional[dict]:
+        """
+        Builds the JSON body the stand-in serves for a path and query, without
+        going through HTTP. Returns None for unknown paths.
+        """
+        if path.endswith("/sales/v5"):
+            return self.sales_payload(query)
+        if path.endswith("/tokens/v7") and "/users/" not in path:
+            return self.tokens_payload(query)
+        if path.endswith("/collections/v7"):
+            return self.collections_payload(query)
+        if path.endswith("/owners/v2"):
+            return self.owners_payload(query)
+        if path.endswith("/transfers/v4"):
+            return self.transfers_payload(query)
+        match = USER_TOKENS_PATH.search(path)
+        if match:
+            return self.user_tokens_payload(match.group(1), query)
+        return None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        payload = self.build_payload(request.path, request.query)
+        if payload is None:
+            return web.json_response({"message": "Not found"}, status=404)
+        return web.json_response(payload)
+
+    def sales_payload(self, query: Mapping) -> dict:
+        contracts = {contract.lower() for contract in query.getall("contract", [])}
+        sales = [
+            sale
+            for contract, collection in self.collections.items()
+            if not contracts or contract in contracts
+            for sale in collection.sales
+        ]
+        sales.sort(key=lambda sale: sale["timestamp"], reverse=True)
+        page, continuation = _page(sales, query, default_limit=100, max_limit=1000)
+        return {"sales": page, "continuation": continuation}
+
+    def tokens_payload(self, query: Mapping) -> dict:
+        tokens = []
+        for value in query.getall("tokens", []):
+            contract, _, token_id = value.partition(":")
+            collection = self._collection(contract)
+            if collection and token_id in collection.owners:
+                tokens.append({"token": collection.token_payload(token_id)})
+        return {"tokens": tokens, "continuation": None}
+
+    def collections_payload(self, query: Mapping) -> dict:
+        collections = [
+            collection.collection_payload()
+            for contract in query.getall("contract", [])
+            if (collection := self._collection(contract))
+        ]
+        return {"collections": collections, "continuation": None}
+
+    def owners_payload(self, query: Mapping) -> dict:
+        collection = self._collection(query.get("collection"))
+        if collection is None:
+            return {"owners": [], "continuation": None}
+
+        owners = self._owner_ranking(collection)
+        page, continuation = _page(owners, query, default_limit=20, max_limit=500)
+        return {
+            "owners": [
+                {"address": address, "ownership": {"tokenCount": str(count)}}
+                for address, count in page
+            ],
+            "continuation": continuation,
+        }
+
+    def _owner_ranking(self, collection: SyntheticCollection) -> List[Tuple[str, int]]:
+        version = len(collection.transfers)
+        cached = self._owner_rankings.get(collection.contract)
+        if cached is None or cached[0] != version:
+            owners = sorted(
+                collection.holder_counts().items(),
+                key=lambda item: (-item[1], item[0]),
+            )
+            cached = self._owner_rankings[collection.contract] = (version, owners)
+        return cached[1]
+
+    def transfers_payload(self, query: Mapping) -> dict:
+        collection = self._collection(query.get("contract"))
+        transfers = collection.transfers if collection else []
+        page, continuation = _page(transfers, query, default_limit=20, max_limit=100)
+        return {"transfers": page, "continuation": continuation}
+
+    def user_tokens_payload(self, address: str, query: Mapping) -> dict:
+        address = address.lower()
+        collection = self._collection(query.get("collection"))
+        owned = []
+        if collection:
+            owned = [
+                {
+                    "token": collection.token_payload(token_id),
+                    "ownership": {"tokenCount": "1"},
+                }
+                for token_id, owner in collection.owners.items()
+                if owner == address
+            ]
+        page, continuation = _page(owned, query, default_limit=20, max_limit=200)
+        return {"tokens": page, "continuation": continuation}
+
+    async def stats_endpoint(self, request: web.Request) -> web.Response:
+        return web.json_response(dict(self.stats))